@@ -3,10 +3,11 @@ from django.contrib.auth.admin import UserAdmin
 
 from accounts.forms import CustomUserCreationForm, CustomUserChangeForm
 from accounts.models import CustomUser
+from config.admin import EstimatedCountAdminMixin
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(EstimatedCountAdminMixin, UserAdmin):
     add_form = CustomUserCreationForm
     form = CustomUserChangeForm
     model = CustomUser
@@ -16,6 +17,35 @@ class CustomUserAdmin(UserAdmin):
         'registration_accepted',
         'is_moderator',
     )
+    list_filter = UserAdmin.list_filter + (
+        'registration_accepted',
+    )
+    actions = [
+        'approve_registrations',
+        'reject_registrations',
+    ]
+
+    @admin.action(
+        description='Accept registration of selected users',
+        permissions=['change'],
+    )
+    def approve_registrations(self, request, queryset):
+        """
+        Accept the selected pending users with a single `UPDATE`.
+        """
+        count = queryset.approve_registrations()
+        self.message_user(request, f'Accepted {count} registration(s).')
+
+    @admin.action(
+        description='Reject registration of selected users',
+        permissions=['change'],
+    )
+    def reject_registrations(self, request, queryset):
+        """
+        Deactivate the selected pending users with a single `UPDATE`.
+        """
+        count = queryset.reject_registrations()
+        self.message_user(request, f'Rejected {count} registration(s).')
 
     def get_fieldsets(self, request, obj=None):
         """
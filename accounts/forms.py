@@ -1,3 +1,4 @@
+from django import forms
 from django.contrib.auth.forms import UserCreationForm, UserChangeForm
 
 from accounts.models import CustomUser
@@ -30,4 +31,35 @@ class CustomUserChangeForm(UserChangeForm):
             # 'is_superuser',   # This field should only be available to
             # some adminstrative role. There would be some sort of page
             # where the andminstrative role can change the role of a user.
-        )
\ No newline at end of file
+        )
+
+
+class RegistrationDecisionForm(forms.Form):
+    """
+    Form for a moderator to accept or reject the registrations of the
+    selected pending users.
+    """
+    APPROVE = 'approve'
+    REJECT = 'reject'
+
+    users = forms.ModelMultipleChoiceField(
+        queryset=CustomUser.objects.pending().only('id'),
+    )
+    decision = forms.ChoiceField(
+        choices=[
+            (APPROVE, 'Accept registration'),
+            (REJECT, 'Reject registration'),
+        ],
+    )
+
+    def save(self):
+        """
+        Apply the decision to the selected users with a single `UPDATE`, and
+        return how many users it changed.
+        """
+        users = CustomUser.objects.filter(
+            pk__in=[user.pk for user in self.cleaned_data['users']],
+        )
+        if self.cleaned_data['decision'] == self.APPROVE:
+            return users.approve_registrations()
+        return users.reject_registrations()
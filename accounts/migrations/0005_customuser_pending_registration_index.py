@@ -0,0 +1,24 @@
+# Generated by Django 4.1.5 on 2026-10-18 17:51
+
+import accounts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_customuser_is_moderator_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='customuser',
+            managers=[
+                ('objects', accounts.models.CustomUserManager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(condition=models.Q(('is_active', True), ('registration_accepted', False)), fields=['-date_joined', '-id'], name='accounts_user_pending_idx'),
+        ),
+    ]
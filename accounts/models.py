@@ -1,5 +1,36 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.db.models import Q
+
+
+# Users waiting for a moderator to accept or reject their registration.
+# Rejected users are deactivated, which takes them out of the queue:
+PENDING_REGISTRATION = Q(registration_accepted=False, is_active=True)
+
+
+class CustomUserQuerySet(models.QuerySet):
+
+    def pending(self):
+        return self.filter(PENDING_REGISTRATION)
+
+    def approve_registrations(self):
+        """
+        Accept the registration of the pending users in the queryset with a
+        single `UPDATE`, and return how many were accepted.
+        """
+        return self.pending().update(registration_accepted=True)
+
+    def reject_registrations(self):
+        """
+        Deactivate the pending users in the queryset with a single `UPDATE`,
+        and return how many were rejected.
+        """
+        return self.pending().update(is_active=False)
+
+
+class CustomUserManager(UserManager.from_queryset(CustomUserQuerySet)):
+    pass
+
 
 class CustomUser(AbstractUser):
     """
@@ -16,6 +47,19 @@ class CustomUser(AbstractUser):
         default=False,
     )
 
+    objects = CustomUserManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Serves the registration queue: only pending users, newest
+            # first, so it stays small however many users are accepted.
+            models.Index(
+                fields=['-date_joined', '-id'],
+                name='accounts_user_pending_idx',
+                condition=PENDING_REGISTRATION,
+            ),
+        ]
+
     def __str__(self):
         """
         String representation of CustomUser.
@@ -3,6 +3,8 @@ from django.urls import reverse
 
 from accounts.models import CustomUser
 from accounts.forms import CustomUserCreationForm, CustomUserChangeForm
+from accounts.views import DASHBOARD_LATEST_COUNT
+from rodbt.models import Journal, Question
 
 
 USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
@@ -30,6 +32,9 @@ LOGIN_TEMPLATE = 'registration/login.html'
 USER_DASHBOARD_URL = '/accounts/dashboard/'
 USER_DASHBOARD_VIEW_NAME = 'dashboard'
 USER_DASHBOARD_TEMPLATE = 'accounts/dashboard.html'
+# Session, user, two aggregates and the latest `Journal`s and `Question`s:
+USER_DASHBOARD_QUERY_BUDGET = 6
+NUMBER_OF_DASHBOARD_JOURNALS = 12
 
 USER_UPDATE_URL = '/accounts/1/edit/'
 USER_UPDATE_VIEW_NAME = 'edit_profile'
@@ -573,3 +578,59 @@ class UserDashboardViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context['customuser'], current_custom_user)
 
+    def test_view_has_activity_stats(self):
+        """
+        Test that the user dashboard view has the totals and the latest
+        `Journal`s and `Question`s, newest first.
+        """
+        user = CustomUser.objects.get(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE
+        )
+        for journal_id in range(NUMBER_OF_DASHBOARD_JOURNALS):
+            Journal.objects.create(
+                author=user,
+                title=f'Journal {journal_id} Title',
+                body=f'Journal {journal_id} body text',
+            )
+        Question.objects.create(author=user, body='A Question Body')
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(USER_DASHBOARD_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context['journal_stats']['total'],
+            NUMBER_OF_DASHBOARD_JOURNALS
+        )
+        self.assertEqual(
+            response.context['journal_stats']['recent'],
+            NUMBER_OF_DASHBOARD_JOURNALS
+        )
+        self.assertEqual(response.context['question_stats']['total'], 1)
+        self.assertEqual(
+            list(response.context['latest_journals']),
+            list(Journal.objects.order_by('-date', '-id')[:DASHBOARD_LATEST_COUNT])
+        )
+
+    def test_view_query_count_does_not_grow_with_journals(self):
+        """
+        Test that the user dashboard view runs `USER_DASHBOARD_QUERY_BUDGET`
+        queries however many `Journal`s the user has.
+        """
+        user = CustomUser.objects.get(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE
+        )
+        for journal_id in range(NUMBER_OF_DASHBOARD_JOURNALS):
+            Journal.objects.create(
+                author=user,
+                title=f'Journal {journal_id} Title',
+                body=f'Journal {journal_id} body text',
+            )
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        with self.assertNumQueries(USER_DASHBOARD_QUERY_BUDGET):
+            response = self.client.get(USER_DASHBOARD_URL)
+        self.assertEqual(response.status_code, 200)
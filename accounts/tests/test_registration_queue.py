@@ -0,0 +1,204 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from accounts.views import RegistrationQueueView
+from rodbt.management.commands.check_query_plans import uses_index
+
+
+USERNAME_MODERATOR = 'ModeratorUser'
+USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
+USERNAME_STAFF = 'StaffUser'
+PASSWORD_FOR_TESTING = 'a_test_password'
+NUMBER_OF_PENDING_USERS = 3
+
+LOGIN_URL = '/accounts/login/'
+REGISTRATION_QUEUE_URL = '/accounts/registrations/'
+REGISTRATION_QUEUE_VIEW_NAME = 'registration_queue'
+REGISTRATION_QUEUE_TEMPLATE = 'accounts/registration_queue.html'
+ADMIN_CHANGELIST_URL = '/admin/accounts/customuser/'
+
+# Session, user, the selected pending users and the `UPDATE`:
+REGISTRATION_DECISION_QUERY_BUDGET = 4
+
+
+class RegistrationQueueTest(TestCase):
+    """
+    Tests for the `RegistrationQueueView` view and the `CustomUserAdmin`
+    registration actions.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create a moderator, a registered user, a staff user and some users
+        waiting for their registration to be accepted.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        for username, fields in [
+            (USERNAME_MODERATOR, {'registration_accepted': True, 'is_moderator': True}),
+            (USERNAME_REGISTRATION_ACCEPTED_TRUE, {'registration_accepted': True}),
+            (USERNAME_STAFF, {'registration_accepted': True, 'is_staff': True, 'is_superuser': True}),
+        ]:
+            user = CustomUser.objects.create(username=username, **fields)
+            user.set_password(PASSWORD_FOR_TESTING)
+            user.save()
+        cls.pending = [
+            CustomUser.objects.create(username=f'PendingUser{number}')
+            for number in range(NUMBER_OF_PENDING_USERS)
+        ]
+        cls.rejected = CustomUser.objects.create(username='RejectedUser', is_active=False)
+
+    def login(self, username):
+        self.client.login(username=username, password=PASSWORD_FOR_TESTING)
+
+    def test_view_url_redirect_to_login_if_user_not_authenticated(self):
+        """
+        Non-authenticated users should be redirected to login.
+        """
+        response = self.client.get(REGISTRATION_QUEUE_URL)
+        self.assertRedirects(response, f'{LOGIN_URL}?next={REGISTRATION_QUEUE_URL}')
+
+    def test_view_forbidden_to_users_who_are_not_moderators(self):
+        """
+        Users with `is_moderator=False` should get 403.
+        """
+        self.login(USERNAME_REGISTRATION_ACCEPTED_TRUE)
+        response = self.client.get(REGISTRATION_QUEUE_URL)
+        self.assertEqual(response.status_code, 403)
+
+    def test_view_lists_pending_users(self):
+        """
+        The queue should list the pending users, newest first, and not the
+        accepted or rejected ones.
+        """
+        self.login(USERNAME_MODERATOR)
+        response = self.client.get(reverse(REGISTRATION_QUEUE_VIEW_NAME))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, REGISTRATION_QUEUE_TEMPLATE)
+        self.assertEqual(
+            list(response.context['object_list']),
+            list(reversed(self.pending)),
+        )
+
+    def test_queue_pages_follow_the_next_cursor(self):
+        """
+        A queue longer than a page should be split into pages which, read
+        by following `next_cursor`, list every pending user once, newest
+        first.
+        """
+        page_size = RegistrationQueueView.paginate_by
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f'QueuedUser{number}')
+            for number in range(page_size)
+        ])
+        expected = list(CustomUser.objects.pending().order_by('-date_joined', '-id'))
+        self.assertGreater(len(expected), page_size)
+        self.login(USERNAME_MODERATOR)
+
+        response = self.client.get(REGISTRATION_QUEUE_URL)
+        first_page = response.context['page_obj']
+        self.assertEqual(len(first_page), page_size)
+        self.assertTrue(first_page.has_next())
+        self.assertFalse(first_page.has_previous())
+        self.assertContains(response, f'?after={first_page.next_cursor}')
+
+        response = self.client.get(REGISTRATION_QUEUE_URL, {'after': first_page.next_cursor})
+        self.assertEqual(response.status_code, 200)
+        second_page = response.context['page_obj']
+        self.assertEqual(len(second_page), len(expected) - page_size)
+        self.assertFalse(second_page.has_next())
+        self.assertTrue(second_page.has_previous())
+        self.assertEqual(list(first_page) + list(second_page), expected)
+
+    def test_deep_page_seeks_into_pending_index(self):
+        """
+        A page deep in the queue should be sought in
+        `accounts_user_pending_idx` by `date_joined` rather than found by
+        scanning the index up to the cursor.
+        """
+        page_size = RegistrationQueueView.paginate_by
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f'QueuedUser{number}')
+            for number in range(page_size * 2)
+        ])
+        self.login(USERNAME_MODERATOR)
+        page = self.client.get(REGISTRATION_QUEUE_URL).context['page_obj']
+        for _ in range(2):
+            response = self.client.get(REGISTRATION_QUEUE_URL, {'after': page.next_cursor})
+            page = response.context['page_obj']
+        self.assertEqual(len(page), NUMBER_OF_PENDING_USERS)
+        plan = page.get_queryset().explain()
+        self.assertTrue(
+            uses_index(plan, 'accounts_user_pending_idx', seek='date_joined'),
+            plan,
+        )
+
+    def test_approve_accepts_selected_users_in_one_update(self):
+        """
+        Approving should accept only the selected users.
+        """
+        self.login(USERNAME_MODERATOR)
+        selected = self.pending[:2]
+        with self.assertNumQueries(REGISTRATION_DECISION_QUERY_BUDGET):
+            response = self.client.post(REGISTRATION_QUEUE_URL, {
+                'users': [user.pk for user in selected],
+                'decision': 'approve',
+            })
+        self.assertRedirects(response, REGISTRATION_QUEUE_URL)
+        for user in selected:
+            user.refresh_from_db()
+            self.assertTrue(user.registration_accepted)
+        self.pending[2].refresh_from_db()
+        self.assertFalse(self.pending[2].registration_accepted)
+
+    def test_reject_deactivates_selected_users(self):
+        """
+        Rejecting should deactivate the selected users, which takes them
+        out of the queue.
+        """
+        self.login(USERNAME_MODERATOR)
+        self.client.post(REGISTRATION_QUEUE_URL, {
+            'users': [self.pending[0].pk],
+            'decision': 'reject',
+        })
+        self.pending[0].refresh_from_db()
+        self.assertFalse(self.pending[0].is_active)
+        self.assertFalse(self.pending[0].registration_accepted)
+        self.assertNotIn(self.pending[0], CustomUser.objects.pending())
+
+    def test_users_who_are_not_pending_cannot_be_selected(self):
+        """
+        Selecting a rejected user should be a form error.
+        """
+        self.login(USERNAME_MODERATOR)
+        response = self.client.post(REGISTRATION_QUEUE_URL, {
+            'users': [self.rejected.pk],
+            'decision': 'approve',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors['users'])
+        self.rejected.refresh_from_db()
+        self.assertFalse(self.rejected.registration_accepted)
+
+    def test_admin_actions_update_pending_users(self):
+        """
+        The admin actions should accept or reject the selected pending users
+        and leave other users alone.
+        """
+        self.login(USERNAME_STAFF)
+        self.client.post(ADMIN_CHANGELIST_URL, {
+            'action': 'approve_registrations',
+            '_selected_action': [self.pending[0].pk, self.rejected.pk],
+        })
+        self.client.post(ADMIN_CHANGELIST_URL, {
+            'action': 'reject_registrations',
+            '_selected_action': [self.pending[0].pk, self.pending[1].pk],
+        })
+        for user in [*self.pending, self.rejected]:
+            user.refresh_from_db()
+        self.assertTrue(self.pending[0].registration_accepted)
+        self.assertTrue(self.pending[0].is_active)
+        self.assertFalse(self.pending[1].is_active)
+        self.assertFalse(self.rejected.registration_accepted)
+        self.assertEqual(list(CustomUser.objects.pending()), [self.pending[2]])
@@ -8,4 +8,5 @@ urlpatterns = [
     path("login/", views.CustomLoginView.as_view(), name="login"),
     path("dashboard/", views.UserDashboardView.as_view(), name="dashboard"),
     path("<int:pk>/edit/", views.UserUpdateView.as_view(), name="edit_profile"),
+    path("registrations/", views.RegistrationQueueView.as_view(), name="registration_queue"),
 ]
\ No newline at end of file
@@ -1,14 +1,29 @@
+from datetime import timedelta
+
+from django.contrib import messages
+from django.db.models import Count, Max, Min, Q
+from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.views.generic.edit import CreateView, UpdateView
 from django.views.generic.detail import DetailView
+from django.views.generic.list import ListView
 from django.contrib.auth.views import LoginView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 
-from accounts.forms import CustomUserCreationForm, CustomUserChangeForm
+from accounts.forms import CustomUserCreationForm, CustomUserChangeForm, RegistrationDecisionForm
 from accounts.models import CustomUser
 from config.settings.common import THE_SITE_NAME
+from rodbt.models import Journal, Question
+from rodbt.pagination import KeysetPaginationMixin
 
 DASHBOARD_PAGE_TITLE = 'Dashboard'
+# Number of most recent `Journal`s and `Question`s shown on the dashboard:
+DASHBOARD_LATEST_COUNT = 5
+# Number of days counted as "recent activity" on the dashboard:
+DASHBOARD_ACTIVITY_DAYS = 30
+
+REGISTRATION_QUEUE_PAGE_TITLE = 'Registration Queue'
 
 
 class CustomLoginView(LoginView):
@@ -67,8 +82,12 @@ class UserUpdateView(LoginRequiredMixin, UpdateView):
 
 class UserDashboardView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
     """
-    View for user to see their `Journal`s and `Question`s and other
-    related models.
+    View for user to see a summary of their `Journal`s and `Question`s and
+    other related models.
+
+    The totals and activity stats are aggregated by the database and only
+    the latest `DASHBOARD_LATEST_COUNT` rows of each model are fetched, so
+    the cost of the page doesn't depend on how much the user has written.
     """
     # No need to specify a `model` because we are overriding `get_object()`
     template_name = 'accounts/dashboard.html'
@@ -96,4 +115,92 @@ class UserDashboardView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
         #   `view`: the `UserDashboardView` object
         context['the_site_name'] = THE_SITE_NAME
         context['page_title'] = DASHBOARD_PAGE_TITLE
+        context['activity_days'] = DASHBOARD_ACTIVITY_DAYS
+        context['journal_stats'] = self.get_activity_stats(Journal)
+        context['question_stats'] = self.get_activity_stats(Question)
+        context['latest_journals'] = Journal.objects.filter(
+            author=self.object,
+        ).only(
+            'id',
+            'title',
+            'excerpt',
+            'date',
+        ).order_by('-date', '-id')[:DASHBOARD_LATEST_COUNT]
+        context['latest_questions'] = Question.objects.filter(
+            author=self.object,
+        ).only(
+            'id',
+            'body',
+            'date',
+        ).order_by('-date', '-id')[:DASHBOARD_LATEST_COUNT]
+        return context
+
+    def get_activity_stats(self, model):
+        """
+        Aggregate the user's rows of `model` in a single query:
+            * `total`: number of rows.
+            * `recent`: rows created in the last `DASHBOARD_ACTIVITY_DAYS`.
+            * `first_date`: date of the oldest row.
+            * `last_date`: date of the newest row.
+        """
+        since = timezone.now() - timedelta(days=DASHBOARD_ACTIVITY_DAYS)
+        return model.objects.filter(author=self.object).aggregate(
+            total=Count('id'),
+            recent=Count('id', filter=Q(date__gte=since)),
+            first_date=Min('date'),
+            last_date=Max('date'),
+        )
+
+
+class RegistrationQueueView(LoginRequiredMixin, UserPassesTestMixin, KeysetPaginationMixin, ListView):
+    """
+    View for a moderator to accept or reject pending registrations.
+
+    Pending users are listed newest first from the partial index
+    `accounts_user_pending_idx`, with keyset pagination, so a page costs the
+    same however long the queue and the user table get. The decision for
+    the selected users is applied with a single `UPDATE`.
+    """
+    template_name = 'accounts/registration_queue.html'
+    paginate_by = 50
+    keyset_ordering = ('-date_joined', '-id')
+
+    def test_func(self):
+        """
+        Test if user has `is_moderator=True`.
+        """
+        return self.request.user.is_moderator
+
+    def get_queryset(self):
+        return CustomUser.objects.pending().only(
+            'id',
+            'username',
+            'email',
+            'date_joined',
+        )
+
+    def post(self, request, *args, **kwargs):
+        """
+        Accept or reject the selected users and go back to the queue.
+        """
+        form = RegistrationDecisionForm(request.POST)
+        if not form.is_valid():
+            self.object_list = self.get_queryset()
+            return self.render_to_response(self.get_context_data(form=form))
+        count = form.save()
+        if form.cleaned_data['decision'] == RegistrationDecisionForm.APPROVE:
+            messages.success(request, f'Accepted {count} registration(s).')
+        else:
+            messages.success(request, f'Rejected {count} registration(s).')
+        return redirect('registration_queue')
+
+    def get_context_data(self, **kwargs):
+        """
+        Add `the_site_name`, `page_title` and the decision `form` to the
+        context.
+        """
+        context = super().get_context_data(**kwargs)
+        context['the_site_name'] = THE_SITE_NAME
+        context['page_title'] = REGISTRATION_QUEUE_PAGE_TITLE
+        context.setdefault('form', RegistrationDecisionForm())
         return context
@@ -0,0 +1,4 @@
+from benchmarks.views import main
+
+
+main()
@@ -0,0 +1,140 @@
+"""
+Load a running server with many concurrent, optionally slow, clients.
+
+Compare the sync and async deployments by starting each in turn and
+running the same load against it, for example:
+
+    gunicorn config.wsgi
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+
+    python -m benchmarks.concurrency http://127.0.0.1:8000/rodbt/journals/ \\
+        --cookie sessionid=<session key> --clients 20 --slow-clients 20 --slow-send 0.5
+
+Each client opens its own connection per request. The fast and slow
+clients run at the same time and their latencies are reported apart, so
+the cost slow clients impose on everyone else shows in the fast clients'
+latency.
+
+Slow clients are simulated with `--slow-send`, which sends the request a
+header line at a time with a sleep in between, and `--slow-read`, which
+reads the response a `--chunk-size` piece at a time. Responses that fit in
+the socket buffers don't make the server wait on a slow reader, so
+`--slow-send` is usually the one that shows the difference.
+
+Only the standard library is used, so the clients themselves don't limit
+the concurrency.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def fetch(url, cookie, slow_send, slow_read, chunk_size):
+    """
+    GET `url` over a new connection and return the status code.
+    """
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, port, ssl=parts.scheme == 'https' or None,
+    )
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    headers = [
+        f'GET {path} HTTP/1.1',
+        f'Host: {parts.netloc}',
+        'Connection: close',
+    ]
+    if cookie:
+        headers.append(f'Cookie: {cookie}')
+    # The empty line ends the request headers.
+    for line in headers + ['']:
+        writer.write(f'{line}\r\n'.encode())
+        await writer.drain()
+        if slow_send:
+            await asyncio.sleep(slow_send)
+    status_line = await reader.readline()
+    while await reader.read(chunk_size):
+        if slow_read:
+            await asyncio.sleep(slow_read)
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+    return int(status_line.split()[1])
+
+
+async def client(url, options, slow, latencies, errors):
+    slow_send = options.slow_send if slow else 0
+    slow_read = options.slow_read if slow else 0
+    for _ in range(options.requests):
+        start = time.perf_counter()
+        try:
+            status = await fetch(url, options.cookie, slow_send, slow_read, options.chunk_size)
+        except (OSError, IndexError, ValueError):
+            status = None
+        if status == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(status)
+
+
+async def run(options):
+    """
+    Run the fast and slow clients together and return the elapsed time and
+    `(latencies, errors)` of each.
+    """
+    results = {'fast': ([], []), 'slow': ([], [])}
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client(options.url, options, False, *results['fast'])
+        for _ in range(options.clients)
+    ], *[
+        client(options.url, options, True, *results['slow'])
+        for _ in range(options.slow_clients)
+    ])
+    return time.perf_counter() - start, results
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('url')
+    parser.add_argument('--cookie', help='Cookie header to send, for example "sessionid=...".')
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent fast clients.')
+    parser.add_argument('--slow-clients', type=int, default=0, help='Concurrent slow clients, see --slow-send and --slow-read.')
+    parser.add_argument('--requests', type=int, default=5, help='Requests made by each client.')
+    parser.add_argument('--slow-send', type=float, default=0.0, help='Seconds to sleep between request lines sent.')
+    parser.add_argument('--slow-read', type=float, default=0.0, help='Seconds to sleep between chunks read.')
+    parser.add_argument('--chunk-size', type=int, default=1024)
+    options = parser.parse_args()
+
+    elapsed, results = asyncio.run(run(options))
+    print(f'{elapsed:.2f}s')
+    for kind, (latencies, errors) in results.items():
+        if not latencies and not errors:
+            continue
+        latencies.sort()
+        line = (
+            f'{kind}: {len(latencies)} ok, {len(errors)} failed, '
+            f'{len(latencies) / elapsed:.1f} requests/s'
+        )
+        if latencies:
+            line += (
+                f', latency ms mean {statistics.mean(latencies) * 1000:.0f} '
+                f'p50 {percentile(latencies, 0.5) * 1000:.0f} '
+                f'p95 {percentile(latencies, 0.95) * 1000:.0f} '
+                f'p99 {percentile(latencies, 0.99) * 1000:.0f}'
+            )
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Seed the database with `users` x `journals` x `questions` for benchmarks.
+
+Every row is inserted with `bulk_create()`, a batch at a time, so large
+datasets are quick to build. The users are registered and share the
+password `PASSWORD`, hashed once.
+"""
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from accounts.models import CustomUser
+from rodbt import search
+from rodbt.models import Journal, Question
+
+
+USERNAME_PREFIX = 'bench-user-'
+PASSWORD = 'a_benchmark_password'
+BATCH_SIZE = 1000
+
+WORDS = (
+    'today I noticed a feeling of calm and then worry about work family '
+    'sleep walk breathing skill practice opposite action wise mind check '
+    'the facts radical openness self enquiry social signalling'
+).split()
+
+
+def make_body(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def get_seeded_users():
+    return CustomUser.objects.filter(
+        username__startswith=USERNAME_PREFIX,
+    ).order_by('id')
+
+
+@transaction.atomic
+def seed(users, journals, questions, links=2, random_seed=0):
+    """
+    Create `users` users with `journals` journals and `questions` questions
+    each. Each question is linked to `links` of its author's journals.
+
+    Journal bodies vary from a line to a few pages, so some are stored
+    compressed. Return the users.
+    """
+    rng = random.Random(random_seed)
+    password = make_password(PASSWORD)
+    first = CustomUser.objects.count()
+    CustomUser.objects.bulk_create([
+        CustomUser(
+            username=f'{USERNAME_PREFIX}{first + number}',
+            password=password,
+            registration_accepted=True,
+        )
+        for number in range(users)
+    ], batch_size=BATCH_SIZE)
+    seeded_users = list(get_seeded_users().filter(
+        username__in=[f'{USERNAME_PREFIX}{first + number}' for number in range(users)],
+    ))
+
+    for user in seeded_users:
+        user_journals = []
+        for number in range(journals):
+            journal = Journal(
+                author=user,
+                title=f'Journal {number}',
+                body=make_body(rng, rng.choice((20, 200, 2000))),
+            )
+            journal.update_excerpt()
+            user_journals.append(journal)
+        Journal.objects.bulk_create(user_journals, batch_size=BATCH_SIZE)
+        # Not every database returns the primary keys of bulk inserts.
+        journal_ids = list(Journal.objects.filter(
+            author=user,
+        ).values_list('id', flat=True))
+
+        Question.objects.bulk_create([
+            Question(author=user, body=f'Question {number}?')
+            for number in range(questions)
+        ], batch_size=BATCH_SIZE)
+        question_ids = list(Question.objects.filter(
+            author=user,
+        ).values_list('id', flat=True))
+
+        if journal_ids:
+            Question.journal.through.objects.bulk_create([
+                Question.journal.through(question_id=question_id, journal_id=journal_id)
+                for question_id in question_ids
+                for journal_id in rng.sample(journal_ids, min(links, len(journal_ids)))
+            ], batch_size=BATCH_SIZE)
+
+        search.index_objects(Journal.objects.filter(author=user))
+        search.index_objects(Question.objects.filter(author=user))
+    return seeded_users
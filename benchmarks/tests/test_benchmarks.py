@@ -0,0 +1,56 @@
+from django.test import SimpleTestCase, TestCase
+
+from benchmarks.seed import seed
+from benchmarks.views import compare
+from rodbt.models import Journal, Question
+
+
+def make_results(queries, p50_ms):
+    return {'views': {'GET rodbt:journals': {'queries': queries, 'p50_ms': p50_ms}}}
+
+
+class SeedTest(TestCase):
+    """
+    Test `benchmarks.seed.seed`.
+    """
+
+    def test_seed_creates_users_journals_questions_and_links(self):
+        """
+        Each user should get `journals` journals and `questions` questions,
+        each question linked to `links` of its author's journals.
+        """
+        users = seed(users=3, journals=4, questions=2, links=2)
+        self.assertEqual(len(users), 3)
+        self.assertTrue(all(user.registration_accepted for user in users))
+        self.assertEqual(Journal.objects.count(), 12)
+        self.assertEqual(Question.objects.count(), 6)
+        links = Question.journal.through.objects.select_related('question', 'journal')
+        self.assertEqual(links.count(), 12)
+        for link in links:
+            self.assertEqual(link.question.author_id, link.journal.author_id)
+        self.assertTrue(all(journal.excerpt for journal in Journal.objects.all()))
+
+
+class CompareTest(SimpleTestCase):
+    """
+    Test `benchmarks.views.compare`.
+    """
+
+    def test_more_queries_is_a_regression(self):
+        """
+        Any query more than in the baseline should fail.
+        """
+        self.assertEqual(len(compare(make_results(5, 10), make_results(4, 10), 0.5, 2)), 1)
+
+    def test_slower_p50_is_a_regression(self):
+        """
+        A p50 slower by more than `tolerance` and `min_ms` should fail.
+        """
+        self.assertEqual(len(compare(make_results(4, 20), make_results(4, 10), 0.5, 2)), 1)
+
+    def test_small_slowdowns_are_not_regressions(self):
+        """
+        Slowdowns within `tolerance`, or under `min_ms`, should pass.
+        """
+        self.assertEqual(compare(make_results(4, 14), make_results(4, 10), 0.5, 2), [])
+        self.assertEqual(compare(make_results(4, 1.5), make_results(4, 0.5), 0.5, 2), [])
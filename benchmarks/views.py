@@ -0,0 +1,226 @@
+"""
+Time the views in-process against a freshly seeded test database.
+
+    python -m benchmarks --users 20 --journals 200 --questions 50 \\
+        --output results.json --compare benchmarks/baseline.json
+
+A test database is created, as `manage.py test` does, and seeded with
+`benchmarks.seed`. Each view is then requested `--iterations` times with
+the test client, logged in as the first seeded user, and its latency
+percentiles and query count are written as JSON to `--output`.
+
+With `--compare` the results are checked against a baseline written the
+same way, such as the committed `benchmarks/baseline.json`. A view
+regresses when it runs more queries than in the baseline, or when its
+median (p50) is more than `--tolerance` slower and at least `--min-ms`
+slower, and the command then exits with status 1. The tail percentiles
+are recorded but are too noisy over a few dozen requests to fail on.
+
+Latencies only compare between runs on the same machine and database, so
+refresh the baseline with `--output benchmarks/baseline.json` after
+deliberate changes, on the machine the comparison runs on.
+
+The `fragments` cache is cleared before every request, unless
+`--warm-cache` is given, so the views are measured rendering their pages
+rather than serving them from the cache.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from benchmarks.concurrency import percentile
+
+
+def get_cases(user):
+    """
+    Return `(method, url name, args, data, expected status)` for each view
+    benchmarked as `user`.
+    """
+    from rodbt.models import Journal, Question
+
+    journal = Journal.objects.filter(author=user).order_by('-date', '-id').first()
+    question = Question.objects.filter(author=user).order_by('-date', '-id').first()
+    journal_ids = list(
+        Journal.objects.filter(author=user).values_list('id', flat=True)[:2]
+    )
+    return [
+        ('GET', 'home', [], None, 200),
+        ('GET', 'dashboard', [], None, 200),
+        ('GET', 'rodbt:journals', [], None, 200),
+        ('GET', 'rodbt:journal-detail', [journal.pk], None, 200),
+        ('GET', 'rodbt:journal-create', [], None, 200),
+        ('POST', 'rodbt:journal-create', [], {'title': 'Benchmark', 'body': 'A benchmark journal.'}, 302),
+        ('GET', 'rodbt:questions', [], None, 200),
+        ('GET', 'rodbt:question-detail', [question.pk], None, 200),
+        ('GET', 'rodbt:question-create', [], None, 200),
+        ('POST', 'rodbt:question-create', [], {'body': 'A benchmark question?', 'journal': journal_ids}, 302),
+        ('GET', 'rodbt:search', [], {'q': 'calm'}, 200),
+        ('GET', 'rodbt:api:journals', [], None, 200),
+        ('GET', 'rodbt:api:journal-lookup', [], {'q': 'Journal 1'}, 200),
+    ]
+
+
+def time_case(client, method, url, data, status, options):
+    """
+    Return the latencies, in seconds, and the query count of requesting
+    `url`.
+    """
+    from django.core.cache import caches
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    request = client.get if method == 'GET' else client.post
+
+    def run():
+        if not options.warm_cache:
+            caches['fragments'].clear()
+        start = time.perf_counter()
+        response = request(url, data)
+        if response.streaming:
+            # The queries of streamed responses run as they are read.
+            b''.join(response.streaming_content)
+        elapsed = time.perf_counter() - start
+        if response.status_code != status:
+            raise RuntimeError(
+                f'{method} {url} returned {response.status_code}, not {status}.'
+            )
+        return elapsed
+
+    for _ in range(options.warmup):
+        run()
+    latencies = sorted(run() for _ in range(options.iterations))
+    # Counted apart from the timed requests, as capturing queries slows
+    # them down.
+    with CaptureQueriesContext(connection) as queries:
+        run()
+    return latencies, len(queries)
+
+
+def run_benchmarks(options):
+    from django import get_version
+    from django.db import connection
+    from django.test import Client
+    from django.urls import reverse
+
+    from benchmarks.seed import seed
+
+    start = time.perf_counter()
+    users = seed(options.users, options.journals, options.questions, options.links)
+    print(f'Seeded in {time.perf_counter() - start:.1f}s', file=sys.stderr)
+
+    client = Client()
+    client.force_login(users[0])
+    views = {}
+    for method, url_name, args, data, status in get_cases(users[0]):
+        latencies, queries = time_case(
+            client, method, reverse(url_name, args=args), data, status, options,
+        )
+        views[f'{method} {url_name}'] = {
+            'queries': queries,
+            'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+            'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        }
+    return {
+        'dataset': {
+            'users': options.users,
+            'journals': options.journals,
+            'questions': options.questions,
+            'links': options.links,
+        },
+        'iterations': options.iterations,
+        'environment': {
+            'database': connection.vendor,
+            'django': get_version(),
+            'python': platform.python_version(),
+        },
+        'views': views,
+    }
+
+
+def compare(results, baseline, tolerance, min_ms):
+    """
+    Return a description of each view that regressed from `baseline`.
+    """
+    regressions = []
+    for name, view in results['views'].items():
+        before = baseline['views'].get(name)
+        if before is None:
+            continue
+        if view['queries'] > before['queries']:
+            regressions.append(
+                f'{name}: {view["queries"]} queries, was {before["queries"]}'
+            )
+        slower = view['p50_ms'] - before['p50_ms']
+        if view['p50_ms'] > before['p50_ms'] * (1 + tolerance) and slower >= min_ms:
+            regressions.append(
+                f'{name}: p50 {view["p50_ms"]:.1f}ms, was {before["p50_ms"]:.1f}ms'
+            )
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f'{"view":<36} {"queries":>7} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+    for name, view in results['views'].items():
+        line = (
+            f'{name:<36} {view["queries"]:>7} {view["p50_ms"]:>8.1f} '
+            f'{view["p95_ms"]:>8.1f} {view["p99_ms"]:>8.1f}'
+        )
+        before = baseline and baseline['views'].get(name)
+        if before:
+            line += f'  (was {before["queries"]}, p50 {before["p50_ms"]:.1f})'
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--journals', type=int, default=200, help='Journals per user.')
+    parser.add_argument('--questions', type=int, default=50, help='Questions per user.')
+    parser.add_argument('--links', type=int, default=2, help='Journals linked to each question.')
+    parser.add_argument('--iterations', type=int, default=50, help='Timed requests per view.')
+    parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per view first.')
+    parser.add_argument('--warm-cache', action='store_true', help="Don't clear the fragments cache between requests.")
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--compare', help='Baseline JSON results to compare against.')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Fraction a p50 may grow by. Default: 0.5.')
+    parser.add_argument('--min-ms', type=float, default=2.0, help='Milliseconds a p50 may grow by regardless. Default: 2.')
+    options = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+    import django
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        results = run_benchmarks(options)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    baseline = None
+    if options.compare:
+        with open(options.compare) as file:
+            baseline = json.load(file)
+        if baseline['dataset'] != results['dataset']:
+            print('Warning: the baseline was run on a different dataset.', file=sys.stderr)
+    print_results(results, baseline)
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(results, file, indent=2)
+            file.write('\n')
+
+    if baseline:
+        regressions = compare(results, baseline, options.tolerance, options.min_ms)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
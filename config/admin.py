@@ -0,0 +1,127 @@
+"""
+Admin helpers shared by the apps' `ModelAdmin`s.
+
+`EstimatedCountAdminMixin` counts big changelists from the PostgreSQL
+planner's row estimates instead of with `COUNT(*)`, which reads every
+matching row. On other databases, and below `ESTIMATED_COUNT_THRESHOLD`
+rows, counts are exact.
+"""
+import json
+from functools import cached_property
+
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+
+
+# Querysets the planner estimates at fewer rows than this are counted
+# exactly by `EstimatedCountPaginator`:
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+def estimate_count(queryset):
+    """
+    Return the PostgreSQL planner's estimate of the number of rows in
+    `queryset`, or `None` if there is none.
+
+    An unfiltered queryset is estimated from the table's `reltuples`, kept
+    up to date by `ANALYZE` and autovacuum, and any other from the row
+    estimate of its `EXPLAIN`. Other databases have no cheap estimate.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    query = queryset.query
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct and not query.is_sliced:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            # `reltuples` is -1, or 0 before PostgreSQL 14, until the table
+            # is first analyzed.
+            if row and row[0] > 0:
+                return int(row[0])
+            return None
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    `Paginator` which doesn't `COUNT(*)` querysets estimated to be bigger
+    than `threshold` rows, but uses the estimate as the count.
+
+    Below the threshold, and on databases without estimates, the count is
+    exact. Estimates of filtered querysets can be well off, so the last
+    pages of a big list may come out empty, or past the end of the list.
+    """
+
+    def __init__(self, *args, threshold=ESTIMATED_COUNT_THRESHOLD, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threshold = threshold
+        self.is_estimated = False
+
+    def get_estimate(self):
+        if isinstance(self.object_list, QuerySet):
+            return estimate_count(self.object_list)
+        return None
+
+    @cached_property
+    def count(self):
+        estimate = self.get_estimate()
+        if estimate is None or estimate < self.threshold:
+            return super().count
+        self.is_estimated = True
+        return estimate
+
+
+class EstimatedCountChangeList(ChangeList):
+    """
+    `ChangeList` whose "(N total)" full result count is estimated like its
+    paginator's count.
+    """
+
+    def get_results(self, request):
+        # `ChangeList.get_results()` only calls `count()` on `root_queryset`.
+        root_queryset = self.root_queryset
+        self.root_queryset = EstimatedCount(self.model_admin, request, root_queryset)
+        try:
+            super().get_results(request)
+        finally:
+            self.root_queryset = root_queryset
+
+
+class EstimatedCount:
+    """
+    Stands in for a queryset whose `count()` is estimated.
+    """
+
+    def __init__(self, model_admin, request, queryset):
+        self.model_admin = model_admin
+        self.request = request
+        self.queryset = queryset
+
+    def count(self):
+        # Ordered only to keep the paginator from warning; counting ignores it.
+        queryset = self.queryset.order_by('pk')
+        return self.model_admin.get_paginator(self.request, queryset, 1).count
+
+
+class EstimatedCountAdminMixin:
+    """
+    `ModelAdmin` mixin which counts big changelists from the database's
+    estimates rather than with `COUNT(*)`, see `EstimatedCountPaginator`.
+    Both the filtered count and, with `show_full_result_count`, the total
+    are estimated.
+    """
+    paginator = EstimatedCountPaginator
+
+    def get_changelist(self, request, **kwargs):
+        return EstimatedCountChangeList
@@ -0,0 +1,201 @@
+"""
+A two tier cache backend which needs no cache server.
+
+`TieredCache` keeps a small least recently used cache in each process in
+front of a shared cache, normally Django's `DatabaseCache`, which every
+process sees. Reads are served from the process when they can be, writes
+go to both tiers.
+
+Another process's writes and deletes only reach this process's local tier
+when its entries expire, so the local tier has its own, short,
+`LOCAL_TIMEOUT`. That is the longest one process can serve a value
+another has replaced or deleted. Keys which must never be served stale
+skip the local tier: see the `SHARED_ONLY_KEY_PREFIXES` option.
+
+Values are stored in the shared tier with their expiry time, so copies
+kept locally never outlive the shared value.
+
+Hits and misses of every `TieredCache` are counted per cache, see
+`get_cache_stats()`.
+"""
+import threading
+import time
+from collections import Counter, namedtuple
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+DEFAULT_LOCAL_TIMEOUT = 10
+DEFAULT_LOCAL_MAX_ENTRIES = 1000
+
+_MISSING = object()
+
+# A value in the shared tier, with the time it expires or `None`:
+_Entry = namedtuple('_Entry', ['value', 'expires'])
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _count(name, event, amount=1):
+    with _stats_lock:
+        _stats.setdefault(name, Counter())[event] += amount
+
+
+def get_cache_stats():
+    """
+    Return `{cache name: {event: count}}` for every `TieredCache` used in
+    this process, where the events are `local_hits`, `shared_hits`,
+    `misses`, `sets` and `deletes`.
+    """
+    with _stats_lock:
+        return {name: dict(counter) for name, counter in _stats.items()}
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class TieredCache(BaseCache):
+    """
+    Cache with a per-process `LocMemCache` tier in front of the cache alias
+    named by the `SHARED` option.
+
+    `LOCATION` names the cache in `get_cache_stats()` and its local tier.
+    Options:
+
+    * `SHARED`: alias of the shared cache in `CACHES`. Required.
+    * `LOCAL_TIMEOUT`: seconds a value is kept in the local tier.
+    * `LOCAL_MAX_ENTRIES`: entries kept in the local tier.
+    * `SHARED_ONLY_KEY_PREFIXES`: keys starting with any of these are only
+      kept in the shared tier.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.name = location or 'default'
+        self.shared_alias = options['SHARED']
+        self.local_timeout = options.get('LOCAL_TIMEOUT', DEFAULT_LOCAL_TIMEOUT)
+        self.shared_only_prefixes = tuple(options.get('SHARED_ONLY_KEY_PREFIXES', ()))
+        # `LocMemCache`s with the same name share their storage, so every
+        # thread of the process sees the same local tier.
+        self.local = LocMemCache(f'tiered-{self.name}', {
+            'TIMEOUT': self.local_timeout,
+            'OPTIONS': {
+                'MAX_ENTRIES': options.get('LOCAL_MAX_ENTRIES', DEFAULT_LOCAL_MAX_ENTRIES),
+            },
+        })
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def get_expires(self, timeout):
+        """
+        Return the time a value set with `timeout` expires, or `None`.
+        """
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.shared.default_timeout
+        return None if timeout is None else time.time() + timeout
+
+    def set_local(self, key, value, expires, version):
+        """
+        Keep `value` locally no longer than `LOCAL_TIMEOUT` nor than it
+        lives in the shared tier.
+        """
+        if key.startswith(self.shared_only_prefixes):
+            return
+        timeout = self.local_timeout
+        if expires is not None:
+            timeout = min(timeout, expires - time.time())
+        if timeout > 0:
+            self.local.set(key, value, timeout, version)
+
+    def set_local_from_shared(self, key, stored, version):
+        """
+        Keep a value read from the shared tier locally and return it.
+        """
+        if isinstance(stored, _Entry):
+            self.set_local(key, stored.value, stored.expires, version)
+            return stored.value
+        # Set in the shared cache directly, so its expiry isn't known.
+        self.set_local(key, stored, None, version)
+        return stored
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_expires(timeout)
+        added = self.shared.add(key, _Entry(value, expires), timeout, version)
+        if added:
+            self.set_local(key, value, expires, version)
+            _count(self.name, 'sets')
+        return added
+
+    def get(self, key, default=None, version=None):
+        value = self.local.get(key, _MISSING, version)
+        if value is not _MISSING:
+            _count(self.name, 'local_hits')
+            return value
+        stored = self.shared.get(key, _MISSING, version)
+        if stored is _MISSING:
+            _count(self.name, 'misses')
+            return default
+        _count(self.name, 'shared_hits')
+        return self.set_local_from_shared(key, stored, version)
+
+    def get_many(self, keys, version=None):
+        found = self.local.get_many(keys, version)
+        _count(self.name, 'local_hits', len(found))
+        missing = [key for key in keys if key not in found]
+        if missing:
+            shared = self.shared.get_many(missing, version)
+            _count(self.name, 'shared_hits', len(shared))
+            _count(self.name, 'misses', len(missing) - len(shared))
+            for key, stored in shared.items():
+                found[key] = self.set_local_from_shared(key, stored, version)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_expires(timeout)
+        self.shared.set(key, _Entry(value, expires), timeout, version)
+        self.set_local(key, value, expires, version)
+        _count(self.name, 'sets')
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        # The stored expiry isn't moved, so local copies may expire sooner
+        # than they need to, but never later.
+        self.local.delete(key, version)
+        return self.shared.touch(key, timeout, version)
+
+    def delete(self, key, version=None):
+        self.local.delete(key, version)
+        _count(self.name, 'deletes')
+        return self.shared.delete(key, version)
+
+    def has_key(self, key, version=None):
+        return self.local.has_key(key, version) or self.shared.has_key(key, version)
+
+    def incr(self, key, delta=1, version=None):
+        # Like `BaseCache.incr()`, a read and a write, so not atomic.
+        self.local.delete(key, version)
+        stored = self.shared.get(key, _MISSING, version)
+        if stored is _MISSING:
+            raise ValueError(f"Key '{key}' not found")
+        if not isinstance(stored, _Entry):
+            return self.shared.incr(key, delta, version)
+        value = stored.value + delta
+        timeout = None
+        if stored.expires is not None:
+            timeout = max(stored.expires - time.time(), 0)
+        self.shared.set(key, _Entry(value, stored.expires), timeout, version)
+        return value
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
@@ -0,0 +1,90 @@
+"""
+PostgreSQL backend with optional in-process connection pooling.
+
+Without a `POOL` entry in the database settings it behaves exactly like
+Django's backend, with persistent connections controlled by
+`CONN_MAX_AGE` and `CONN_HEALTH_CHECKS`, and only counts the connections
+it opens and closes.
+
+With `POOL = {'MAX_SIZE': ..., 'TIMEOUT': ..., 'MAX_AGE': ...}` each
+thread checks a connection out of the process's `ConnectionPool` when it
+connects and returns it when Django closes it, normally at the end of
+every request with `CONN_MAX_AGE = 0`.
+
+Every pooled connection handed out again must still be open and idle,
+and one which has been idle for `CHECK_AFTER` seconds must also answer a
+`SELECT 1`. A connection which fails is closed and replaced, so a
+connection dropped by the server, a proxy or a failover isn't handed to
+a request.
+"""
+import functools
+
+from django.db.backends.postgresql import base as postgresql
+from psycopg2 import extensions
+
+from config.db import stats
+from config.db.pool import ConnectionPool, PoolTimeout, check_idle_connection, get_pool
+
+
+# Seconds a pooled connection may be idle before it is checked with a query:
+DEFAULT_CHECK_AFTER = 30
+
+
+def check_connection(connection, idle_seconds, check_after=DEFAULT_CHECK_AFTER):
+    """
+    Return whether an idle pooled psycopg2 connection can be reused.
+    """
+    if not connection.closed and connection.status != extensions.STATUS_READY:
+        return False
+    return check_idle_connection(connection, idle_seconds, check_after)
+
+
+class DatabaseWrapper(postgresql.DatabaseWrapper):
+
+    @property
+    def pool(self):
+        options = self.settings_dict.get('POOL')
+        if not options:
+            return None
+        return get_pool(self.alias, lambda: ConnectionPool(
+            connect=functools.partial(
+                postgresql.DatabaseWrapper.get_new_connection,
+                self,
+                self.get_connection_params(),
+            ),
+            max_size=options.get('MAX_SIZE', 10),
+            timeout=options.get('TIMEOUT', 10),
+            max_age=options.get('MAX_AGE'),
+            check=functools.partial(
+                check_connection,
+                check_after=options.get('CHECK_AFTER', DEFAULT_CHECK_AFTER),
+            ),
+        ))
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            connection = super().get_new_connection(conn_params)
+            stats.connection_opened(self)
+            return connection
+        try:
+            return pool.acquire()
+        except PoolTimeout as error:
+            # Reported like any other failure to connect.
+            raise self.Database.OperationalError(str(error)) from error
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            if self.connection is not None:
+                super()._close()
+                stats.connection_closed(self)
+            return
+        connection = self.connection
+        reusable = not connection.closed
+        if reusable and connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except self.Database.Error:
+                reusable = False
+        pool.release(connection, reusable=reusable)
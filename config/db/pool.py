@@ -0,0 +1,246 @@
+"""
+A small in-process database connection pool for threaded workers.
+
+Django has no connection pooling of its own: each thread holds its own
+connection, and with `CONN_MAX_AGE = 0` opens a new one for every request.
+`ConnectionPool` keeps up to `max_size` open connections per process which
+threads check out and return, so connections are shared between the
+threads of a worker and reused across requests.
+
+The pool doesn't know about any particular database driver: it is given
+functions which open a connection and check an idle one still works, and
+is told when a returned connection can't be reused. See
+`config.db.backends.postgresql`.
+
+Every pool records checkout waits, connection ages and reuse counts,
+available from `get_pool_stats()`.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+
+class PoolTimeout(Exception):
+    """
+    Raised when no connection could be checked out within the timeout.
+    """
+
+
+@dataclass
+class PooledConnection:
+    connection: object
+    created_at: float = field(default_factory=time.monotonic)
+    returned_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+    @property
+    def age(self):
+        return time.monotonic() - self.created_at
+
+    @property
+    def idle_time(self):
+        return time.monotonic() - self.returned_at
+
+
+class ConnectionPool:
+    """
+    Pool of up to `max_size` connections opened by `connect()`.
+
+    Connections older than `max_age` seconds are closed when they are
+    returned rather than reused, so the server side is recycled now and
+    then. `acquire()` waits up to `timeout` seconds for a connection when
+    all `max_size` are in use.
+
+    Before an idle connection is handed out again it is passed to
+    `check(connection, idle_seconds)`. If that returns false or raises, the
+    connection, which the server may have dropped meanwhile, is closed and
+    another one is used instead.
+    """
+
+    def __init__(self, connect, max_size, timeout=10, max_age=None, close=None, check=None):
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1.')
+        self.connect = connect
+        self.close_connection = close or (lambda connection: connection.close())
+        self.check_connection = check
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_age = max_age
+        self.idle = []
+        self.in_use = {}
+        self.opening = 0
+        self.condition = threading.Condition()
+        self.stats = {
+            'checkouts': 0,
+            'reuses': 0,
+            'timeouts': 0,
+            'failed_checks': 0,
+            'connections_opened': 0,
+            'connections_closed': 0,
+            'wait_seconds_total': 0.0,
+            'wait_seconds_max': 0.0,
+        }
+
+    @property
+    def size(self):
+        return len(self.idle) + len(self.in_use) + self.opening
+
+    def acquire(self):
+        """
+        Check out a connection, opening one if the pool isn't full.
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        pooled = None
+        while pooled is None:
+            with self.condition:
+                while not self.idle and self.size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats['timeouts'] += 1
+                        raise PoolTimeout(
+                            f'No database connection available within {self.timeout}s '
+                            f'({self.max_size} in use).'
+                        )
+                    self.condition.wait(remaining)
+                # The most recently returned connection, which is the least
+                # likely to have been dropped by the server:
+                pooled = self.idle.pop() if self.idle else None
+                # Counted in `size` while it is checked or opened.
+                self.opening += 1
+
+            if pooled is not None and not self.is_usable(pooled):
+                with self.condition:
+                    self.opening -= 1
+                    self.stats['failed_checks'] += 1
+                    self.condition.notify()
+                self.discard(pooled)
+                pooled = None
+                continue
+            reused = pooled is not None
+            if not reused:
+                try:
+                    pooled = PooledConnection(self.connect())
+                except BaseException:
+                    with self.condition:
+                        self.opening -= 1
+                        self.condition.notify()
+                    raise
+
+        wait = time.monotonic() - start
+        with self.condition:
+            self.opening -= 1
+            self.stats['reuses' if reused else 'connections_opened'] += 1
+            pooled.uses += 1
+            self.in_use[id(pooled.connection)] = pooled
+            self.stats['checkouts'] += 1
+            self.stats['wait_seconds_total'] += wait
+            self.stats['wait_seconds_max'] = max(self.stats['wait_seconds_max'], wait)
+        return pooled.connection
+
+    def is_usable(self, pooled):
+        if self.check_connection is None:
+            return True
+        try:
+            return bool(self.check_connection(pooled.connection, pooled.idle_time))
+        except Exception:
+            return False
+
+    def release(self, connection, reusable=True):
+        """
+        Return a connection checked out with `acquire()`. It is closed
+        instead of being kept if it isn't `reusable` or is too old.
+        """
+        with self.condition:
+            pooled = self.in_use.pop(id(connection))
+            keep = reusable and (self.max_age is None or pooled.age < self.max_age)
+            if keep:
+                pooled.returned_at = time.monotonic()
+                self.idle.append(pooled)
+            self.condition.notify()
+        if not keep:
+            self.discard(pooled)
+
+    def discard(self, pooled):
+        try:
+            self.close_connection(pooled.connection)
+        except Exception:
+            pass
+        with self.condition:
+            self.stats['connections_closed'] += 1
+
+    def close_all(self):
+        """
+        Close the idle connections.
+        """
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for pooled in idle:
+            self.discard(pooled)
+
+    def get_stats(self):
+        with self.condition:
+            connections = self.idle + list(self.in_use.values())
+            return {
+                **self.stats,
+                'size': len(connections),
+                'idle': len(self.idle),
+                'in_use': len(self.in_use),
+                'max_size': self.max_size,
+                'connection_age_seconds_max': max(
+                    (pooled.age for pooled in connections), default=0.0,
+                ),
+                'connection_uses_max': max(
+                    (pooled.uses for pooled in connections), default=0,
+                ),
+            }
+
+
+def check_idle_connection(connection, idle_seconds, check_after):
+    """
+    Return whether a DB-API `connection` idle for `idle_seconds` can be
+    reused: it mustn't be closed and, once idle for `check_after` seconds,
+    must answer a `SELECT 1`.
+    """
+    if connection.closed:
+        return False
+    if idle_seconds >= check_after:
+        cursor = connection.cursor()
+        try:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        finally:
+            cursor.close()
+        # The check mustn't leave a transaction open.
+        connection.rollback()
+    return True
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, factory):
+    """
+    Return the process's pool for the database `alias`, creating it with
+    `factory()` the first time.
+
+    Pools are per process: a pool inherited through `fork()` belongs to
+    the parent and is replaced.
+    """
+    key = (os.getpid(), alias)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = factory()
+        return _pools[key]
+
+
+def get_pool_stats():
+    """
+    Return `{database alias: stats}` for this process's pools.
+    """
+    pid = os.getpid()
+    with _pools_lock:
+        pools = {alias: pool for (key_pid, alias), pool in _pools.items() if key_pid == pid}
+    return {alias: pool.get_stats() for alias, pool in pools.items()}
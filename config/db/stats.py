@@ -0,0 +1,59 @@
+"""
+Connection counters for the `config.db` database backends.
+
+These live apart from the backends so they can be read without importing
+a database driver.
+"""
+import threading
+import time
+import weakref
+from collections import Counter
+
+from config.db.pool import get_pool_stats
+
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+_open_wrappers = weakref.WeakSet()
+
+
+def connection_opened(wrapper):
+    wrapper.connection_opened_at = time.monotonic()
+    _open_wrappers.add(wrapper)
+    with _stats_lock:
+        _stats['connections_opened'] += 1
+
+
+def connection_closed(wrapper):
+    with _stats_lock:
+        _stats['connections_closed'] += 1
+
+
+def get_connection_stats():
+    """
+    Return counts of the unpooled connections opened and closed in this
+    process, how many are open and the age of the oldest.
+    """
+    now = time.monotonic()
+    ages = [
+        now - wrapper.connection_opened_at
+        for wrapper in list(_open_wrappers)
+        if wrapper.connection is not None
+    ]
+    with _stats_lock:
+        return {
+            'connections_opened': _stats['connections_opened'],
+            'connections_closed': _stats['connections_closed'],
+            'open': len(ages),
+            'connection_age_seconds_max': max(ages, default=0.0),
+        }
+
+
+def get_database_stats():
+    """
+    Return the unpooled connection stats and the stats of every pool.
+    """
+    return {
+        'connections': get_connection_stats(),
+        'pools': get_pool_stats(),
+    }
@@ -0,0 +1,296 @@
+"""
+Per-view request metrics, served in the Prometheus text format.
+
+`MetricsMiddleware` times every request and counts the SQL queries it runs
+and the time they take, by the resolved URL name of the view, for example
+`rodbt:journals` or `dashboard`. Queries are counted by a database execute
+wrapper added to every connection, which adds to the stats of the request
+in the current context, so queries run in `sync_to_async()` threads by
+async views are counted too. The body of a streaming response, and the
+queries run while producing it, are read after the view returns, so such
+a request is recorded when its body has been sent.
+
+`metrics_view` serves the totals, with the `config.cache` and `config.db`
+stats, to staff users at `/metrics`. Like those, they are per process:
+scrape each worker, or add the series up.
+"""
+import asyncio
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from django.core.exceptions import PermissionDenied
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+from config.cache import get_cache_stats
+from config.db.stats import get_database_stats
+
+
+# Upper bounds, in seconds, of the request latency histogram buckets:
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# View label of requests which didn't resolve to a view:
+UNRESOLVED = '<unresolved>'
+
+_current_request = ContextVar('current_request_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = ('queries', 'sql_seconds')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper adding each query to the current request's
+    `RequestStats`, if there is one.
+    """
+    stats = _current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.sql_seconds += time.perf_counter() - start
+
+
+def instrument_connection(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def instrument_connections(**kwargs):
+    """
+    Instrument the current thread's open connections, which were opened
+    before `instrument_connection()` was connected to `connection_created`.
+
+    Connected to `request_started`, which the ASGI handler sends in the
+    thread the request's sync code, queries included, runs in.
+    """
+    for connection in connections.all(initialized_only=True):
+        instrument_connection(connection)
+
+
+connection_created.connect(instrument_connection)
+request_started.connect(instrument_connections)
+instrument_connections()
+
+
+class ViewMetrics:
+    """
+    Totals for the requests to one view.
+    """
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.seconds = 0.0
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.responses = defaultdict(int)
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = defaultdict(ViewMetrics)
+
+    def record(self, view, method, status, seconds, stats):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self.lock:
+            metrics = self.views[view]
+            metrics.buckets[bucket] += 1
+            metrics.seconds += seconds
+            metrics.queries += stats.queries
+            metrics.sql_seconds += stats.sql_seconds
+            metrics.responses[method, status] += 1
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                view: (
+                    list(metrics.buckets),
+                    metrics.seconds,
+                    metrics.queries,
+                    metrics.sql_seconds,
+                    dict(metrics.responses),
+                )
+                for view, metrics in self.views.items()
+            }
+
+
+registry = MetricsRegistry()
+
+
+class RecordedStream:
+    """
+    Iterator over the `content` of a streaming response which adds the
+    queries run while reading it to `stats`, and calls `on_close()` once
+    when the response is closed.
+    """
+
+    def __init__(self, content, stats, on_close):
+        self.iterator = iter(content)
+        self.stats = stats
+        self.on_close = on_close
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token = _current_request.set(self.stats)
+        try:
+            return next(self.iterator)
+        finally:
+            _current_request.reset(token)
+
+    def close(self):
+        # Called once the response has been sent, or abandoned.
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close()
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, SQL query count and SQL time of every request in
+    `registry`. List it first in `MIDDLEWARE` so the time and queries of
+    the other middleware, such as loading the session and user, count.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        return self.process_response(request, response, start, stats)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        return self.process_response(request, response, start, stats)
+
+    def process_response(self, request, response, start, stats):
+        if response.streaming:
+            response.streaming_content = RecordedStream(
+                response.streaming_content,
+                stats,
+                lambda: self.record(request, response, time.perf_counter() - start, stats),
+            )
+        else:
+            self.record(request, response, time.perf_counter() - start, stats)
+        return response
+
+    def record(self, request, response, seconds, stats):
+        match = request.resolver_match
+        registry.record(
+            match.view_name if match else UNRESOLVED,
+            request.method,
+            response.status_code,
+            seconds,
+            stats,
+        )
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_metric(lines, name, labels, value):
+    label_text = ','.join(f'{key}="{escape_label(label)}"' for key, label in labels.items())
+    lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+
+def render_metrics():
+    """
+    Return every metric in the Prometheus text exposition format.
+    """
+    lines = []
+
+    lines.append('# HELP http_request_duration_seconds Request latency by view.')
+    lines.append('# TYPE http_request_duration_seconds histogram')
+    lines_requests = [
+        '# HELP http_requests_total Responses by view, method and status.',
+        '# TYPE http_requests_total counter',
+    ]
+    lines_queries = [
+        '# HELP db_queries_total SQL queries run by requests to each view.',
+        '# TYPE db_queries_total counter',
+    ]
+    lines_sql = [
+        '# HELP db_query_duration_seconds_total Time spent in SQL by requests to each view.',
+        '# TYPE db_query_duration_seconds_total counter',
+    ]
+    for view, (buckets, seconds, queries, sql_seconds, responses) in sorted(registry.snapshot().items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), buckets):
+            cumulative += count
+            format_metric(lines, 'http_request_duration_seconds_bucket', {'view': view, 'le': bound}, cumulative)
+        format_metric(lines, 'http_request_duration_seconds_sum', {'view': view}, seconds)
+        format_metric(lines, 'http_request_duration_seconds_count', {'view': view}, cumulative)
+        for (method, status), count in sorted(responses.items()):
+            format_metric(lines_requests, 'http_requests_total', {'view': view, 'method': method, 'status': status}, count)
+        format_metric(lines_queries, 'db_queries_total', {'view': view}, queries)
+        format_metric(lines_sql, 'db_query_duration_seconds_total', {'view': view}, sql_seconds)
+    lines += lines_requests + lines_queries + lines_sql
+
+    lines.append('# HELP cache_events_total Cache hits, misses and writes by cache.')
+    lines.append('# TYPE cache_events_total counter')
+    for cache, events in sorted(get_cache_stats().items()):
+        for event, count in sorted(events.items()):
+            format_metric(lines, 'cache_events_total', {'cache': cache, 'event': event}, count)
+
+    database = get_database_stats()
+    lines.append('# HELP db_connections Unpooled database connection stats.')
+    lines.append('# TYPE db_connections gauge')
+    for stat, value in sorted(database['connections'].items()):
+        format_metric(lines, 'db_connections', {'stat': stat}, value)
+    lines.append('# HELP db_pool Database connection pool stats by alias.')
+    lines.append('# TYPE db_pool gauge')
+    for alias, stats in sorted(database['pools'].items()):
+        for stat, value in sorted(stats.items()):
+            format_metric(lines, 'db_pool', {'alias': alias, 'stat': stat}, value)
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """
+    Serve `render_metrics()` to staff users.
+    """
+    if not (request.user.is_active and request.user.is_staff):
+        raise PermissionDenied
+    return HttpResponse(
+        render_metrics(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -0,0 +1,196 @@
+"""
+Query budgets: the most SQL queries and rows each route may cost.
+
+`QUERY_BUDGETS` maps the name of every route in `config.urls` to the
+`QueryBudget`s of the requests made to it, at the data size of
+`BUDGET_DATASET`. `config.tests.test_query_budgets` makes each request and
+fails, listing the SQL, when one goes over budget, and also fails when a
+route has no budget. The admin and admindocs routes are Django's own and
+only the admin pages of our models have budgets.
+
+Rows are the rows returned by each `SELECT`, found by running it first
+inside `SELECT COUNT(*)`.
+
+When a change needs a bigger budget, raise it here in the same commit, so
+the cost shows up in review.
+"""
+from dataclasses import dataclass, field
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+# `benchmarks.seed.seed()` arguments of the budget test data:
+BUDGET_DATASET = {'users': 2, 'journals': 60, 'questions': 30, 'links': 2}
+# Users waiting in the registration queue in the budget test data:
+BUDGET_PENDING_USERS = 60
+
+# Namespaces of routes which need no budget:
+UNBUDGETED_NAMESPACES = ('admin', 'django-admindocs')
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """
+    Budget of one request to a route.
+
+    `args`, and `data` values, may name test data in angle brackets, which
+    the test replaces with its value: the primary key of `'<journal>'`,
+    `'<question>'` or `'<user>'`, a list of `'<journals>'` or a password
+    reset `'<uidb64>'` and `'<token>'`, or a list of `'<pending>'` users.
+    `user` is who makes the request: `'registered'`, `'moderator'`,
+    `'staff'` or `None` for anonymous.
+    """
+    queries: int
+    rows: int
+    method: str = 'GET'
+    args: tuple = ()
+    data: dict = field(default_factory=dict)
+    user: str = 'registered'
+    status: int = 200
+
+
+QUERY_BUDGETS = {
+    # The session and the user come from the database, so pages without
+    # data of their own need two queries.
+    'home': [QueryBudget(queries=2, rows=2)],
+    'signup': [QueryBudget(queries=0, rows=0, user=None)],
+    'login': [QueryBudget(queries=0, rows=0, user=None)],
+    'logout': [QueryBudget(queries=4, rows=3, method='POST', status=302)],
+    'password_change': [QueryBudget(queries=2, rows=2)],
+    'password_change_done': [QueryBudget(queries=2, rows=2)],
+    'password_reset': [QueryBudget(queries=0, rows=0, user=None)],
+    'password_reset_done': [QueryBudget(queries=0, rows=0, user=None)],
+    # A valid link saves its token in a new session and redirects:
+    'password_reset_confirm': [QueryBudget(
+        queries=5, rows=1, args=('<uidb64>', '<token>'), user=None, status=302,
+    )],
+    'password_reset_complete': [QueryBudget(queries=0, rows=0, user=None)],
+    # Session, user, journal and question counts, and the newest of each:
+    'dashboard': [QueryBudget(queries=6, rows=14)],
+    'edit_profile': [QueryBudget(queries=3, rows=3, args=('<user>',))],
+    'metrics': [QueryBudget(queries=2, rows=2, user='staff')],
+    # Session, user and a page of 50 pending users plus one; deciding is one
+    # query to check the selected users and one `UPDATE`:
+    'registration_queue': [
+        QueryBudget(queries=3, rows=53, user='moderator'),
+        QueryBudget(
+            queries=4, rows=4, method='POST', status=302, user='moderator',
+            data={'users': '<pending>', 'decision': 'approve'},
+        ),
+    ],
+
+    'rodbt:index': [QueryBudget(queries=0, rows=0, user=None)],
+    # Session, user, conditional GET aggregate, fragment version, a page of
+    # 25 journals plus one and their questions' links. Saving a journal or
+    # question deletes the fragment version, one query for each signal:
+    'rodbt:journals': [QueryBudget(queries=6, rows=56)],
+    'rodbt:journal-create': [
+        QueryBudget(queries=2, rows=2),
+        QueryBudget(
+            queries=5, rows=2, method='POST', status=302,
+            data={'title': 'A Journal', 'body': 'A Journal body.'},
+        ),
+    ],
+    'rodbt:journal-detail': [QueryBudget(queries=4, rows=4, args=('<journal>',))],
+    'rodbt:questions': [QueryBudget(queries=6, rows=82)],
+    'rodbt:question-create': [
+        QueryBudget(queries=2, rows=2),
+        QueryBudget(
+            queries=10, rows=4, method='POST', status=302,
+            data={'body': 'A Question?', 'journal': '<journals>'},
+        ),
+    ],
+    'rodbt:question-detail': [QueryBudget(queries=4, rows=4, args=('<question>',))],
+    'rodbt:search': [QueryBudget(queries=4, rows=44, data={'q': 'calm'})],
+    'rodbt:import': [QueryBudget(queries=2, rows=2)],
+    # The API streams every row of the user's:
+    'rodbt:api:journals': [QueryBudget(queries=3, rows=62)],
+    'rodbt:api:journal-lookup': [QueryBudget(queries=3, rows=13, data={'q': 'Journal 1'})],
+    'rodbt:api:questions': [QueryBudget(queries=3, rows=32)],
+
+    # The `date` and `edited_date` filters predate these budgets. Their
+    # links are fixed date ranges, so they add no queries, and a filtered
+    # page costs what an unfiltered one does:
+    'admin:rodbt_journal_changelist': [
+        QueryBudget(queries=5, rows=104, user='staff'),
+        QueryBudget(queries=5, rows=104, user='staff', data={'date__gte': '2000-01-01'}),
+    ],
+    'admin:rodbt_journal_change': [QueryBudget(queries=7, rows=5, args=('<journal>',), user='staff')],
+    'admin:rodbt_question_changelist': [
+        QueryBudget(queries=5, rows=64, user='staff'),
+        QueryBudget(queries=5, rows=64, user='staff', data={'edited_date__gte': '2000-01-01'}),
+    ],
+    'admin:rodbt_question_change': [QueryBudget(queries=9, rows=9, args=('<question>',), user='staff')],
+    # A page of the `QuestionAdmin` `journal` autocomplete:
+    'admin:autocomplete': [QueryBudget(
+        queries=4, rows=23, user='staff',
+        data={'app_label': 'rodbt', 'model_name': 'question', 'field_name': 'journal', 'term': 'Journal 1'},
+    )],
+    'admin:accounts_customuser_changelist': [QueryBudget(queries=6, rows=68, user='staff')],
+}
+
+
+class BudgetQueriesContext(CaptureQueriesContext):
+    """
+    `CaptureQueriesContext` which also counts the rows each `SELECT`
+    returns, in `rows` alongside `captured_queries`.
+    """
+
+    def __enter__(self):
+        self.rows = []
+        self.wrapper = self.connection.execute_wrapper(self.record)
+        self.wrapper.__enter__()
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        self.wrapper.__exit__(exc_type, exc_value, traceback)
+
+    def record(self, execute, sql, params, many, context):
+        # Counted before the query runs, so later writes don't change it.
+        self.rows.append(0 if many else self.count_rows(sql, params))
+        return execute(sql, params, many, context)
+
+    def count_rows(self, sql, params):
+        if not sql.lstrip().upper().startswith('SELECT'):
+            return 0
+        with self.connection.cursor() as cursor:
+            # The database's own cursor, so the count isn't captured itself.
+            cursor.cursor.execute(f'SELECT COUNT(*) FROM ({sql}) budget_rows', params)
+            return cursor.cursor.fetchone()[0]
+
+
+def get_budget_failure(name, budget, context):
+    """
+    Return why the queries captured by `context` went over `budget`, with
+    the offending SQL, or `None` if they didn't.
+    """
+    queries = len(context.captured_queries)
+    rows = sum(context.rows)
+    if queries <= budget.queries and rows <= budget.rows:
+        return None
+    lines = [
+        f'{budget.method} {name} ran {queries} queries (budget {budget.queries}) '
+        f'returning {rows} rows (budget {budget.rows}):'
+    ]
+    for number, (query, query_rows) in enumerate(zip(context.captured_queries, context.rows), 1):
+        lines.append(f'{number}. [{query_rows} rows] {query["sql"]}')
+    return '\n'.join(lines)
+
+
+class QueryBudgetMixin:
+    """
+    `TestCase` mixin with `assertWithinBudget()`.
+    """
+
+    def assertWithinBudget(self, name, budget, request):
+        """
+        Call `request()` and fail, listing its SQL, if it goes over `budget`.
+        """
+        with BudgetQueriesContext(connection) as context:
+            response = request()
+        failure = get_budget_failure(name, budget, context)
+        if failure:
+            self.fail(failure)
+        return response
@@ -40,6 +40,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so the latency and queries of the other middleware count:
+    'config.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -74,6 +76,56 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+# `default` is a `config.cache.TieredCache`: a per-process LRU in front of
+# `shared`, the database cache table, so it is shared by every process
+# without a cache server. Create the table with `createcachetable`, which
+# the `Procfile` release phase runs. Another process's changes reach the
+# local tier after up to `LOCAL_TIMEOUT` seconds.
+#
+# `fragments` holds the rendered `rodbt` list and detail fragments. The
+# local-memory cache evicts least recently used entries beyond
+# `MAX_ENTRIES`. It is per process, but the version tokens in its keys are
+# in `default`'s shared tier, so a change invalidates every process's
+# fragments.
+CACHES = {
+    'default': {
+        'BACKEND': 'config.cache.TieredCache',
+        'LOCATION': 'default',
+        'OPTIONS': {
+            'SHARED': 'shared',
+            'LOCAL_TIMEOUT': 10,
+            'LOCAL_MAX_ENTRIES': 1000,
+            # `rodbt.cache` fragment versions, which must change for every
+            # process at once:
+            'SHARED_ONLY_KEY_PREFIXES': ['rodbt:fragment-version:'],
+        },
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'rodbt-fragments',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+}
+
+# Sessions stay in the database. A logout must reach every process at
+# once, so they can't be kept in the local tier, and reading them from the
+# database cache costs the same query as reading `django_session` while
+# writing them there costs several more.
+SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -17,15 +17,38 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # Django's PostgreSQL backend, plus optional pooling and connection
+        # counts, see `config.db.backends.postgresql`:
+        'ENGINE': 'config.db.backends.postgresql',
         'NAME': os.environ.get('DATABASE_NAME'),
         'HOST': os.environ.get('DATABASE_HOST'),
         'PORT': os.environ.get('DATABASE_PORT'),
         'USER': os.environ.get('DATABASE_USER'),
         'PASSWORD': os.environ.get('DATABASE_PASSWORD'),
+        # Keep each thread's connection open between requests for this many
+        # seconds, checking it still works before it is reused:
+        'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.environ.get('DATABASE_CONN_HEALTH_CHECKS', 'true').lower() == 'true',
     }
 }
 
+# Set `DATABASE_POOL_MAX_SIZE` to share a pool of connections between the
+# threads of each worker, for example with `gunicorn --threads`. Threads
+# then return their connection to the pool at the end of every request.
+DATABASE_POOL_MAX_SIZE = int(os.environ.get('DATABASE_POOL_MAX_SIZE', '0'))
+if DATABASE_POOL_MAX_SIZE:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['POOL'] = {
+        'MAX_SIZE': DATABASE_POOL_MAX_SIZE,
+        # Seconds to wait for a free connection before failing:
+        'TIMEOUT': float(os.environ.get('DATABASE_POOL_TIMEOUT', '10')),
+        # Seconds after which a connection is closed instead of reused:
+        'MAX_AGE': float(os.environ.get('DATABASE_POOL_MAX_AGE', '1800')),
+        # Seconds idle after which a connection is checked with a query
+        # before it is reused:
+        'CHECK_AFTER': float(os.environ.get('DATABASE_POOL_CHECK_AFTER', '30')),
+    }
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.0/howto/deployment/checklist/
@@ -0,0 +1,36 @@
+"""
+Production settings for serving the site under ASGI, with the async
+`rodbt` views.
+
+An async worker holds a slow client's request in the event loop rather
+than in a thread, so one process can serve many more concurrent clients
+than the single sync gunicorn worker of the `Procfile`. Database work
+still runs in threads, one per request, so with `CONN_MAX_AGE` each of
+those threads would keep a connection open; connections are closed after
+every request instead and shared through the connection pool.
+
+To deploy, add `uvicorn` to the `Pipfile` and run:
+
+    DJANGO_SETTINGS_MODULE=config.settings.production_asgi \\
+        gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+
+Size `DATABASE_POOL_MAX_SIZE` (default 10 here) to the number of requests
+which may query at once, within the database's connection limit. Compare
+the two deployments with `benchmarks/concurrency.py`.
+"""
+import os
+
+from config.settings.production import *
+
+
+ROOT_URLCONF = 'config.urls_async'
+
+ASGI_APPLICATION = 'config.asgi.application'
+
+DATABASES['default']['CONN_MAX_AGE'] = 0
+DATABASES['default'].setdefault('POOL', {
+    'MAX_SIZE': int(os.environ.get('DATABASE_POOL_MAX_SIZE', '10')),
+    'TIMEOUT': float(os.environ.get('DATABASE_POOL_TIMEOUT', '10')),
+    'MAX_AGE': float(os.environ.get('DATABASE_POOL_MAX_AGE', '1800')),
+    'CHECK_AFTER': float(os.environ.get('DATABASE_POOL_CHECK_AFTER', '30')),
+})
@@ -0,0 +1,132 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase
+
+from config.cache import TieredCache, get_cache_stats, reset_cache_stats
+
+
+SHARED_ONLY_PREFIX = 'shared-only:'
+SHARED_ONLY_KEY = f'{SHARED_ONLY_PREFIX}a-key'
+
+
+def make_other_process_cache(name='other-process', **options):
+    """
+    Return a `TieredCache` like `default`, with `options` added, and its
+    own local tier, as another process would have.
+    """
+    params = settings.CACHES['default']
+    return TieredCache(name, {**params, 'OPTIONS': {**params['OPTIONS'], **options}})
+
+
+class TieredCacheTest(TestCase):
+    """
+    Test the `config.cache.TieredCache` `default` cache.
+    """
+
+    def setUp(self):
+        self.cache = caches['default']
+        self.cache.clear()
+        reset_cache_stats()
+
+    def test_set_value_is_served_locally(self):
+        """
+        A value just set should be read from the local tier without a query.
+        """
+        self.cache.set('key', 'value')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(get_cache_stats()['default']['local_hits'], 1)
+
+    def test_shared_value_is_copied_to_local_tier(self):
+        """
+        A value only in the shared tier should be read from it once and
+        then served locally.
+        """
+        caches['shared'].set('key', 'value')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.cache.get('key'), 'value')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.cache.get('key'), 'value')
+        stats = get_cache_stats()['default']
+        self.assertEqual(stats['shared_hits'], 1)
+        self.assertEqual(stats['local_hits'], 1)
+
+    def test_missing_value_is_counted(self):
+        """
+        A value in neither tier should return the default and count a miss.
+        """
+        self.assertEqual(self.cache.get('missing', 'default'), 'default')
+        self.assertEqual(get_cache_stats()['default']['misses'], 1)
+
+    def test_delete_removes_value_from_both_tiers(self):
+        """
+        `delete()` should remove the value from both tiers.
+        """
+        self.cache.set('key', 'value')
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+        self.assertIsNone(caches['shared'].get('key'))
+
+    def test_get_many_combines_tiers(self):
+        """
+        `get_many()` should read what it can locally and the rest from the
+        shared tier.
+        """
+        self.cache.set('local', 1)
+        caches['shared'].set('shared', 2)
+        self.assertEqual(
+            self.cache.get_many(['local', 'shared', 'missing']),
+            {'local': 1, 'shared': 2},
+        )
+        stats = get_cache_stats()['default']
+        self.assertEqual(
+            (stats['local_hits'], stats['shared_hits'], stats['misses']),
+            (1, 1, 1),
+        )
+
+    def test_shared_only_key_deleted_in_one_process_is_gone_in_another(self):
+        """
+        A `SHARED_ONLY_KEY_PREFIXES` key deleted through one `TieredCache`
+        should be missing when read through another.
+        """
+        cache = make_other_process_cache('one-process', SHARED_ONLY_KEY_PREFIXES=[SHARED_ONLY_PREFIX])
+        other = make_other_process_cache(SHARED_ONLY_KEY_PREFIXES=[SHARED_ONLY_PREFIX])
+        cache.set(SHARED_ONLY_KEY, {'user': 1})
+        self.assertEqual(other.get(SHARED_ONLY_KEY), {'user': 1})
+        cache.delete(SHARED_ONLY_KEY)
+        self.assertIsNone(other.get(SHARED_ONLY_KEY))
+
+    def test_other_keys_are_kept_locally_in_each_process(self):
+        """
+        Other keys may be served from a process's local tier
+        after another process deleted them, for up to `LOCAL_TIMEOUT`.
+        """
+        other = make_other_process_cache()
+        self.cache.set('key', 'value')
+        self.assertEqual(other.get('key'), 'value')
+        self.cache.delete('key')
+        with self.assertNumQueries(0):
+            self.assertEqual(other.get('key'), 'value')
+
+    def test_local_copy_expires_with_shared_value(self):
+        """
+        A shared value copied locally should expire from the local tier
+        when it expires from the shared tier, not after `LOCAL_TIMEOUT`.
+        """
+        other = make_other_process_cache()
+        self.cache.set('key', 'value', timeout=2)
+        now = time.time()
+        self.assertEqual(other.get('key'), 'value')
+        with mock.patch('time.time', return_value=now + 3):
+            self.assertIsNone(other.local.get('key'))
+
+    def test_incr_keeps_expiry(self):
+        """
+        `incr()` should add to the shared value and keep it readable.
+        """
+        self.cache.set('counter', 1)
+        self.assertEqual(self.cache.incr('counter', 2), 3)
+        self.assertEqual(make_other_process_cache().get('counter'), 3)
@@ -0,0 +1,189 @@
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from config.db.pool import ConnectionPool, PoolTimeout, check_idle_connection
+
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise OSError('server closed the connection unexpectedly')
+        self.connection.executed.append(sql)
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+        self.executed = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    """
+    Test `config.db.pool.ConnectionPool` with stand-in connections.
+    """
+
+    def make_pool(self, **kwargs):
+        self.opened = []
+
+        def connect():
+            connection = FakeConnection()
+            self.opened.append(connection)
+            return connection
+
+        return ConnectionPool(connect, **kwargs)
+
+    def test_released_connection_is_reused(self):
+        """
+        A returned connection should be handed out again rather than a new
+        one opened.
+        """
+        pool = self.make_pool(max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+        stats = pool.get_stats()
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['reuses'], 1)
+        self.assertEqual(stats['connection_uses_max'], 2)
+
+    def test_unusable_connection_is_closed(self):
+        """
+        A connection returned as not reusable should be closed.
+        """
+        pool = self.make_pool(max_size=1)
+        connection = pool.acquire()
+        pool.release(connection, reusable=False)
+        self.assertTrue(connection.closed)
+        self.assertIsNot(pool.acquire(), connection)
+
+    def test_old_connection_is_closed(self):
+        """
+        A connection older than `max_age` should be closed when returned.
+        """
+        pool = self.make_pool(max_size=1, max_age=0)
+        connection = pool.acquire()
+        pool.release(connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.get_stats()['connections_closed'], 1)
+
+    def test_full_pool_times_out(self):
+        """
+        `acquire()` should raise `PoolTimeout` when every connection stays
+        in use.
+        """
+        pool = self.make_pool(max_size=1, timeout=0.01)
+        pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.get_stats()['timeouts'], 1)
+
+    def test_waiting_thread_gets_released_connection(self):
+        """
+        A thread waiting on a full pool should get the next connection
+        returned, and its wait should be recorded.
+        """
+        pool = self.make_pool(max_size=1, timeout=5)
+        connection = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        threading.Timer(0.05, pool.release, [connection]).start()
+        waiter.join()
+        self.assertEqual(acquired, [connection])
+        self.assertGreater(pool.get_stats()['wait_seconds_max'], 0.01)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_connection_failing_check_is_replaced(self):
+        """
+        An idle connection which fails the check should be closed and a new
+        one opened instead.
+        """
+        pool = self.make_pool(max_size=1, check=lambda connection, idle_seconds: not connection.broken)
+        connection = pool.acquire()
+        pool.release(connection)
+        connection.broken = True
+        replacement = pool.acquire()
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(self.opened, [connection, replacement])
+        stats = pool.get_stats()
+        self.assertEqual(stats['failed_checks'], 1)
+        self.assertEqual(stats['reuses'], 0)
+        self.assertEqual(stats['size'], 1)
+
+    def test_check_raising_counts_as_failure(self):
+        """
+        A check which raises should discard the connection rather than fail
+        the checkout.
+        """
+        def check(connection, idle_seconds):
+            raise OSError('server closed the connection unexpectedly')
+
+        pool = self.make_pool(max_size=1, check=check)
+        connection = pool.acquire()
+        pool.release(connection)
+        self.assertIsNot(pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.get_stats()['failed_checks'], 1)
+
+    def test_check_is_given_idle_time(self):
+        """
+        The check should get how long the connection was idle, and only
+        connections which were returned should be checked.
+        """
+        checks = []
+        pool = self.make_pool(
+            max_size=1,
+            check=lambda connection, idle_seconds: checks.append((connection, idle_seconds)) or True,
+        )
+        connection = pool.acquire()
+        self.assertEqual(checks, [])
+        pool.release(connection)
+        time.sleep(0.02)
+        self.assertIs(pool.acquire(), connection)
+        [(checked, idle_seconds)] = checks
+        self.assertIs(checked, connection)
+        self.assertGreaterEqual(idle_seconds, 0.02)
+
+    def test_check_idle_connection(self):
+        """
+        `check_idle_connection()` should only query connections idle for
+        `check_after` seconds, and fail closed or broken ones.
+        """
+        connection = FakeConnection()
+        self.assertTrue(check_idle_connection(connection, 1, check_after=30))
+        self.assertEqual(connection.executed, [])
+        self.assertTrue(check_idle_connection(connection, 30, check_after=30))
+        self.assertEqual(connection.executed, ['SELECT 1'])
+        self.assertEqual(connection.rollbacks, 1)
+
+        connection.broken = True
+        with self.assertRaises(OSError):
+            check_idle_connection(connection, 60, check_after=30)
+        connection.close()
+        self.assertFalse(check_idle_connection(connection, 1, check_after=30))
@@ -0,0 +1,180 @@
+import json
+from contextlib import contextmanager
+from unittest import mock
+
+from django.contrib import admin
+from django.db import connection
+from django.test import RequestFactory, TestCase
+
+from accounts.models import CustomUser
+from config.admin import EstimatedCountPaginator, estimate_count
+from rodbt.admin import JournalAdmin
+from rodbt.models import Journal
+
+
+USERNAME_STAFF = 'StaffUser'
+NUMBER_OF_JOURNALS = 5
+AN_ESTIMATE = 50000
+
+
+class FixedEstimatePaginator(EstimatedCountPaginator):
+    """
+    `EstimatedCountPaginator` with the estimate of a big table, as SQLite
+    has none.
+    """
+
+    def get_estimate(self):
+        return AN_ESTIMATE
+
+
+class PlannerCursor:
+    """
+    Stands in for a PostgreSQL cursor, answering the `pg_class` and
+    `EXPLAIN` queries of `estimate_count()` with `reltuples` and `rows`.
+    """
+
+    def __init__(self, reltuples, rows):
+        self.reltuples = reltuples
+        self.rows = rows
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchone(self):
+        sql, params = self.executed[-1]
+        if sql.startswith('EXPLAIN (FORMAT JSON) '):
+            # psycopg2 returns the plan parsed, some drivers as text:
+            return (json.dumps([{'Plan': {'Node Type': 'Seq Scan', 'Plan Rows': self.rows}}]),)
+        return (self.reltuples,)
+
+
+class EstimatedCountTest(TestCase):
+    """
+    Test `config.admin.EstimatedCountPaginator` and its use in the admin.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create a staff `CustomUser` with some `Journal`s.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        cls.user = CustomUser.objects.create(
+            username=USERNAME_STAFF,
+            is_staff=True,
+            is_superuser=True,
+        )
+        Journal.objects.bulk_create([
+            Journal(author=cls.user, title=f'Journal {number}', body='A body')
+            for number in range(NUMBER_OF_JOURNALS)
+        ])
+
+    def test_sqlite_has_no_estimate(self):
+        """
+        `estimate_count()` should return `None` where there's no estimate.
+        """
+        self.assertIsNone(estimate_count(Journal.objects.all()))
+
+    @contextmanager
+    def planner(self, reltuples=-1, rows=0):
+        """
+        Answer `estimate_count()`'s queries from a `PlannerCursor`, as if
+        on PostgreSQL.
+        """
+        cursor = PlannerCursor(reltuples, rows)
+        with mock.patch.object(connection, 'vendor', 'postgresql'), \
+                mock.patch.object(connection, 'cursor', return_value=cursor):
+            yield cursor
+
+    def test_unfiltered_queryset_is_estimated_from_reltuples(self):
+        """
+        An unfiltered queryset should be estimated from its table's
+        `pg_class.reltuples`.
+        """
+        with self.planner(reltuples=float(AN_ESTIMATE)) as cursor:
+            self.assertEqual(estimate_count(Journal.objects.order_by('id')), AN_ESTIMATE)
+        [(sql, params)] = cursor.executed
+        self.assertIn('FROM pg_class', sql)
+        self.assertEqual(params, ['"rodbt_journal"'])
+
+    def test_unanalyzed_table_has_no_estimate(self):
+        """
+        A table which hasn't been analyzed, with `reltuples` -1, should have
+        no estimate.
+        """
+        with self.planner(reltuples=-1.0):
+            self.assertIsNone(estimate_count(Journal.objects.all()))
+
+    def test_filtered_queryset_is_estimated_from_explain(self):
+        """
+        A filtered queryset should be estimated from the rows of its
+        unordered `EXPLAIN` plan.
+        """
+        queryset = Journal.objects.filter(author=self.user).order_by('-date')
+        with self.planner(rows=AN_ESTIMATE) as cursor:
+            self.assertEqual(estimate_count(queryset), AN_ESTIMATE)
+        [(sql, params)] = cursor.executed
+        self.assertTrue(sql.startswith('EXPLAIN (FORMAT JSON) SELECT'))
+        self.assertNotIn('ORDER BY', sql)
+        self.assertEqual(params, (self.user.pk,))
+
+    def test_paginator_uses_planner_estimate(self):
+        """
+        `EstimatedCountPaginator` should use `estimate_count()` and not
+        `COUNT(*)` above its threshold.
+        """
+        paginator = EstimatedCountPaginator(Journal.objects.order_by('id'), 2)
+        with self.planner(reltuples=float(AN_ESTIMATE)) as cursor:
+            self.assertEqual(paginator.count, AN_ESTIMATE)
+        self.assertTrue(paginator.is_estimated)
+        self.assertEqual(len(cursor.executed), 1)
+
+    def test_count_is_exact_without_estimate(self):
+        """
+        Without an estimate the count should be exact.
+        """
+        paginator = EstimatedCountPaginator(Journal.objects.order_by('id'), 2)
+        self.assertEqual(paginator.count, NUMBER_OF_JOURNALS)
+        self.assertFalse(paginator.is_estimated)
+
+    def test_count_is_exact_below_threshold(self):
+        """
+        Estimates below `threshold` should be replaced by an exact count.
+        """
+        paginator = FixedEstimatePaginator(
+            Journal.objects.order_by('id'), 2, threshold=AN_ESTIMATE + 1,
+        )
+        self.assertEqual(paginator.count, NUMBER_OF_JOURNALS)
+        self.assertFalse(paginator.is_estimated)
+
+    def test_estimate_is_used_above_threshold(self):
+        """
+        Estimates of at least `threshold` should be the count, without a
+        `COUNT(*)`.
+        """
+        paginator = FixedEstimatePaginator(Journal.objects.order_by('id'), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.count, AN_ESTIMATE)
+        self.assertTrue(paginator.is_estimated)
+        self.assertEqual(paginator.num_pages, AN_ESTIMATE // 2)
+
+    def test_changelist_counts_are_estimated(self):
+        """
+        The admin changelist should estimate both its result count and its
+        full result count.
+        """
+        model_admin = JournalAdmin(Journal, admin.site)
+        model_admin.paginator = FixedEstimatePaginator
+        request = RequestFactory().get('/admin/rodbt/journal/')
+        request.user = self.user
+        changelist = model_admin.get_changelist_instance(request)
+        self.assertEqual(changelist.result_count, AN_ESTIMATE)
+        self.assertEqual(changelist.full_result_count, AN_ESTIMATE)
+        self.assertEqual(len(changelist.result_list), NUMBER_OF_JOURNALS)
@@ -0,0 +1,137 @@
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import CustomUser
+from config.metrics import UNRESOLVED, registry
+from rodbt.models import Journal
+
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
+USERNAME_STAFF = 'StaffUser'
+PASSWORD_FOR_TESTING = 'a_test_password'
+
+METRICS_URL = '/metrics'
+JOURNALS_URL = '/rodbt/journals/'
+API_JOURNALS_URL = '/rodbt/api/journals/'
+
+
+class MetricsTest(TestCase):
+    """
+    Test `config.metrics.MetricsMiddleware` and the `/metrics` endpoint.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create a registered `CustomUser` with a `Journal`, and a staff user.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        cls.user = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            registration_accepted=True,
+        )
+        cls.user.set_password(PASSWORD_FOR_TESTING)
+        cls.user.save()
+        Journal.objects.create(author=cls.user, title='A Journal', body='A body')
+        staff = CustomUser.objects.create(
+            username=USERNAME_STAFF,
+            registration_accepted=True,
+            is_staff=True,
+        )
+        staff.set_password(PASSWORD_FOR_TESTING)
+        staff.save()
+
+    def setUp(self):
+        registry.reset()
+
+    def login(self, username):
+        self.client.login(username=username, password=PASSWORD_FOR_TESTING)
+
+    def test_request_is_recorded_by_view_name(self):
+        """
+        A request should be counted under its URL name with every query it
+        ran.
+        """
+        self.login(USERNAME_REGISTRATION_ACCEPTED_TRUE)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(JOURNALS_URL)
+        self.assertEqual(response.status_code, 200)
+        buckets, seconds, query_count, sql_seconds, responses = registry.snapshot()['rodbt:journals']
+        self.assertEqual(sum(buckets), 1)
+        self.assertGreater(seconds, 0)
+        self.assertEqual(query_count, len(queries))
+        self.assertGreater(sql_seconds, 0)
+        self.assertEqual(responses, {('GET', 200): 1})
+
+    @override_settings(ROOT_URLCONF='config.urls_async')
+    def test_async_request_queries_are_recorded(self):
+        """
+        Queries which async views run through `sync_to_async()` should be
+        counted.
+        """
+        self.login(USERNAME_REGISTRATION_ACCEPTED_TRUE)
+        self.async_client.cookies = self.client.cookies
+
+        async def get():
+            return await self.async_client.get(JOURNALS_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = async_to_sync(get)()
+        self.assertEqual(response.status_code, 200)
+        _, _, query_count, _, responses = registry.snapshot()['rodbt:journals']
+        self.assertEqual(query_count, len(queries))
+        self.assertGreater(query_count, 0)
+        self.assertEqual(responses, {('GET', 200): 1})
+
+    def test_streaming_response_queries_are_recorded(self):
+        """
+        Queries run while a streaming response is read, after the view has
+        returned, should be counted, and the request recorded once it has
+        been read.
+        """
+        self.login(USERNAME_REGISTRATION_ACCEPTED_TRUE)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(API_JOURNALS_URL)
+            self.assertNotIn('rodbt:api:journals', registry.snapshot())
+            content = b''.join(response.streaming_content)
+        self.assertIn(b'A Journal', content)
+        buckets, _, query_count, _, responses = registry.snapshot()['rodbt:api:journals']
+        self.assertEqual(sum(buckets), 1)
+        self.assertEqual(query_count, len(queries))
+        self.assertIn('rodbt_journal', queries[-1]['sql'])
+        self.assertEqual(responses, {('GET', 200): 1})
+
+    def test_unresolved_request_is_recorded(self):
+        """
+        A request to no view should be counted under `UNRESOLVED`.
+        """
+        self.client.get('/no-such-page/')
+        self.assertIn(UNRESOLVED, registry.snapshot())
+
+    def test_metrics_are_served_to_staff(self):
+        """
+        Staff users should get every view's metrics as Prometheus text.
+        """
+        self.login(USERNAME_REGISTRATION_ACCEPTED_TRUE)
+        self.client.get(JOURNALS_URL)
+        self.login(USERNAME_STAFF)
+        response = self.client.get(METRICS_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        self.assertIn('http_request_duration_seconds_bucket{view="rodbt:journals",le="+Inf"} 1', text)
+        self.assertIn('http_request_duration_seconds_count{view="rodbt:journals"} 1', text)
+        self.assertIn('http_requests_total{view="rodbt:journals",method="GET",status="200"} 1', text)
+        self.assertIn('db_queries_total{view="rodbt:journals"}', text)
+        self.assertIn('db_query_duration_seconds_total{view="rodbt:journals"}', text)
+
+    def test_metrics_are_forbidden_to_other_users(self):
+        """
+        `/metrics` should return 403 for anonymous and non-staff users.
+        """
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+        self.login(USERNAME_REGISTRATION_ACCEPTED_TRUE)
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
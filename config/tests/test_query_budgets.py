@@ -0,0 +1,133 @@
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import caches
+from django.db import transaction
+from django.test import TestCase
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from accounts.models import CustomUser
+from benchmarks.seed import seed
+from config.query_budgets import (
+    BUDGET_DATASET, BUDGET_PENDING_USERS, QUERY_BUDGETS, UNBUDGETED_NAMESPACES,
+    QueryBudgetMixin,
+)
+from rodbt.cache import get_user_version
+from rodbt.models import Journal, Question
+
+
+USERNAME_STAFF = 'StaffUser'
+USERNAME_MODERATOR = 'ModeratorUser'
+
+
+def get_route_names(resolver=None, namespace=''):
+    """
+    Return the names of the routes of `config.urls`, with their
+    namespaces, except those in `UNBUDGETED_NAMESPACES`.
+    """
+    names = set()
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in UNBUDGETED_NAMESPACES:
+                continue
+            prefix = f'{namespace}{pattern.namespace}:' if pattern.namespace else namespace
+            names |= get_route_names(pattern, prefix)
+        elif pattern.name and not pattern.name.startswith(UNBUDGETED_NAMESPACES):
+            names.add(namespace + pattern.name)
+    return names
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Test every route in `config.urls` against `config.query_budgets`.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Seed `BUDGET_DATASET` and create staff, moderator and pending users.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        cls.user = seed(**BUDGET_DATASET)[0]
+        # The user's fragment version token exists, as it does after their
+        # first request:
+        get_user_version(cls.user.pk)
+        cls.staff = CustomUser.objects.create(
+            username=USERNAME_STAFF,
+            registration_accepted=True,
+            is_staff=True,
+            is_superuser=True,
+        )
+        cls.moderator = CustomUser.objects.create(
+            username=USERNAME_MODERATOR,
+            registration_accepted=True,
+            is_moderator=True,
+        )
+        pending = CustomUser.objects.bulk_create([
+            CustomUser(username=f'PendingUser{number}')
+            for number in range(BUDGET_PENDING_USERS)
+        ])
+        journals = Journal.objects.filter(author=cls.user).order_by('id')
+        cls.test_data = {
+            'user': cls.user.pk,
+            'journal': journals[0].pk,
+            'journals': [journal.pk for journal in journals[:2]],
+            'question': Question.objects.filter(author=cls.user).order_by('id')[0].pk,
+            'uidb64': urlsafe_base64_encode(force_bytes(cls.user.pk)),
+            'token': default_token_generator.make_token(cls.user),
+            'pending': [user.pk for user in pending[:2]],
+        }
+
+    def fetch(self, budget, url, data):
+        """
+        Make `budget`'s request, reading streamed responses to the end, as
+        their queries run while they are read.
+        """
+        request = self.client.get if budget.method == 'GET' else self.client.post
+        response = request(url, data)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def resolve(self, value):
+        """
+        Replace a `'<name>'` placeholder with the test data it names.
+        """
+        if isinstance(value, str) and value.startswith('<') and value.endswith('>'):
+            return self.test_data[value[1:-1]]
+        return value
+
+    def test_every_route_has_a_budget(self):
+        """
+        Every named route should be listed in `QUERY_BUDGETS`.
+        """
+        self.assertEqual(get_route_names() - set(QUERY_BUDGETS), set())
+
+    def check_budget(self, name, budget):
+        self.client.logout()
+        if budget.user:
+            self.client.force_login({
+                'registered': self.user,
+                'moderator': self.moderator,
+                'staff': self.staff,
+            }[budget.user])
+        caches['fragments'].clear()
+        url = reverse(name, args=[self.resolve(arg) for arg in budget.args])
+        data = {key: self.resolve(value) for key, value in budget.data.items()}
+        response = self.assertWithinBudget(
+            name, budget, lambda: self.fetch(budget, url, data),
+        )
+        self.assertEqual(response.status_code, budget.status)
+
+    def test_routes_are_within_budget(self):
+        """
+        Every request in `QUERY_BUDGETS` should run at most its budget of
+        queries and rows.
+        """
+        for name, budgets in QUERY_BUDGETS.items():
+            for budget in budgets:
+                # Each request is rolled back, so `POST`s don't change the
+                # data the later requests see.
+                with self.subTest(route=name, method=budget.method), transaction.atomic():
+                    self.check_budget(name, budget)
+                    transaction.set_rollback(True)
@@ -18,6 +18,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic.base import TemplateView
 
+from config.metrics import metrics_view
 from config.settings.common import THE_SITE_NAME
 
 urlpatterns = [
@@ -37,4 +38,6 @@ urlpatterns = [
     path('accounts/', include('django.contrib.auth.urls')),
 
     path('rodbt/', include('rodbt.urls')),
+
+    path('metrics', metrics_view, name='metrics'),
 ]
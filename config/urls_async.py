@@ -0,0 +1,16 @@
+"""
+`config.urls` with `rodbt` served by its async views, see `rodbt.urls_async`.
+
+Used as `ROOT_URLCONF` by `config.settings.production_asgi`.
+"""
+from django.urls import include, path
+
+from config import urls
+
+
+urlpatterns = [
+    path('rodbt/', include('rodbt.urls_async'))
+    if str(pattern.pattern) == 'rodbt/'
+    else pattern
+    for pattern in urls.urlpatterns
+]
@@ -1,40 +1,77 @@
 from django.contrib import admin
 
+from config.admin import EstimatedCountAdminMixin
 from rodbt.models import Journal, Question
 
 
 @admin.register(Journal)
-class JournalAdmin(admin.ModelAdmin):
+class JournalAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = [
         'author',
         '__str__',  # title
         # 'title',
         'date',
     ]
+    list_select_related = [
+        'author',
+    ]
     fields = [
         'author',
         'title',
         'body',
     ]
+    # Searched by the `QuestionAdmin` `journal` autocomplete:
+    search_fields = [
+        'title',
+        'author__username',
+    ]
+    autocomplete_fields = [
+        'author',
+    ]
+    # Newest first, also for the autocomplete, which pages by it:
+    ordering = [
+        '-id',
+    ]
     list_filter = [
         'date',
         'edited_date',
     ]
 
 @admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = [
         'author',
         '__str__',  # body
         'date',
     ]
+    list_select_related = [
+        'author',
+    ]
     fields = [
         'author',
         'body',
         'journal',
     ]
+    search_fields = [
+        'body',
+        'author__username',
+    ]
+    # Rather than selects listing every user and journal:
+    autocomplete_fields = [
+        'author',
+        'journal',
+    ]
     list_filter = [
         'date',
         'edited_date',
     ]
 
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        """
+        Load only what the `journal` autocomplete shows of the selected
+        `Journal`s, not their bodies.
+        """
+        if db_field.name == 'journal':
+            kwargs['queryset'] = Journal.objects.only('id', 'title')
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
+
@@ -0,0 +1,23 @@
+from django.urls import path
+
+from rodbt.api import views
+
+
+app_name = 'api'
+urlpatterns = [
+    path(
+        'journals/',
+        views.JournalListAPIView.as_view(),
+        name='journals'
+    ),
+    path(
+        'journals/lookup/',
+        views.JournalLookupAPIView.as_view(),
+        name='journal-lookup'
+    ),
+    path(
+        'questions/',
+        views.QuestionListAPIView.as_view(),
+        name='questions'
+    ),
+]
@@ -0,0 +1,155 @@
+import json
+
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+
+from rodbt.forms import journal_label
+from rodbt.models import Journal, Question
+from rodbt.pagination import InvalidCursor, KeysetPaginator
+
+
+# Number of journals in each page of `JournalLookupAPIView` results:
+LOOKUP_PAGE_SIZE = 20
+
+# Number of rows fetched from the database cursor, and written to the
+# response, at a time:
+STREAM_CHUNK_SIZE = 500
+
+
+class StreamingListAPIView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """
+    Base view which streams the current user's rows of `model` as JSON:
+
+        {"results": [{"id": 1, ...}, ...]}
+
+    The `fields` query string parameter selects a sparse fieldset, for
+    example `?fields=id,title,date`, from `allowed_fields`. The response is
+    one query selecting only those columns, read in chunks and written as
+    it is read, so memory use doesn't depend on the number of rows.
+    """
+    # Respond with 403 rather than redirecting API clients to the login page:
+    raise_exception = True
+    model = None
+    allowed_fields = ()
+    default_fields = ()
+
+    def test_func(self):
+        """
+        Test if user has `registration_accepted=True`.
+        """
+        return self.request.user.registration_accepted
+
+    def get_fields(self):
+        """
+        Get the requested fields, or `None` if any aren't allowed.
+        """
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.default_fields)
+        fields = [field.strip() for field in requested.split(',') if field.strip()]
+        if not fields or any(field not in self.allowed_fields for field in fields):
+            return None
+        # Keep the order of first appearance but drop duplicates:
+        return list(dict.fromkeys(fields))
+
+    def get_queryset(self, fields):
+        return self.model.objects.filter(
+            author=self.request.user,
+        ).order_by('-date', '-id').values(*fields)
+
+    def stream(self, rows):
+        """
+        Yield the JSON document in pieces of up to `STREAM_CHUNK_SIZE` rows.
+        """
+        yield '{"results": ['
+        separator = ''
+        chunk = []
+        for row in rows:
+            chunk.append(separator + json.dumps(row, cls=DjangoJSONEncoder))
+            separator = ','
+            if len(chunk) == STREAM_CHUNK_SIZE:
+                yield ''.join(chunk)
+                chunk = []
+        if chunk:
+            yield ''.join(chunk)
+        yield ']}'
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        if fields is None:
+            return JsonResponse(
+                {
+                    'error': 'Unknown field requested.',
+                    'allowed_fields': list(self.allowed_fields),
+                },
+                status=400,
+            )
+        rows = self.get_queryset(fields).iterator(chunk_size=STREAM_CHUNK_SIZE)
+        return StreamingHttpResponse(
+            self.stream(rows),
+            content_type='application/json',
+        )
+
+
+class JournalListAPIView(StreamingListAPIView):
+    """
+    Stream the current user's `Journal`s as JSON, newest first.
+    """
+    model = Journal
+    allowed_fields = (
+        'id', 'title', 'body', 'excerpt', 'word_count', 'date', 'edited_date',
+    )
+    default_fields = ('id', 'title', 'body', 'date', 'edited_date')
+
+
+class QuestionListAPIView(StreamingListAPIView):
+    """
+    Stream the current user's `Question`s as JSON, newest first.
+    """
+    model = Question
+    allowed_fields = ('id', 'body', 'date', 'edited_date')
+    default_fields = allowed_fields
+
+
+class JournalLookupAPIView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """
+    Find the current user's `Journal`s whose title starts with `q`, for the
+    journal picker on `QuestionForm`:
+
+        {"results": [{"id": 1, "text": "..."}, ...], "next": "<cursor>"}
+
+    Results are newest first, `LOOKUP_PAGE_SIZE` at a time. Pass `next` as
+    the `after` parameter for the following page; it is `null` on the last.
+    """
+    raise_exception = True
+
+    def test_func(self):
+        """
+        Test if user has `registration_accepted=True`.
+        """
+        return self.request.user.registration_accepted
+
+    def get_queryset(self):
+        queryset = Journal.objects.filter(
+            author=self.request.user,
+        ).only('id', 'title', 'date')
+        prefix = self.request.GET.get('q', '').strip()
+        if prefix:
+            queryset = queryset.filter(title__istartswith=prefix)
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        paginator = KeysetPaginator(self.get_queryset(), LOOKUP_PAGE_SIZE)
+        try:
+            page = paginator.page(after=request.GET.get('after'))
+        except InvalidCursor:
+            return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+        return JsonResponse({
+            'results': [
+                {'id': journal.id, 'text': journal_label(journal)}
+                for journal in page
+            ],
+            'next': page.next_cursor,
+        })
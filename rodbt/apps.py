@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class RODBTConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rodbt'
+
+    def ready(self):
+        """
+        Connect the signal receivers in `rodbt.signals`.
+        """
+        from rodbt import signals  # noqa: F401
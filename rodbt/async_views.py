@@ -0,0 +1,163 @@
+"""
+Async variants of the `rodbt` list, detail and create views, for serving
+under ASGI. See `config.settings.production_asgi`.
+
+Each view is its sync counterpart with an async `dispatch()`: the user,
+the conditional GET validators, the owned object and the page of rows are
+loaded with the async ORM, so the view itself never blocks the event loop.
+The template is rendered off the event loop by Django's async handler.
+`rodbt.urls_async` routes the same URLs and names to these views.
+"""
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.core.cache.utils import make_template_fragment_key
+
+from rodbt.cache import FragmentVersionMixin, get_fragment_cache
+from rodbt.mixins import ConditionalGetMixin
+from rodbt.views import (
+    JournalCreateView,
+    JournalDetailView,
+    JournalListView,
+    QuestionCreateView,
+    QuestionDetailView,
+    QuestionListView,
+)
+
+
+async def aget_user(request):
+    """
+    Load `request.user`, which is lazy and needs the database, without
+    blocking the event loop.
+    """
+    def load():
+        return request.user.is_authenticated
+
+    await sync_to_async(load)()
+    return request.user
+
+
+class AsyncViewMixin:
+    """
+    Async `dispatch()` for the `rodbt` views, which use
+    `LoginRequiredMixin` and `UserPassesTestMixin`.
+
+    Subclasses load whatever the view needs from the database in
+    `aprepare()`, after the user is known to be registered and before
+    `test_func()` runs.
+    """
+    view_is_async = True
+
+    async def aprepare(self):
+        pass
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await aget_user(request)
+        if not user.is_authenticated or not user.registration_accepted:
+            return self.handle_no_permission()
+        if isinstance(self, FragmentVersionMixin):
+            await self.aget_fragment_version()
+        await self.aprepare()
+        if not self.get_test_func()():
+            return self.handle_no_permission()
+
+        method = request.method.lower()
+        if method not in self.http_method_names or not hasattr(self, method):
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+        conditional = isinstance(self, ConditionalGetMixin) and method in ('get', 'head')
+        if conditional:
+            etag, timestamp, response = self.get_not_modified_response(
+                await self.aget_validators()
+            )
+            if response is not None:
+                return self.add_validator_headers(response, etag, timestamp)
+
+        response = getattr(self, method)(request, *args, **kwargs)
+        if inspect.isawaitable(response):
+            response = await response
+        if conditional:
+            response = self.add_validator_headers(response, etag, timestamp)
+        return response
+
+
+class AsyncListMixin(AsyncViewMixin):
+    """
+    Load the page of a keyset paginated, fragment cached list view.
+
+    The rows are only fetched if the page's `{% cache %}` fragment isn't
+    cached, like in the sync views where the page is only queried when
+    the template renders it.
+    """
+    fragment_name = None
+
+    def get_fragment_key(self):
+        """
+        The key of the template's
+        `{% cache ... <fragment_name> user.pk fragment_version request.GET.after request.GET.before %}`.
+        """
+        return make_template_fragment_key(self.fragment_name, [
+            self.request.user.pk,
+            self.get_fragment_version(),
+            self.request.GET.get('after', ''),
+            self.request.GET.get('before', ''),
+        ])
+
+    async def aprepare(self):
+        if self.request.method not in ('GET', 'HEAD'):
+            return
+        queryset = self.get_queryset()
+        paginator, page, object_list, is_paginated = self.paginate_queryset(
+            queryset,
+            self.get_paginate_by(queryset),
+        )
+        if not get_fragment_cache().has_key(self.get_fragment_key()):
+            await page.aload()
+
+
+class AsyncDetailMixin(AsyncViewMixin):
+    """
+    Fetch the user's object for a detail view with `OwnedObjectMixin`.
+    """
+
+    async def aprepare(self):
+        await self.aget_object()
+
+
+class AsyncCreateMixin(AsyncViewMixin):
+    """
+    Validate and save a create view's form off the event loop.
+
+    Django 4.1 has no async `Model.save()` and the form's validation may
+    query too, so both run in a worker thread.
+    """
+
+    async def post(self, request, *args, **kwargs):
+        self.object = None
+        form = self.get_form()
+        if await sync_to_async(form.is_valid)():
+            return await sync_to_async(self.form_valid)(form)
+        return self.form_invalid(form)
+
+
+class AsyncJournalListView(AsyncListMixin, JournalListView):
+    fragment_name = 'journal_list'
+
+
+class AsyncJournalDetailView(AsyncDetailMixin, JournalDetailView):
+    pass
+
+
+class AsyncJournalCreateView(AsyncCreateMixin, JournalCreateView):
+    pass
+
+
+class AsyncQuestionListView(AsyncListMixin, QuestionListView):
+    fragment_name = 'question_list'
+
+
+class AsyncQuestionDetailView(AsyncDetailMixin, QuestionDetailView):
+    pass
+
+
+class AsyncQuestionCreateView(AsyncCreateMixin, QuestionCreateView):
+    pass
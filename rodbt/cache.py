@@ -0,0 +1,114 @@
+"""
+Per-user, versioned cache for rendered `Journal` and `Question` fragments.
+
+Every user has a version token. Templates include the token in their
+`{% cache %}` keys, and `rodbt.signals` replaces it whenever one of the
+user's `Journal`s or `Question`s (or the links between them) changes, so
+all of the user's old fragments are ignored at once and age out of the
+LRU-bounded cache.
+
+The fragments are kept per process, but the tokens are kept only in the
+shared tier of the `default` cache (see `SHARED_ONLY_KEY_PREFIXES`), so a
+change made by any process, including `manage.py import_journals`,
+invalidates the fragments of every process at once. Reading the token costs
+one query per request.
+"""
+from uuid import uuid4
+
+from django.core.cache import caches
+
+
+# Alias in `CACHES` of the LRU-bounded fragment cache:
+FRAGMENT_CACHE_ALIAS = 'fragments'
+
+# Alias in `CACHES` of the cache shared by every process which holds the
+# version tokens, and the prefix of their keys:
+VERSION_CACHE_ALIAS = 'default'
+VERSION_KEY_PREFIX = 'rodbt:fragment-version:'
+
+# Seconds a rendered fragment is kept:
+FRAGMENT_TIMEOUT = 60 * 60
+
+
+def get_fragment_cache():
+    return caches[FRAGMENT_CACHE_ALIAS]
+
+
+def get_version_cache():
+    return caches[VERSION_CACHE_ALIAS]
+
+
+def version_key(user_id):
+    return f'{VERSION_KEY_PREFIX}{user_id}'
+
+
+def new_version():
+    return uuid4().hex
+
+
+def get_user_version(user_id):
+    """
+    Return the current fragment version token of a user.
+
+    A missing token (never set, or evicted) is replaced by a new random
+    one rather than a counter starting again, so fragments cached under an
+    evicted token can't be served again.
+    """
+    return get_version_cache().get_or_set(
+        version_key(user_id),
+        new_version,
+        timeout=None,
+    )
+
+
+async def aget_user_version(user_id):
+    """
+    `get_user_version()` for async code.
+    """
+    return await get_version_cache().aget_or_set(
+        version_key(user_id),
+        new_version,
+        timeout=None,
+    )
+
+
+def bump_user_version(user_id):
+    """
+    Invalidate every cached fragment of a user, in every process.
+
+    The token is deleted, which is one query where setting it is several,
+    and the next `get_user_version()` replaces it with a new one, once
+    however many changes deleted it.
+    """
+    get_version_cache().delete(version_key(user_id))
+
+
+class FragmentVersionMixin:
+    """
+    Add `fragment_version` and `fragment_timeout` to the context for use in
+    `{% cache %}` tags:
+
+        {% cache fragment_timeout name fragment_version ... using="fragments" %}
+
+    The version is read once per request.
+    """
+
+    def get_fragment_version(self):
+        if not hasattr(self, '_fragment_version'):
+            self._fragment_version = get_user_version(self.request.user.pk)
+        return self._fragment_version
+
+    async def aget_fragment_version(self):
+        """
+        Read the version with the async cache API, so later
+        `get_fragment_version()` calls don't block the event loop.
+        """
+        if not hasattr(self, '_fragment_version'):
+            self._fragment_version = await aget_user_version(self.request.user.pk)
+        return self._fragment_version
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['fragment_version'] = self.get_fragment_version()
+        context['fragment_timeout'] = FRAGMENT_TIMEOUT
+        return context
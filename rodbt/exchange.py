@@ -0,0 +1,463 @@
+"""
+Record format shared by `manage.py export_journals` and the importers.
+
+Every record has a `type`:
+
+* `journal`: `id`, `author`, `title`, `body`, `date`, `edited_date`
+* `question`: `id`, `author`, `body`, `date`, `edited_date`
+* `link`: `question_id`, `journal_id`, a `Question.journal` link
+
+`id`s are the ids in the exporting database and `author` is a username.
+Dates are ISO 8601. NDJSON files have one JSON object per line, CSV files
+have a header row of `CSV_FIELDS` and leave unused columns empty.
+"""
+import csv
+import gzip
+import io
+import json
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import CustomUser
+from rodbt import cache, search
+from rodbt.fields import keep_dates
+from rodbt.models import Journal, Question
+
+
+JOURNAL = 'journal'
+QUESTION = 'question'
+LINK = 'link'
+
+JOURNAL_FIELDS = ('id', 'author', 'title', 'body', 'date', 'edited_date')
+QUESTION_FIELDS = ('id', 'author', 'body', 'date', 'edited_date')
+LINK_FIELDS = ('question_id', 'journal_id')
+
+CSV_FIELDS = (
+    'type',
+    'id',
+    'author',
+    'title',
+    'body',
+    'date',
+    'edited_date',
+    'question_id',
+    'journal_id',
+)
+
+FORMATS = ('ndjson', 'csv')
+
+
+def make_record(record_type, fields, values):
+    """
+    Build a record dict from a `values_list()` row.
+    """
+    record = {'type': record_type}
+    for field, value in zip(fields, values):
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        record[field] = value
+    return record
+
+
+class NDJSONWriter:
+    """
+    Write records to a text stream as newline-delimited JSON.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+class CSVWriter:
+    """
+    Write records to a text stream as CSV with a `CSV_FIELDS` header.
+    """
+
+    def __init__(self, stream):
+        self.writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record)
+
+
+WRITERS = {
+    'ndjson': NDJSONWriter,
+    'csv': CSVWriter,
+}
+
+
+class InvalidRecord(ValueError):
+    """
+    Raised when an imported record can't be understood.
+    """
+
+
+def read_ndjson(stream):
+    """
+    Yield records from a text stream of newline-delimited JSON.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            raise InvalidRecord(f'Line {line_number}: {error}')
+        if not isinstance(record, dict):
+            raise InvalidRecord(f'Line {line_number}: not a JSON object')
+        yield record
+
+
+def read_csv(stream):
+    """
+    Yield records from a text stream of CSV with a header row. Empty
+    columns are read as missing values.
+    """
+    reader = csv.DictReader(stream)
+    try:
+        for row in reader:
+            yield {key: value for key, value in row.items() if value not in ('', None)}
+    except csv.Error as error:
+        raise InvalidRecord(f'Line {reader.line_num}: {error}')
+
+
+READERS = {
+    'ndjson': read_ndjson,
+    'csv': read_csv,
+}
+
+
+class ImportTooLarge(Exception):
+    """
+    Raised when more than the allowed number of bytes is read from an
+    import.
+    """
+
+
+class LimitedReader(io.RawIOBase):
+    """
+    Binary stream reading `raw` which raises `ImportTooLarge` once more
+    than `limit` bytes have been read from it.
+
+    Reading a gzip stream through it bounds the decompressed size, however
+    well the upload compresses.
+    """
+
+    def __init__(self, raw, limit):
+        super().__init__()
+        self.raw = raw
+        self.limit = limit
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        # At most one byte more than the limit, enough to know it's exceeded.
+        size = min(len(buffer), self.limit - self.bytes_read + 1)
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        if self.bytes_read > self.limit:
+            raise ImportTooLarge(f'The file is larger than {self.limit} bytes.')
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_upload(binary, gzipped, limit):
+    """
+    Return a text stream of the records in the binary stream `binary`,
+    decompressing it if it's `gzipped`. Reading it raises `ImportTooLarge`
+    past `limit` bytes of text.
+    """
+    if gzipped:
+        binary = gzip.GzipFile(fileobj=binary)
+    return io.TextIOWrapper(
+        io.BufferedReader(LimitedReader(binary, limit)),
+        encoding='utf-8',
+        newline='',
+    )
+
+
+def guess_format(filename):
+    """
+    Guess the format of a file from its name, ignoring a `.gz` suffix.
+    """
+    name = filename.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    if name.endswith('.csv'):
+        return 'csv'
+    return 'ndjson'
+
+
+@dataclass
+class ImportResult:
+    journals: int = 0
+    questions: int = 0
+    links: int = 0
+
+
+class Importer:
+    """
+    Insert records into `Journal`, `Question` and the `Question.journal`
+    through table in batches of `batch_size`.
+
+    Journals and questions are inserted with `bulk_create()`, keeping their
+    dates with `keep_dates()`, or, with `use_copy=True` on PostgreSQL, with
+    `COPY`. Links are bulk-inserted into the through table
+    once both ends have been inserted. The records' ids only identify rows
+    within the file: imported rows get new ids.
+
+    If `author` is given every row belongs to that user, otherwise the
+    records' `author` usernames must exist. Call `run()` inside a
+    transaction so a bad record doesn't leave a partial import behind.
+    """
+
+    def __init__(self, batch_size=1000, author=None, use_copy=False):
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1.')
+        if use_copy and connection.vendor != 'postgresql':
+            raise ValueError('COPY is only supported on PostgreSQL.')
+        self.batch_size = batch_size
+        self.author = author
+        self.use_copy = use_copy
+        self.author_ids = {}
+        # Maps of ids in the file to ids of the inserted rows:
+        self.journal_ids = {}
+        self.question_ids = {}
+        self.pending = {JOURNAL: [], QUESTION: [], LINK: []}
+        self.authors_changed = set()
+        self.result = ImportResult()
+
+    def run(self, records):
+        """
+        Import every record and return an `ImportResult`.
+        """
+        for record in records:
+            record_type = record.get('type')
+            if record_type == JOURNAL:
+                self.pending[JOURNAL].append(self.build_journal(record))
+            elif record_type == QUESTION:
+                self.pending[QUESTION].append(self.build_question(record))
+            elif record_type == LINK:
+                self.pending[LINK].append(self.parse_link(record))
+            else:
+                raise InvalidRecord(f'Unknown record type: {record_type!r}')
+            if len(self.pending[record_type]) >= self.batch_size:
+                self.flush(record_type)
+        self.flush(JOURNAL)
+        self.flush(QUESTION)
+        self.flush(LINK)
+        for author_id in self.authors_changed:
+            cache.bump_user_version(author_id)
+        return self.result
+
+    def get_author_id(self, record):
+        if self.author is not None:
+            return self.author.pk
+        username = record.get('author')
+        if not isinstance(username, str):
+            raise InvalidRecord(f'{record.get("type")} record needs an \'author\' username.')
+        if username not in self.author_ids:
+            try:
+                self.author_ids[username] = CustomUser.objects.values_list(
+                    'pk', flat=True,
+                ).get(username=username)
+            except CustomUser.DoesNotExist:
+                raise InvalidRecord(f'No user named {username!r}.')
+        return self.author_ids[username]
+
+    @staticmethod
+    def parse_id(record, key):
+        try:
+            return int(record[key])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidRecord(f'{record.get("type")} record needs an integer {key!r}.')
+
+    @staticmethod
+    def parse_date(record, key):
+        value = record.get(key)
+        if value is None:
+            return timezone.now()
+        try:
+            date = parse_datetime(str(value))
+        except ValueError:
+            # Well formed, but not a valid date.
+            date = None
+        if date is None:
+            raise InvalidRecord(f'Invalid {key!r}: {value!r}')
+        if timezone.is_naive(date):
+            date = timezone.make_aware(date)
+        return date
+
+    @staticmethod
+    def parse_text(record, model, field_name, default=None):
+        """
+        Return the text of `record[field_name]`, or `default` if it's
+        missing, checked against the model field's `max_length`.
+        """
+        value = record.get(field_name)
+        if value is None:
+            return default
+        if not isinstance(value, str):
+            raise InvalidRecord(
+                f'{record.get("type")} record needs text in {field_name!r}, not {value!r}.'
+            )
+        max_length = model._meta.get_field(field_name).max_length
+        if max_length is not None and len(value) > max_length:
+            raise InvalidRecord(
+                f'{model.__name__}.{field_name} is longer than {max_length} characters.'
+            )
+        return value
+
+    def build_journal(self, record):
+        journal = Journal(
+            author_id=self.get_author_id(record),
+            title=self.parse_text(record, Journal, 'title'),
+            body=self.parse_text(record, Journal, 'body', default=''),
+            date=self.parse_date(record, 'date'),
+            edited_date=self.parse_date(record, 'edited_date'),
+        )
+        # Rows are inserted without `save()`:
+        journal.update_excerpt()
+        keep_dates(journal)
+        journal._source_id = self.parse_id(record, 'id')
+        return journal
+
+    def build_question(self, record):
+        question = Question(
+            author_id=self.get_author_id(record),
+            body=self.parse_text(record, Question, 'body', default=''),
+            date=self.parse_date(record, 'date'),
+            edited_date=self.parse_date(record, 'edited_date'),
+        )
+        keep_dates(question)
+        question._source_id = self.parse_id(record, 'id')
+        return question
+
+    def parse_link(self, record):
+        return (
+            self.parse_id(record, 'question_id'),
+            self.parse_id(record, 'journal_id'),
+        )
+
+    def flush(self, record_type):
+        """
+        Insert the pending records of `record_type`.
+        """
+        pending = self.pending[record_type]
+        if not pending:
+            return
+        if record_type == LINK:
+            # Both ends of a link must have been inserted first.
+            self.flush(JOURNAL)
+            self.flush(QUESTION)
+            self.insert_links(pending)
+            self.result.links += len(pending)
+        else:
+            model = Journal if record_type == JOURNAL else Question
+            ids = self.journal_ids if record_type == JOURNAL else self.question_ids
+            self.insert_objects(model, pending)
+            for obj in pending:
+                ids[obj._source_id] = obj.pk
+                self.authors_changed.add(obj.author_id)
+            search.index_objects(pending)
+            if record_type == JOURNAL:
+                self.result.journals += len(pending)
+            else:
+                self.result.questions += len(pending)
+        self.pending[record_type] = []
+
+    def insert_objects(self, model, objs):
+        """
+        Insert `objs` with `bulk_create()`, or with `COPY` if `use_copy` is
+        set.
+        """
+        if self.use_copy:
+            self.copy_objects(model, objs)
+            return
+        model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def copy_objects(self, model, objs):
+        """
+        Insert `objs` with PostgreSQL `COPY`, after reserving their ids from
+        the table's sequence so links can refer to them.
+        """
+        table = model._meta.db_table
+        fields = [field for field in model._meta.concrete_fields]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT nextval(pg_get_serial_sequence('{table}', 'id')) "
+                'FROM generate_series(1, %s)',
+                [len(objs)],
+            )
+            for obj, (pk,) in zip(objs, cursor.fetchall()):
+                obj.pk = pk
+            buffer = io.StringIO(make_copy_data(fields, objs))
+            columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+            cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN', buffer)
+
+    def insert_links(self, links):
+        through = Question.journal.through
+        rows = []
+        for question_id, journal_id in links:
+            try:
+                rows.append(through(
+                    question_id=self.question_ids[question_id],
+                    journal_id=self.journal_ids[journal_id],
+                ))
+            except KeyError:
+                raise InvalidRecord(
+                    f'Link between question {question_id} and journal '
+                    f'{journal_id} refers to a record not in the import.'
+                )
+        through.objects.bulk_create(
+            rows,
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+
+
+def make_copy_data(fields, objs):
+    """
+    Return the `fields` of `objs` as the input of `COPY ... FROM STDIN`, a
+    line per object.
+    """
+    lines = []
+    for obj in objs:
+        values = [
+            field.get_db_prep_save(getattr(obj, field.attname), connection)
+            for field in fields
+        ]
+        lines.append('\t'.join(copy_text(value) for value in values) + '\n')
+    return ''.join(lines)
+
+
+def copy_text(value):
+    """
+    Format a value for PostgreSQL `COPY ... FROM STDIN` text format.
+    """
+    if value is None:
+        return '\\N'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def import_stream(stream, format, **importer_options):
+    """
+    Import records from a text stream in one transaction.
+    """
+    with transaction.atomic():
+        return Importer(**importer_options).run(READERS[format](stream))
@@ -0,0 +1,128 @@
+"""
+Model fields for `rodbt`.
+
+`CompressedTextField` stores long text zlib-compressed in an ordinary text
+column. Each stored value starts with a codec marker, so compressed and
+plain rows can live side by side:
+
+* `\x01z:` followed by the base64 of the zlib-compressed UTF-8 text.
+* `\x01p:` followed by plain text which itself starts with `\x01`.
+* Anything else is plain text, which includes every row written before
+  the field was compressed.
+
+Values are compressed only when they are at least `threshold` bytes and
+compressing actually makes them shorter, so short entries stay readable
+in the database.
+
+`AutoDateTimeField` is a `DateTimeField` whose `auto_now` and
+`auto_now_add` can be skipped for single instances, so imported rows keep
+their own dates.
+"""
+import base64
+import zlib
+
+from django.db import models
+
+
+MARKER = '\x01'
+COMPRESSED_PREFIX = MARKER + 'z:'
+PLAIN_PREFIX = MARKER + 'p:'
+
+# Values shorter than this many UTF-8 bytes are stored as they are:
+DEFAULT_COMPRESSION_THRESHOLD = 1024
+DEFAULT_COMPRESSION_LEVEL = 6
+
+
+def compress_text(value, threshold=DEFAULT_COMPRESSION_THRESHOLD, level=DEFAULT_COMPRESSION_LEVEL):
+    """
+    Encode `value` for storage in a `CompressedTextField` column.
+    """
+    data = value.encode()
+    if len(data) >= threshold:
+        compressed = COMPRESSED_PREFIX + base64.b64encode(
+            zlib.compress(data, level)
+        ).decode('ascii')
+        if len(compressed) < len(value):
+            return compressed
+    if value.startswith(MARKER):
+        return PLAIN_PREFIX + value
+    return value
+
+
+def decompress_text(value):
+    """
+    Decode a value stored by `compress_text()`.
+    """
+    if not value.startswith(MARKER):
+        return value
+    if value.startswith(COMPRESSED_PREFIX):
+        return zlib.decompress(
+            base64.b64decode(value[len(COMPRESSED_PREFIX):])
+        ).decode()
+    if value.startswith(PLAIN_PREFIX):
+        return value[len(PLAIN_PREFIX):]
+    # Not written by `compress_text()`, so leave it alone.
+    return value
+
+
+def is_compressed(value):
+    return value.startswith(COMPRESSED_PREFIX)
+
+
+class CompressedTextField(models.TextField):
+    """
+    `TextField` which is stored compressed once it is `threshold` bytes or
+    longer.
+
+    Python code always sees the decoded text. The database holds the
+    encoded value, so don't filter on the field in SQL: full-text search
+    goes through `rodbt.search`, which is fed the decoded text.
+    """
+
+    def __init__(self, *args, threshold=DEFAULT_COMPRESSION_THRESHOLD, level=DEFAULT_COMPRESSION_LEVEL, **kwargs):
+        self.threshold = threshold
+        self.level = level
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.threshold != DEFAULT_COMPRESSION_THRESHOLD:
+            kwargs['threshold'] = self.threshold
+        if self.level != DEFAULT_COMPRESSION_LEVEL:
+            kwargs['level'] = self.level
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return decompress_text(value)
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None:
+            return value
+        return compress_text(value, self.threshold, self.level)
+
+
+def keep_dates(obj):
+    """
+    Make the `AutoDateTimeField`s of `obj` save the values already set on
+    it instead of the current time.
+    """
+    obj._keep_dates = True
+    return obj
+
+
+class AutoDateTimeField(models.DateTimeField):
+    """
+    `DateTimeField` whose `auto_now` and `auto_now_add` leave instances
+    marked with `keep_dates()` alone.
+
+    This lets `bulk_create()` insert rows with their dates in a single
+    `INSERT`, where updating them afterwards would rewrite every row.
+    """
+
+    def pre_save(self, model_instance, add):
+        if getattr(model_instance, '_keep_dates', False):
+            return getattr(model_instance, self.attname)
+        return super().pre_save(model_instance, add)
@@ -1,21 +1,48 @@
-from django.forms import ModelForm, ModelMultipleChoiceField
+from django.forms import ChoiceField, FileField, Form, ModelForm, ModelMultipleChoiceField
 
+from rodbt import exchange
 from rodbt.models import Journal, Question
+from rodbt.widgets import JournalPickerWidget
+
+
+def journal_label(journal):
+    """
+    Label for a `Journal` in the journal picker, which works for journals
+    without a `title` too.
+    """
+    if journal.title:
+        return journal.title
+    return f'Untitled journal from {journal.date:%Y-%m-%d}'
+
+
+class JournalPickerField(ModelMultipleChoiceField):
+    """
+    `ModelMultipleChoiceField` for choosing from a user's `Journal`s with
+    `JournalPickerWidget`.
+
+    Only the journals which are selected are ever loaded: the widget
+    renders just those, and validation queries just the submitted ids.
+    """
+    widget = JournalPickerWidget
+
+    def label_from_instance(self, obj):
+        return journal_label(obj)
 
 
 class QuestionForm(ModelForm):
     """
     Form for a user to create a new `Question`.
     """
-    # journals = ModelMultipleChoiceField()
-    # Journal.objects.filter(author=self.request.user).order_by('-date')
     class Meta:
         model = Question
         fields = [
             'body',
             'journal',
         ]
-    
+        field_classes = {
+            'journal': JournalPickerField,
+        }
+
     def __init__(self, *args, **kwargs):
         """
         Add the `user`s `Journal`s to the form's `journal` field.
@@ -24,4 +51,21 @@ class QuestionForm(ModelForm):
         """
         user = kwargs.pop('user')
         super().__init__(*args, **kwargs)
-        self.fields['journal'].queryset = Journal.objects.filter(author=user).order_by('-date')
+        self.fields['journal'].queryset = Journal.objects.filter(
+            author=user,
+        ).only('id', 'title', 'date')
+
+
+class ImportForm(Form):
+    """
+    Form for a user to upload an export file to import.
+    """
+    file = FileField(
+        label='File',
+        help_text='NDJSON or CSV as written by `export_journals`, optionally gzipped.',
+    )
+    format = ChoiceField(
+        label='Format',
+        choices=[('', 'From file name')] + [(f, f.upper()) for f in exchange.FORMATS],
+        required=False,
+    )
@@ -0,0 +1,79 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rodbt.fields import (
+    DEFAULT_COMPRESSION_LEVEL,
+    compress_text,
+    decompress_text,
+    is_compressed,
+)
+from rodbt.models import Journal
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the storage saved by compressing `Journal.body` against the '
+        'cost of encoding and decoding it, for a range of size thresholds. '
+        'Works on the decoded bodies already in the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold',
+            type=int,
+            action='append',
+            dest='thresholds',
+            help='Size threshold in bytes to try. Repeat for more. Defaults to 256, 1024 and 4096.',
+        )
+        parser.add_argument(
+            '--level',
+            type=int,
+            default=DEFAULT_COMPRESSION_LEVEL,
+            help='zlib compression level.',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Only use the newest LIMIT journals.',
+        )
+
+    def handle(self, *args, **options):
+        thresholds = options['thresholds'] or [256, 1024, 4096]
+        journals = Journal.objects.order_by('-id').values_list('body', flat=True)
+        if options['limit']:
+            journals = journals[:options['limit']]
+        bodies = list(journals)
+        if not bodies:
+            raise CommandError('There are no journals to measure.')
+        plain_bytes = sum(len(body.encode()) for body in bodies)
+        self.stdout.write(
+            f'{len(bodies)} journals, {plain_bytes} bytes of text, '
+            f'zlib level {options["level"]}'
+        )
+        self.stdout.write(
+            f'{"threshold":>10} {"compressed":>10} {"stored":>12} {"saved":>7} '
+            f'{"encode µs":>10} {"decode µs":>10}'
+        )
+        for threshold in thresholds:
+            start = time.perf_counter()
+            stored = [
+                compress_text(body, threshold, options['level'])
+                for body in bodies
+            ]
+            encode_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            for value in stored:
+                decompress_text(value)
+            decode_seconds = time.perf_counter() - start
+
+            stored_bytes = sum(len(value.encode()) for value in stored)
+            saved = 1 - stored_bytes / plain_bytes if plain_bytes else 0
+            self.stdout.write(
+                f'{threshold:>10} '
+                f'{sum(map(is_compressed, stored)):>10} '
+                f'{stored_bytes:>12} '
+                f'{saved:>7.1%} '
+                f'{encode_seconds / len(bodies) * 1e6:>10.1f} '
+                f'{decode_seconds / len(bodies) * 1e6:>10.1f}'
+            )
@@ -0,0 +1,142 @@
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from accounts.models import CustomUser
+from accounts.views import RegistrationQueueView
+from rodbt.models import Question
+from rodbt.pagination import KeysetPage, KeysetPaginator
+from rodbt.views import JournalListView, QuestionListView
+
+
+# Position of the cursor of the later pages explained, in the order of
+# each view's `keyset_ordering`:
+PLACEHOLDER_CURSOR = ('2000-01-01T00:00:00+00:00', '1')
+
+
+def uses_index(plan, index_name, seek=None):
+    """
+    Return whether `plan`, from `QuerySet.explain()` on SQLite or
+    PostgreSQL, reads `index_name` and, if `seek` is given, seeks into it
+    by a range on that column rather than scanning it.
+    """
+    if index_name not in plan:
+        return False
+    if seek is None:
+        return True
+    lines = plan.splitlines()
+    for number, line in enumerate(lines):
+        if index_name not in line:
+            continue
+        # SQLite: `SEARCH t USING INDEX idx (author_id=? AND date<?)`.
+        if f'{seek}<' in line or f'{seek}>' in line:
+            return True
+        # PostgreSQL: an `Index Cond:` line below the index scan.
+        for condition in lines[number + 1:]:
+            if 'Index Cond:' in condition:
+                return f'{seek} <' in condition or f'{seek} >' in condition
+            if '->' in condition:
+                break
+    return False
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN on the queries behind the `rodbt` list views and the '
+        'registration queue and check that they use the expected indexes. '
+        'Supports SQLite and PostgreSQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Username whose list queries are explained. Defaults to a placeholder id.',
+        )
+
+    def get_plans(self, user):
+        """
+        Return `(label, queryset, expected index name, column the index
+        must be sought by or None)` for each hot query.
+        """
+        request = SimpleNamespace(user=user)
+        plans = []
+        for label, view_class, index_name in [
+            ('journal list', JournalListView, 'rodbt_journal_author_date_idx'),
+            ('question list', QuestionListView, 'rodbt_question_author_date_idx'),
+            ('registration queue', RegistrationQueueView, 'accounts_user_pending_idx'),
+        ]:
+            view = view_class()
+            view.request = request
+            queryset = view.get_queryset()
+            paginator = KeysetPaginator(
+                queryset, view.paginate_by, ordering=view.keyset_ordering,
+            )
+            plans.append((label, paginator.page().get_queryset(), index_name, None))
+            # A later page must seek to the cursor, not scan up to it.
+            after = [
+                queryset.model._meta.get_field(name).to_python(value)
+                for name, value in zip(paginator.field_names, PLACEHOLDER_CURSOR)
+            ]
+            plans.append((
+                f'{label}, later page',
+                KeysetPage(paginator, after=after).get_queryset(),
+                index_name,
+                paginator.field_names[0],
+            ))
+
+        # The query `prefetch_related('questions')` runs for a page of
+        # journals goes through the M2M table in the journal -> question
+        # direction.
+        through = Question.journal.through
+        plans.append((
+            'journal questions prefetch',
+            through.objects.filter(journal_id__in=[0, 1]).values('question_id'),
+            'rodbt_question_journal_rev_idx',
+            None,
+        ))
+        return plans
+
+    def explain(self, queryset):
+        """
+        Return the query plan of `queryset` as text.
+
+        On PostgreSQL sequential scans are disabled for the duration of the
+        EXPLAIN: on a small table a sequential scan is cheaper and would
+        hide whether the index can be used at all.
+        """
+        if connection.vendor == 'postgresql':
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+                return queryset.explain()
+        return queryset.explain()
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(
+                f'Unsupported database vendor: {connection.vendor}'
+            )
+        if options['user']:
+            user = CustomUser.objects.get(username=options['user'])
+        else:
+            user = CustomUser(id=0)
+
+        failures = []
+        for label, queryset, index_name, seek in self.get_plans(user):
+            plan = self.explain(queryset)
+            if uses_index(plan, index_name, seek):
+                self.stdout.write(self.style.SUCCESS(
+                    f'OK   {label}: uses {index_name}'
+                ))
+            else:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(
+                    f'FAIL {label}: does not use {index_name}'
+                    + (f' sought by {seek}' if seek else '')
+                    + f'\n{plan}'
+                ))
+        if failures:
+            raise CommandError(
+                'Query plans not using expected indexes: ' + ', '.join(failures)
+            )
@@ -0,0 +1,160 @@
+import gzip
+import sys
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from rodbt import exchange
+from rodbt.models import Journal, Question
+
+
+class Command(BaseCommand):
+    help = (
+        'Export `Journal`s, `Question`s and the links between them to NDJSON '
+        'or CSV. Rows are read in chunks through a server-side cursor, so '
+        'memory use does not depend on the number of rows.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Username to export. Defaults to all users.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=exchange.FORMATS,
+            default='ndjson',
+        )
+        parser.add_argument(
+            '--output',
+            default='-',
+            help='File to write to, or "-" for standard output (the default).',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Compress the output with gzip.',
+        )
+        parser.add_argument(
+            '--since',
+            help=(
+                'Only export rows with an `edited_date` on or after this ISO '
+                '8601 date or datetime, every link of those rows and the other '
+                'ends of those links.'
+            ),
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows fetched per database round trip.',
+        )
+
+    def parse_since(self, value):
+        """
+        Parse `--since` to an aware `datetime`.
+        """
+        since = parse_datetime(value)
+        if since is None:
+            date = parse_date(value)
+            if date is None:
+                raise CommandError(f'Invalid --since value: {value}')
+            since = datetime(date.year, date.month, date.day)
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def open_output(self, options):
+        """
+        Open the output as a text stream.
+        """
+        if options['output'] == '-':
+            if options['gzip']:
+                return gzip.open(sys.stdout.buffer, 'wt', encoding='utf-8')
+            return self.stdout
+        if options['gzip']:
+            return gzip.open(options['output'], 'wt', encoding='utf-8', newline='')
+        return open(options['output'], 'w', encoding='utf-8', newline='')
+
+    def export(self, writer, record_type, fields, rows, chunk_size):
+        """
+        Write every row of `rows` as a record, reporting progress to stderr
+        after every chunk.
+        """
+        count = 0
+        for values in rows.iterator(chunk_size=chunk_size):
+            writer.write(exchange.make_record(record_type, fields, values))
+            count += 1
+            if count % chunk_size == 0 and self.verbosity >= 1:
+                self.stderr.write(f'Exported {count} {record_type} records...')
+        if self.verbosity >= 1:
+            self.stderr.write(f'Exported {count} {record_type} records.')
+        return count
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        chunk_size = options['chunk_size']
+        if chunk_size < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+
+        journals = Journal.objects.all()
+        questions = Question.objects.all()
+        links = Question.journal.through.objects.all()
+        if options['user']:
+            try:
+                user = CustomUser.objects.get(username=options['user'])
+            except CustomUser.DoesNotExist:
+                raise CommandError(f'No user named {options["user"]}.')
+            journals = journals.filter(author=user)
+            questions = questions.filter(author=user)
+            links = links.filter(question__author=user)
+        if options['since']:
+            since = self.parse_since(options['since'])
+            # Linking doesn't change `edited_date` on either end, so every
+            # link of an edited row is exported, and the ends of those links
+            # with it so the file can be imported on its own.
+            links = links.filter(
+                Q(question__edited_date__gte=since) | Q(journal__edited_date__gte=since)
+            )
+            journals = journals.filter(
+                Q(edited_date__gte=since) | Q(pk__in=links.values('journal_id'))
+            )
+            questions = questions.filter(
+                Q(edited_date__gte=since) | Q(pk__in=links.values('question_id'))
+            )
+
+        output = self.open_output(options)
+        try:
+            writer = exchange.WRITERS[options['format']](output)
+            self.export(
+                writer,
+                exchange.JOURNAL,
+                exchange.JOURNAL_FIELDS,
+                journals.order_by('id').values_list(
+                    'id', 'author__username', 'title', 'body', 'date', 'edited_date',
+                ),
+                chunk_size,
+            )
+            self.export(
+                writer,
+                exchange.QUESTION,
+                exchange.QUESTION_FIELDS,
+                questions.order_by('id').values_list(
+                    'id', 'author__username', 'body', 'date', 'edited_date',
+                ),
+                chunk_size,
+            )
+            self.export(
+                writer,
+                exchange.LINK,
+                exchange.LINK_FIELDS,
+                links.order_by('id').values_list('question_id', 'journal_id'),
+                chunk_size,
+            )
+        finally:
+            if output is not self.stdout:
+                output.close()
@@ -0,0 +1,81 @@
+import gzip
+import io
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import CustomUser
+from rodbt import exchange
+
+
+class Command(BaseCommand):
+    help = (
+        'Import `Journal`s, `Question`s and their links from NDJSON or CSV, '
+        'in the format written by `export_journals`. The file is read as a '
+        'stream and rows are inserted in batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='File to import, or "-" for standard input. Files ending in ".gz" are decompressed.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=exchange.FORMATS,
+            help='Defaults to "csv" for ".csv" files and "ndjson" otherwise.',
+        )
+        parser.add_argument(
+            '--user',
+            help='Username that owns every imported row. Defaults to the records\' `author`s.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows inserted per statement.',
+        )
+        parser.add_argument(
+            '--copy',
+            action='store_true',
+            help='Insert with COPY instead of INSERT. PostgreSQL only.',
+        )
+
+    def open_input(self, path):
+        """
+        Open the input as a text stream.
+        """
+        if path == '-':
+            return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+        if path.endswith('.gz'):
+            return gzip.open(path, 'rt', encoding='utf-8', newline='')
+        return open(path, encoding='utf-8', newline='')
+
+    def handle(self, *args, **options):
+        author = None
+        if options['user']:
+            try:
+                author = CustomUser.objects.get(username=options['user'])
+            except CustomUser.DoesNotExist:
+                raise CommandError(f'No user named {options["user"]}.')
+        format = options['format'] or exchange.guess_format(options['path'])
+
+        stream = self.open_input(options['path'])
+        try:
+            result = exchange.import_stream(
+                stream,
+                format,
+                batch_size=options['batch_size'],
+                author=author,
+                use_copy=options['copy'],
+            )
+        except (exchange.InvalidRecord, ValueError) as error:
+            raise CommandError(f'Import failed, nothing was imported: {error}')
+        finally:
+            if options['path'] != '-':
+                stream.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.journals} journals, {result.questions} '
+            f'questions and {result.links} links.'
+        ))
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.5 on 2026-10-18 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rodbt', '0007_alter_journal_author'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['author', '-date', '-id'], name='rodbt_question_author_date_idx'),
+        ),
+    ]
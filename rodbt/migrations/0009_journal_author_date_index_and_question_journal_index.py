@@ -0,0 +1,29 @@
+# Generated by Django 4.1.5 on 2026-10-18 17:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rodbt', '0008_question_author_date_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journal',
+            index=models.Index(fields=['author', '-date', '-id'], name='rodbt_journal_author_date_idx'),
+        ),
+        # The auto-created `Question.journal` through table only has a
+        # `(question_id, journal_id)` unique index. Add the reverse direction
+        # so prefetching a page of journals' questions is an index-only
+        # lookup. Raw SQL because Django can't add indexes to auto-created
+        # through tables.
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX rodbt_question_journal_rev_idx '
+                'ON rodbt_question_journal (journal_id, question_id);'
+            ),
+            reverse_sql='DROP INDEX rodbt_question_journal_rev_idx;',
+        ),
+    ]
@@ -0,0 +1,128 @@
+from django.db import NotSupportedError, migrations
+
+
+# The SQL below is a copy of `rodbt.search` as it was when this migration
+# was written, so later changes to the search backends don't change it.
+
+SEARCH_TABLE = 'rodbt_search'
+
+JOURNAL = 'j'
+QUESTION = 'q'
+
+POSTGRES_SEARCH_CONFIG = 'english'
+
+# Number of rows read and indexed at a time while backfilling:
+BACKFILL_BATCH_SIZE = 1000
+
+
+def create_postgres_index(schema_editor):
+    schema_editor.execute(
+        f'CREATE TABLE {SEARCH_TABLE} ('
+        '    kind char(1) NOT NULL,'
+        '    object_id bigint NOT NULL,'
+        '    author_id bigint NOT NULL,'
+        '    document tsvector NOT NULL,'
+        '    PRIMARY KEY (kind, object_id)'
+        ')'
+    )
+    schema_editor.execute(
+        f'CREATE INDEX {SEARCH_TABLE}_document_idx '
+        f'ON {SEARCH_TABLE} USING GIN (document)'
+    )
+    schema_editor.execute(
+        f'CREATE INDEX {SEARCH_TABLE}_author_idx '
+        f'ON {SEARCH_TABLE} (author_id)'
+    )
+
+
+def index_postgres(cursor, documents):
+    cursor.executemany(
+        f'INSERT INTO {SEARCH_TABLE} (kind, object_id, author_id, document) '
+        'VALUES (%s, %s, %s, '
+        f"    setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', %s), 'A') || "
+        f"    setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', %s), 'B')"
+        ') '
+        'ON CONFLICT (kind, object_id) DO UPDATE SET '
+        '    author_id = EXCLUDED.author_id, '
+        '    document = EXCLUDED.document',
+        documents,
+    )
+
+
+def create_sqlite_index(schema_editor):
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5('
+        '    owner, title, body,'
+        "    tokenize = 'porter unicode61'"
+        ')'
+    )
+
+
+def index_sqlite(cursor, documents):
+    cursor.executemany(
+        f'INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, owner, title, body) '
+        'VALUES (%s, %s, %s, %s)',
+        [
+            (object_id * 2 + (1 if kind == QUESTION else 0), f'u{author_id}', title, body)
+            for kind, object_id, author_id, title, body in documents
+        ],
+    )
+
+
+BACKENDS = {
+    'postgresql': (create_postgres_index, index_postgres),
+    'sqlite': (create_sqlite_index, index_sqlite),
+}
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Create the vendor's search index table and index the existing
+    `Journal`s and `Question`s into it in batches.
+    """
+    connection = schema_editor.connection
+    try:
+        create_index, index = BACKENDS[connection.vendor]
+    except KeyError:
+        raise NotSupportedError(
+            f'Full-text search is not supported on {connection.vendor}.'
+        )
+    create_index(schema_editor)
+
+    Journal = apps.get_model('rodbt', 'Journal')
+    Question = apps.get_model('rodbt', 'Question')
+    for kind, model, fields in [
+        (JOURNAL, Journal, ('id', 'author_id', 'title', 'body')),
+        (QUESTION, Question, ('id', 'author_id', 'body')),
+    ]:
+        rows = model.objects.using(connection.alias).order_by('id').values_list(*fields)
+        batch = []
+        for row in rows.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+            if kind == JOURNAL:
+                object_id, author_id, title, body = row
+            else:
+                object_id, author_id, body = row
+                title = ''
+            batch.append((kind, object_id, author_id, title or '', body))
+            if len(batch) == BACKFILL_BATCH_SIZE:
+                with connection.cursor() as cursor:
+                    index(cursor, batch)
+                batch = []
+        if batch:
+            with connection.cursor() as cursor:
+                index(cursor, batch)
+
+
+def drop_search_index(apps, schema_editor):
+    schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rodbt', '0009_journal_author_date_index_and_question_journal_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.1.5 on 2026-10-18 17:22
+
+from django.db import migrations, models, transaction
+
+
+# Number of journals read and updated per transaction while backfilling:
+BACKFILL_BATCH_SIZE = 1000
+
+# `make_excerpt()` and `count_words()` are copies of those in `rodbt.models`
+# as they were when this migration was written, so later changes to them
+# don't change it.
+EXCERPT_LENGTH = 300
+
+
+def make_excerpt(body, length=EXCERPT_LENGTH):
+    text = ' '.join(body.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut + '…'
+
+
+def count_words(body):
+    return len(body.split())
+
+
+def backfill_excerpts(apps, schema_editor):
+    """
+    Set `excerpt` and `word_count` of the existing `Journal`s, a batch at a
+    time in separate transactions so the table isn't locked throughout.
+    """
+    Journal = apps.get_model('rodbt', 'Journal')
+    journals = Journal.objects.using(schema_editor.connection.alias)
+    last_id = 0
+    while True:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            batch = list(
+                journals.filter(id__gt=last_id).order_by('id').only('id', 'body')[:BACKFILL_BATCH_SIZE]
+            )
+            if not batch:
+                return
+            for journal in batch:
+                journal.excerpt = make_excerpt(journal.body)
+                journal.word_count = count_words(journal.body)
+            journals.bulk_update(batch, ['excerpt', 'word_count'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+    # Each backfill batch commits on its own.
+    atomic = False
+
+    dependencies = [
+        ('rodbt', '0010_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journal',
+            name='excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=300, verbose_name='Excerpt'),
+        ),
+        migrations.AddField(
+            model_name='journal',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Word Count'),
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
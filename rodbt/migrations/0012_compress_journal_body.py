@@ -0,0 +1,102 @@
+# Generated by Django 4.1.5 on 2026-10-18 17:24
+
+import base64
+import zlib
+
+from django.db import migrations, transaction
+
+import rodbt.fields
+
+
+# The codec below is a copy of `rodbt.fields` as it was when this migration
+# was written, with the field's default threshold and level, so later
+# changes to the field don't change the values it writes.
+
+MARKER = '\x01'
+COMPRESSED_PREFIX = MARKER + 'z:'
+PLAIN_PREFIX = MARKER + 'p:'
+
+COMPRESSION_THRESHOLD = 1024
+COMPRESSION_LEVEL = 6
+
+# Number of journals read and rewritten per transaction:
+CONVERT_BATCH_SIZE = 1000
+
+
+def compress_text(value):
+    data = value.encode()
+    if len(data) >= COMPRESSION_THRESHOLD:
+        compressed = COMPRESSED_PREFIX + base64.b64encode(
+            zlib.compress(data, COMPRESSION_LEVEL)
+        ).decode('ascii')
+        if len(compressed) < len(value):
+            return compressed
+    if value.startswith(MARKER):
+        return PLAIN_PREFIX + value
+    return value
+
+
+def decompress_text(value):
+    if not value.startswith(MARKER):
+        return value
+    if value.startswith(COMPRESSED_PREFIX):
+        return zlib.decompress(
+            base64.b64decode(value[len(COMPRESSED_PREFIX):])
+        ).decode()
+    if value.startswith(PLAIN_PREFIX):
+        return value[len(PLAIN_PREFIX):]
+    return value
+
+
+def convert_bodies(apps, schema_editor, encode):
+    """
+    Rewrite every stored `Journal.body` with `encode(decoded text)`, a batch
+    at a time in separate transactions. The column is read and written
+    with plain SQL so the stored values aren't decoded or encoded again by
+    the field.
+    """
+    connection = schema_editor.connection
+    table = connection.ops.quote_name(apps.get_model('rodbt', 'Journal')._meta.db_table)
+    last_id = 0
+    while True:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT id, body FROM {table} WHERE id > %s ORDER BY id LIMIT %s',
+                [last_id, CONVERT_BATCH_SIZE],
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            updates = []
+            for journal_id, stored in rows:
+                converted = encode(decompress_text(stored))
+                if converted != stored:
+                    updates.append([converted, journal_id])
+            cursor.executemany(f'UPDATE {table} SET body = %s WHERE id = %s', updates)
+        last_id = rows[-1][0]
+
+
+def compress_bodies(apps, schema_editor):
+    convert_bodies(apps, schema_editor, compress_text)
+
+
+def decompress_bodies(apps, schema_editor):
+    convert_bodies(apps, schema_editor, lambda text: text)
+
+
+class Migration(migrations.Migration):
+    # Each conversion batch commits on its own.
+    atomic = False
+
+    dependencies = [
+        ('rodbt', '0011_journal_excerpt'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='journal',
+            name='body',
+            field=rodbt.fields.CompressedTextField(verbose_name='Journal Body Text'),
+        ),
+        migrations.RunPython(compress_bodies, decompress_bodies),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.1.5 on 2026-10-18 18:40
+
+from django.db import migrations
+import rodbt.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rodbt', '0012_compress_journal_body'),
+    ]
+
+    # The columns don't change, only the Python field class, so the tables
+    # aren't touched. SQLite would otherwise rebuild them.
+    operations = [
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AlterField(
+                model_name='journal',
+                name='date',
+                field=rodbt.fields.AutoDateTimeField(auto_now_add=True, verbose_name='Created Date'),
+            ),
+            migrations.AlterField(
+                model_name='journal',
+                name='edited_date',
+                field=rodbt.fields.AutoDateTimeField(auto_now=True, verbose_name='Edited Date'),
+            ),
+            migrations.AlterField(
+                model_name='question',
+                name='date',
+                field=rodbt.fields.AutoDateTimeField(auto_now_add=True, verbose_name='Created Date'),
+            ),
+            migrations.AlterField(
+                model_name='question',
+                name='edited_date',
+                field=rodbt.fields.AutoDateTimeField(auto_now=True, verbose_name='Edited Date'),
+            ),
+        ]),
+    ]
@@ -0,0 +1,212 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+class OwnedObjectMixin:
+    """
+    Mixin for `SingleObjectMixin` views of objects that belong to a user.
+
+    The object is looked up with `author=request.user` in the query itself,
+    so another user's object is simply not found (404). The object is only
+    fetched once per request and reused for the permission check in
+    `test_func()` and for rendering.
+
+    List it before `UserPassesTestMixin` so this `test_func()` is used.
+    """
+    owner_field = 'author'
+
+    def get_queryset(self):
+        """
+        Limit the queryset to objects owned by the current user.
+        """
+        return super().get_queryset().filter(
+            **{self.owner_field: self.request.user}
+        )
+
+    def get_object(self, queryset=None):
+        """
+        Return the owned object, fetching it only on the first call.
+        """
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_owned_object'):
+            self._owned_object = super().get_object()
+        return self._owned_object
+
+    async def aget_object(self):
+        """
+        Fetch the owned object with the async ORM, for async views. Later
+        `get_object()` calls return it without querying.
+        """
+        if not hasattr(self, '_owned_object'):
+            try:
+                self._owned_object = await self.get_queryset().aget(
+                    pk=self.kwargs[self.pk_url_kwarg],
+                )
+            except self.model.DoesNotExist:
+                raise Http404(
+                    f'No {self.model._meta.verbose_name} found matching the query'
+                )
+        return self._owned_object
+
+    def test_func(self):
+        """
+        Test if user has `registration_accepted=True` and owns the object.
+
+        The object isn't fetched for users who aren't registered.
+        """
+        if not self.request.user.registration_accepted:
+            return False
+        return self.get_object() is not None
+
+
+class ConditionalGetMixin:
+    """
+    Mixin for views that answer conditional `GET`/`HEAD` requests
+    (`If-None-Match`, `If-Modified-Since`) with 304 Not Modified.
+
+    Subclasses override `get_validators()`; without validators the view
+    responds as usual. List it after `UserPassesTestMixin` so the
+    permission check runs first.
+
+    Validators must only depend on state every process sees, such as rows
+    and the `rodbt.cache` fragment version, never on per-process caches, or
+    a process with stale state keeps answering 304.
+    """
+    # `request.user` fields the base template renders:
+    user_state_fields = ('username', 'registration_accepted', 'is_moderator', 'is_staff')
+
+    def get_validators(self):
+        """
+        Return `(etag, last_modified)` for the current request, where
+        `last_modified` is a `datetime` or `None`. `(None, None)` skips
+        conditional `GET`.
+        """
+        return None, None
+
+    def get_user_state(self):
+        """
+        Return the parts of the ETag which come from the current user.
+        """
+        user = self.request.user
+        return [str(user.pk)] + [
+            str(getattr(user, name)) for name in self.user_state_fields
+        ]
+
+    def make_etag(self, *parts):
+        """
+        Return an ETag of the user state and `parts`.
+        """
+        return hashlib.md5(
+            ':'.join(self.get_user_state() + [str(part) for part in parts]).encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+
+    async def aget_validators(self):
+        """
+        `get_validators()` for async views. Override it where the validators
+        need a query.
+        """
+        return self.get_validators()
+
+    def get_not_modified_response(self, validators):
+        """
+        Return `(etag, timestamp, response)` for `validators`, where
+        `response` is a 304 or 412 response, or `None` if the view should
+        respond as usual.
+        """
+        etag, last_modified = validators
+        etag = quote_etag(etag) if etag else None
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=timestamp,
+        )
+        return etag, timestamp, response
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, timestamp, response = self.get_not_modified_response(
+            self.get_validators()
+        )
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        return self.add_validator_headers(response, etag, timestamp)
+
+    def add_validator_headers(self, response, etag, timestamp):
+        if (etag or timestamp) and response.status_code in (200, 304):
+            if etag and not response.has_header('ETag'):
+                response.headers['ETag'] = etag
+            if timestamp and not response.has_header('Last-Modified'):
+                response.headers['Last-Modified'] = http_date(timestamp)
+            # Pages are per user and must be revalidated on every view.
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ConditionalDetailMixin(ConditionalGetMixin):
+    """
+    Conditional responses for detail views of models with `edited_date`.
+
+    The validators come from the object itself, so with `OwnedObjectMixin`
+    the request still looks the object up only once. The user's fragment
+    version is part of the ETag too, as it also changes when linked objects
+    do, so list it with `FragmentVersionMixin`.
+    """
+
+    def get_validators(self):
+        obj = self.get_object()
+        etag = self.make_etag(
+            obj.pk,
+            obj.edited_date.isoformat(),
+            self.get_fragment_version(),
+        )
+        return etag, obj.edited_date
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """
+    Conditional responses for list views of the user's own objects.
+
+    The validators come from one aggregate query over the user's rows: the
+    latest `edited_date` and the row count, which changes on deletes. The
+    user's fragment version from `rodbt.cache` is part of the ETag too, as
+    it also changes when `Question.journal` links do, so list it with
+    `FragmentVersionMixin`.
+    """
+    owner_field = 'author'
+
+    def get_validator_queryset(self):
+        return self.model.objects.filter(
+            **{self.owner_field: self.request.user}
+        )
+
+    def get_validators(self):
+        return self.make_validators(self.get_validator_queryset().aggregate(
+            count=Count('pk'),
+            last_modified=Max('edited_date'),
+        ))
+
+    async def aget_validators(self):
+        await self.aget_fragment_version()
+        return self.make_validators(await self.get_validator_queryset().aaggregate(
+            count=Count('pk'),
+            last_modified=Max('edited_date'),
+        ))
+
+    def make_validators(self, stats):
+        last_modified = stats['last_modified']
+        etag = self.make_etag(
+            stats['count'],
+            last_modified.isoformat() if last_modified else '',
+            self.get_fragment_version(),
+            self.request.GET.urlencode(),
+        )
+        return etag, last_modified
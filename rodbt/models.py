@@ -2,6 +2,29 @@ from django.db import models
 from django.urls import reverse
 
 from config.settings.common import AUTH_USER_MODEL
+from rodbt.fields import AutoDateTimeField, CompressedTextField
+
+
+# Maximum length of `Journal.excerpt`, including the trailing ellipsis:
+EXCERPT_LENGTH = 300
+
+
+def make_excerpt(body, length=EXCERPT_LENGTH):
+    """
+    Return the start of `body` as a single line of at most `length`
+    characters, cut at a word boundary.
+    """
+    text = ' '.join(body.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut + '…'
+
+
+def count_words(body):
+    return len(body.split())
 
 
 class Journal(models.Model):
@@ -16,21 +39,63 @@ class Journal(models.Model):
         blank=True,
         null=True,
     )
-    body = models.TextField(
+    body = CompressedTextField(
         verbose_name='Journal Body Text',
     )
-    date = models.DateTimeField(
+    # Denormalized from `body` in `save()` so list pages needn't load it:
+    excerpt = models.CharField(
+        verbose_name='Excerpt',
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        default='',
+        editable=False,
+    )
+    word_count = models.PositiveIntegerField(
+        verbose_name='Word Count',
+        default=0,
+        editable=False,
+    )
+    date = AutoDateTimeField(
         'Created Date',
         auto_now_add=True,
     )
-    edited_date = models.DateTimeField(
+    edited_date = AutoDateTimeField(
         'Edited Date',
         auto_now=True,
     )
 
+    class Meta:
+        indexes = [
+            # Serves `JournalListView`: filter by `author`, newest first.
+            models.Index(
+                fields=['author', '-date', '-id'],
+                name='rodbt_journal_author_date_idx',
+            ),
+        ]
+
     def __str__(self):
         return self.title[:30]
 
+    def save(self, *args, **kwargs):
+        """
+        Update `excerpt` and `word_count` from `body` before saving.
+        """
+        self.update_excerpt()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'body' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt', 'word_count'}
+        super().save(*args, **kwargs)
+
+    def update_excerpt(self):
+        """
+        Set `excerpt` and `word_count` from `body`.
+
+        Call this for journals created without `save()`, for example with
+        `bulk_create()`.
+        """
+        self.excerpt = make_excerpt(self.body)
+        self.word_count = count_words(self.body)
+
     def get_absolute_url(self):
         return reverse('rodbt:journal-detail', args=[str(self.id)])
 
@@ -45,11 +110,11 @@ class Question(models.Model):
         verbose_name='Question Body Text',
         max_length=200,
     )
-    date = models.DateTimeField(
+    date = AutoDateTimeField(
         'Created Date',
         auto_now_add=True,
     )
-    edited_date = models.DateTimeField(
+    edited_date = AutoDateTimeField(
         'Edited Date',
         auto_now=True,
     )
@@ -61,6 +126,15 @@ class Question(models.Model):
         # null=True, # Has no effect on ManyToManyField. So not needed.
     )
 
+    class Meta:
+        indexes = [
+            # Serves `QuestionListView`: filter by `author`, newest first.
+            models.Index(
+                fields=['author', '-date', '-id'],
+                name='rodbt_question_author_date_idx',
+            ),
+        ]
+
     def __str__(self):
         return self.body[:40]
 
@@ -0,0 +1,243 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from functools import cached_property
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+class InvalidCursor(Exception):
+    """
+    Raised when a cursor token can't be decoded for the paginator's ordering.
+    """
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by "seeking" past the last row seen instead of
+    using `OFFSET`.
+
+    `ordering` is a sequence of field names which are all descending, for
+    example `('-date', '-id')`. The last field should be unique so every
+    row has a distinct position. Each page is a single query with a
+    `WHERE (date, id) < (...)` style condition and a `LIMIT`, so fetching
+    page 1000 costs the same as fetching page 1.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-date', '-id')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        for name in self.ordering:
+            if not name.startswith('-'):
+                raise ValueError(
+                    'KeysetPaginator only supports descending ordering.'
+                )
+        self.field_names = tuple(name[1:] for name in self.ordering)
+
+    def encode_cursor(self, obj):
+        """
+        Build an opaque token for the position of `obj`.
+        """
+        # `value_to_string()` keeps full precision, unlike
+        # `DjangoJSONEncoder` which truncates microseconds from datetimes.
+        opts = self.queryset.model._meta
+        values = [
+            opts.get_field(name).value_to_string(obj)
+            for name in self.field_names
+        ]
+        payload = json.dumps(values).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    def decode_cursor(self, token):
+        """
+        Turn a token built by `encode_cursor()` back into field values.
+        """
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, ValueError, UnicodeDecodeError):
+            raise InvalidCursor(token)
+        if not isinstance(values, list) or len(values) != len(self.field_names):
+            raise InvalidCursor(token)
+        model = self.queryset.model
+        try:
+            return [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.field_names, values)
+            ]
+        except (ValidationError, TypeError):
+            raise InvalidCursor(token)
+
+    def _seek(self, values, lookup):
+        """
+        Build the row-value comparison `(f1, f2, ...) <lookup> (v1, v2, ...)`
+        as a portable `OR` of `AND`s.
+
+        The `OR` alone gives the database no range on `f1`, so it would
+        only seek the index on the columns before it and then scan every
+        row up to the cursor. The redundant `f1 <lookup>= v1` bounds the
+        index range so that a deep page costs the same as the first.
+        """
+        condition = Q()
+        for index, name in enumerate(self.field_names):
+            equal = {
+                prior: value
+                for prior, value in zip(self.field_names[:index], values)
+            }
+            condition |= Q(**equal, **{f'{name}__{lookup}': values[index]})
+        return Q(**{f'{self.field_names[0]}__{lookup}e': values[0]}) & condition
+
+    def page(self, after=None, before=None):
+        """
+        Return the page of rows older than the `after` cursor, newer than
+        the `before` cursor, or the newest rows if neither is given.
+        """
+        if after:
+            return KeysetPage(self, after=self.decode_cursor(after))
+        if before:
+            return KeysetPage(self, before=self.decode_cursor(before))
+        return KeysetPage(self)
+
+
+class KeysetPage(Sequence):
+    """
+    A single page from a `KeysetPaginator`.
+
+    Rows are fetched lazily, the first time the page is iterated or asked
+    about its neighbours, so a view that never looks at the rows never runs
+    the query.
+    """
+
+    def __init__(self, paginator, after=None, before=None):
+        self.paginator = paginator
+        self.after = after
+        self.before = before
+
+    def get_queryset(self):
+        """
+        Build the query for one row more than `per_page`, which tells if
+        there is another page in the direction of travel without a
+        `COUNT(*)`.
+        """
+        paginator = self.paginator
+        queryset = paginator.queryset
+        if self.before is not None:
+            ascending = [name[1:] for name in paginator.ordering]
+            queryset = queryset.filter(
+                paginator._seek(self.before, 'gt')
+            ).order_by(*ascending)
+        else:
+            if self.after is not None:
+                queryset = queryset.filter(paginator._seek(self.after, 'lt'))
+            queryset = queryset.order_by(*paginator.ordering)
+        return queryset[:paginator.per_page + 1]
+
+    def _split(self, rows):
+        per_page = self.paginator.per_page
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if self.before is not None:
+            rows.reverse()
+        return rows, has_more
+
+    @cached_property
+    def _fetched(self):
+        return self._split(list(self.get_queryset()))
+
+    async def aload(self):
+        """
+        Fetch the rows with the async ORM, so the page can then be used
+        from async code without querying.
+        """
+        if '_fetched' not in self.__dict__:
+            rows = [row async for row in self.get_queryset()]
+            self.__dict__['_fetched'] = self._split(rows)
+
+    @property
+    def object_list(self):
+        return self._fetched[0]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self)} rows>'
+
+    def has_next(self):
+        """
+        Whether there are older rows after this page.
+        """
+        if self.before is not None:
+            return True
+        return self._fetched[1]
+
+    def has_previous(self):
+        """
+        Whether there are newer rows before this page.
+        """
+        if self.before is not None:
+            return self._fetched[1]
+        return self.after is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        """
+        Token for the page of older rows, or `None` if this is the last page.
+        """
+        if not self.has_next() or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        """
+        Token for the page of newer rows, or `None` if this is the first page.
+        """
+        if not self.has_previous() or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0])
+
+
+class KeysetPaginationMixin:
+    """
+    Replace `MultipleObjectMixin`'s page-number pagination with keyset
+    pagination.
+
+    Clients move between pages with the `after` (older) and `before`
+    (newer) query string parameters, using the tokens from the page's
+    `next_cursor` and `previous_cursor`. The page is exposed in the context
+    as `page_obj`, the same as Django's own pagination.
+    """
+    paginate_by = 25
+    keyset_ordering = ('-date', '-id')
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Return the page for the request's cursors. It is only built once
+        per request, so a page loaded ahead of time with `aload()` is reused.
+        """
+        if not hasattr(self, '_keyset_page'):
+            paginator = KeysetPaginator(
+                queryset,
+                page_size,
+                ordering=self.keyset_ordering,
+            )
+            try:
+                self._keyset_page = paginator.page(
+                    after=self.request.GET.get('after'),
+                    before=self.request.GET.get('before'),
+                )
+            except InvalidCursor:
+                raise Http404('Invalid page cursor.')
+        page = self._keyset_page
+        return (page.paginator, page, page, True)
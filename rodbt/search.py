@@ -0,0 +1,255 @@
+"""
+Full-text search over a user's `Journal`s and `Question`s.
+
+Each database vendor has its own search index table, kept in sync from
+`rodbt.signals` whenever a `Journal` or `Question` is saved or deleted:
+
+* PostgreSQL: `rodbt_search` holds a persisted, weighted `tsvector` per
+  object with a GIN index on it.
+* SQLite: `rodbt_search` is an FTS5 virtual table. The owner is stored as an
+  indexed `u<author_id>` token so the per-user filter is part of the FTS
+  match rather than a scan over every user's matches.
+
+The tables are created by migration `0010_search_index`.
+"""
+from django.db import DEFAULT_DB_ALIAS, NotSupportedError, connections
+
+from rodbt.models import Journal, Question
+
+
+SEARCH_TABLE = 'rodbt_search'
+
+JOURNAL = 'j'
+QUESTION = 'q'
+
+# Text search configuration used to build and query the `tsvector`s:
+POSTGRES_SEARCH_CONFIG = 'english'
+
+
+def get_kind(obj):
+    """
+    Return the kind of a `Journal` or `Question` in the search index.
+    """
+    if isinstance(obj, Journal):
+        return JOURNAL
+    if isinstance(obj, Question):
+        return QUESTION
+    raise TypeError(f'Cannot index {obj!r}')
+
+
+def get_document(obj):
+    """
+    Return `(kind, object_id, author_id, title, body)` for a `Journal` or
+    `Question`, the row the search backends index.
+    """
+    kind = get_kind(obj)
+    title = obj.title or '' if kind == JOURNAL else ''
+    return kind, obj.pk, obj.author_id, title, obj.body
+
+
+class PostgresSearchBackend:
+    """
+    Search index in a table of `tsvector`s with a GIN index.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def create_index(self, schema_editor):
+        schema_editor.execute(
+            f'CREATE TABLE {SEARCH_TABLE} ('
+            '    kind char(1) NOT NULL,'
+            '    object_id bigint NOT NULL,'
+            '    author_id bigint NOT NULL,'
+            '    document tsvector NOT NULL,'
+            '    PRIMARY KEY (kind, object_id)'
+            ')'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX {SEARCH_TABLE}_document_idx '
+            f'ON {SEARCH_TABLE} USING GIN (document)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX {SEARCH_TABLE}_author_idx '
+            f'ON {SEARCH_TABLE} (author_id)'
+        )
+
+    def drop_index(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+    def index(self, documents):
+        rows = list(documents)
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (kind, object_id, author_id, document) '
+                'VALUES (%s, %s, %s, '
+                f"    setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', %s), 'A') || "
+                f"    setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', %s), 'B')"
+                ') '
+                'ON CONFLICT (kind, object_id) DO UPDATE SET '
+                '    author_id = EXCLUDED.author_id, '
+                '    document = EXCLUDED.document',
+                rows,
+            )
+
+    def remove(self, kind, object_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE kind = %s AND object_id = %s',
+                [kind, object_id],
+            )
+
+    def search(self, user, query, limit, offset):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT kind, object_id, ts_rank(document, query) AS rank '
+                f'FROM {SEARCH_TABLE}, '
+                f"    websearch_to_tsquery('{POSTGRES_SEARCH_CONFIG}', %s) query "
+                'WHERE author_id = %s AND document @@ query '
+                'ORDER BY rank DESC, object_id DESC '
+                'LIMIT %s OFFSET %s',
+                [query, user.pk, limit, offset],
+            )
+            return [(kind, object_id) for kind, object_id, rank in cursor.fetchall()]
+
+
+class SQLiteSearchBackend:
+    """
+    Search index in an FTS5 virtual table.
+
+    The `rowid` is derived from the kind and primary key of the object so
+    each object has exactly one row which can be replaced or deleted.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def create_index(self, schema_editor):
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5('
+            '    owner, title, body,'
+            "    tokenize = 'porter unicode61'"
+            ')'
+        )
+
+    def drop_index(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+    @staticmethod
+    def rowid(kind, object_id):
+        return object_id * 2 + (1 if kind == QUESTION else 0)
+
+    @staticmethod
+    def match_expression(user, query):
+        """
+        Quote every word of `query` so FTS5 syntax in user input is treated
+        as plain text, and require the user's owner token.
+        """
+        terms = [
+            '"' + word.replace('"', '""') + '"'
+            for word in query.split()
+        ]
+        return f'owner:u{user.pk} AND ({" ".join(terms)})'
+
+    def index(self, documents):
+        rows = [
+            (self.rowid(kind, object_id), f'u{author_id}', title, body)
+            for kind, object_id, author_id, title, body in documents
+        ]
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, owner, title, body) '
+                'VALUES (%s, %s, %s, %s)',
+                rows,
+            )
+
+    def remove(self, kind, object_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+                [self.rowid(kind, object_id)],
+            )
+
+    def search(self, user, query, limit, offset):
+        with self.connection.cursor() as cursor:
+            # `bm25()` is lower for better matches. Title matches are
+            # weighted above body matches, the owner token not at all.
+            cursor.execute(
+                f'SELECT rowid FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s '
+                f'ORDER BY bm25({SEARCH_TABLE}, 0.0, 10.0, 1.0), rowid DESC '
+                'LIMIT %s OFFSET %s',
+                [self.match_expression(user, query), limit, offset],
+            )
+            return [
+                (QUESTION if rowid % 2 else JOURNAL, rowid // 2)
+                for (rowid,) in cursor.fetchall()
+            ]
+
+
+BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_backend(using=None):
+    """
+    Return the search backend for the database connection.
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    try:
+        return BACKENDS[connection.vendor](connection)
+    except KeyError:
+        raise NotSupportedError(
+            f'Full-text search is not supported on {connection.vendor}.'
+        )
+
+
+def index_objects(objects):
+    """
+    Add or replace `Journal`s and `Question`s in the search index.
+
+    Use this after `bulk_create()`, which doesn't send `post_save`.
+    """
+    get_backend().index(get_document(obj) for obj in objects)
+
+
+def remove_object(obj):
+    """
+    Remove a `Journal` or `Question` from the search index.
+    """
+    get_backend().remove(get_kind(obj), obj.pk)
+
+
+def search(user, query, limit, offset=0):
+    """
+    Search `user`'s `Journal`s and `Question`s for `query`.
+
+    Return `(kind, object)` pairs for the matches, best match first, where
+    `kind` is `JOURNAL` or `QUESTION`. Journals only have `id`, `title`
+    and `date` loaded, questions `id`, `body` and `date`.
+    """
+    if not query.split():
+        return []
+    matches = get_backend().search(user, query, limit, offset)
+    journal_ids = [object_id for kind, object_id in matches if kind == JOURNAL]
+    question_ids = [object_id for kind, object_id in matches if kind == QUESTION]
+    objects = {}
+    if journal_ids:
+        for journal in Journal.objects.filter(
+            author=user, id__in=journal_ids,
+        ).only('id', 'title', 'date'):
+            objects[JOURNAL, journal.id] = journal
+    if question_ids:
+        for question in Question.objects.filter(
+            author=user, id__in=question_ids,
+        ).only('id', 'body', 'date'):
+            objects[QUESTION, question.id] = question
+    return [
+        (match[0], objects[match]) for match in matches if match in objects
+    ]
@@ -0,0 +1,48 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from rodbt import cache, search
+from rodbt.models import Journal, Question
+
+
+@receiver(post_save, sender=Journal)
+@receiver(post_save, sender=Question)
+def index_for_search(sender, instance, raw=False, **kwargs):
+    """
+    Add or replace a saved `Journal` or `Question` in the search index.
+
+    Skipped for fixtures loaded with `loaddata` (`raw=True`).
+    """
+    if not raw:
+        search.index_objects([instance])
+
+
+@receiver(post_delete, sender=Journal)
+@receiver(post_delete, sender=Question)
+def remove_from_search(sender, instance, **kwargs):
+    """
+    Remove a deleted `Journal` or `Question` from the search index.
+    """
+    search.remove_object(instance)
+
+
+@receiver(post_save, sender=Journal)
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Journal)
+@receiver(post_delete, sender=Question)
+def invalidate_fragments(sender, instance, **kwargs):
+    """
+    Invalidate the author's cached fragments when a `Journal` or `Question`
+    is saved or deleted.
+    """
+    cache.bump_user_version(instance.author_id)
+
+
+@receiver(m2m_changed, sender=Question.journal.through)
+def invalidate_fragments_on_link_change(sender, instance, action, **kwargs):
+    """
+    Invalidate the author's cached fragments when `Question.journal` links
+    are added, removed or cleared, from either side of the relation.
+    """
+    if action.startswith('post_'):
+        cache.bump_user_version(instance.author_id)
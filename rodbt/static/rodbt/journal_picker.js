@@ -0,0 +1,70 @@
+// Adds a search box to every `<select data-journal-picker="<lookup url>">`.
+// Matching journals are fetched from the lookup endpoint a page at a time
+// and clicking one adds it to the select as a selected option.
+(function () {
+    'use strict';
+
+    function addOption(select, result) {
+        for (const option of select.options) {
+            if (option.value === String(result.id)) {
+                option.selected = true;
+                return;
+            }
+        }
+        select.add(new Option(result.text, result.id, true, true));
+    }
+
+    function setUp(select) {
+        const url = select.dataset.journalPicker;
+        const search = document.createElement('input');
+        search.type = 'search';
+        search.placeholder = 'Search journals';
+        const results = document.createElement('ul');
+        const more = document.createElement('button');
+        more.type = 'button';
+        more.textContent = 'More';
+        more.hidden = true;
+        select.after(search, results, more);
+
+        let next = null;
+        let timer = null;
+
+        async function load(reset) {
+            const params = new URLSearchParams({q: search.value});
+            if (!reset && next) {
+                params.set('after', next);
+            }
+            const response = await fetch(`${url}?${params}`, {
+                headers: {Accept: 'application/json'},
+            });
+            if (!response.ok) {
+                return;
+            }
+            const page = await response.json();
+            if (reset) {
+                results.replaceChildren();
+            }
+            for (const result of page.results) {
+                const item = document.createElement('li');
+                const choose = document.createElement('button');
+                choose.type = 'button';
+                choose.textContent = result.text;
+                choose.addEventListener('click', () => addOption(select, result));
+                item.append(choose);
+                results.append(item);
+            }
+            next = page.next;
+            more.hidden = !next;
+        }
+
+        search.addEventListener('input', () => {
+            clearTimeout(timer);
+            timer = setTimeout(() => load(true), 250);
+        });
+        more.addEventListener('click', () => load(false));
+    }
+
+    document.addEventListener('DOMContentLoaded', () => {
+        document.querySelectorAll('select[data-journal-picker]').forEach(setUp);
+    });
+})();
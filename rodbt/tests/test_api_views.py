@@ -0,0 +1,251 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from rodbt.api.views import LOOKUP_PAGE_SIZE
+from rodbt.models import Journal, Question
+
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
+USERNAME_REGISTRATION_ACCEPTED_FALSE = 'UnregisteredUser'
+PASSWORD_FOR_TESTING = 'a_test_password'
+
+JOURNALS_API_URL = '/rodbt/api/journals/'
+JOURNALS_API_VIEW_NAME = 'rodbt:api:journals'
+QUESTIONS_API_URL = '/rodbt/api/questions/'
+JOURNAL_LOOKUP_API_URL = '/rodbt/api/journals/lookup/'
+JOURNAL_LOOKUP_API_VIEW_NAME = 'rodbt:api:journal-lookup'
+QUESTIONS_API_VIEW_NAME = 'rodbt:api:questions'
+
+NUMBER_OF_JOURNALS = 3
+
+# Session, user and the single pruned list query:
+API_QUERY_BUDGET = 3
+
+
+class StreamingListAPIViewTest(TestCase):
+    """
+    Test the `rodbt.api` JSON list views.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create two `CustomUser`s and some `Journal`s and a `Question`.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        user_registration_accepted_true = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            registration_accepted=True,
+        )
+        user_registration_accepted_true.set_password(PASSWORD_FOR_TESTING)
+        user_registration_accepted_true.save()
+
+        user_registration_accepted_false = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_FALSE,
+        )
+        user_registration_accepted_false.set_password(PASSWORD_FOR_TESTING)
+        user_registration_accepted_false.save()
+
+        for journal_id in range(NUMBER_OF_JOURNALS):
+            Journal.objects.create(
+                author=user_registration_accepted_true,
+                title=f'Journal {journal_id} Title',
+                body=f'Journal {journal_id} body text',
+            )
+        Question.objects.create(
+            author=user_registration_accepted_true,
+            body='A Question Body',
+        )
+        Journal.objects.create(
+            author=user_registration_accepted_false,
+            title='Not yours',
+            body='Not yours',
+        )
+
+    def get_json(self, response):
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_view_returns_403_if_user_not_authenticated(self):
+        """
+        View should return `status_code` of 403, not a login redirect, for
+        non-authenticated clients.
+        """
+        response = self.client.get(JOURNALS_API_URL)
+        self.assertEqual(response.status_code, 403)
+
+    def test_view_returns_403_for_registration_accepted_false_user(self):
+        """
+        View should return `status_code` of 403 for authenticated user
+        who has `registration_accepted=False`.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_FALSE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(JOURNALS_API_URL)
+        self.assertEqual(response.status_code, 403)
+
+    def test_view_url_accessible_by_name(self):
+        """
+        Views should be accessible through `APP_NAME:api:VIEW_NAME`.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        self.assertEqual(reverse(JOURNALS_API_VIEW_NAME), JOURNALS_API_URL)
+        self.assertEqual(reverse(QUESTIONS_API_VIEW_NAME), QUESTIONS_API_URL)
+
+    def test_journals_are_streamed_newest_first(self):
+        """
+        View should stream only the user's `Journal`s, newest first, with
+        every allowed field.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(JOURNALS_API_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        results = self.get_json(response)['results']
+        self.assertEqual(len(results), NUMBER_OF_JOURNALS)
+        self.assertEqual(results[0]['title'], 'Journal 2 Title')
+        self.assertEqual(
+            set(results[0]),
+            {'id', 'title', 'body', 'date', 'edited_date'}
+        )
+
+    def test_sparse_fieldset_is_a_single_pruned_query(self):
+        """
+        `?fields=` should only return, and only select, those fields.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        with self.assertNumQueries(API_QUERY_BUDGET) as captured:
+            response = self.client.get(JOURNALS_API_URL, {'fields': 'id,title'})
+            results = self.get_json(response)['results']
+        self.assertEqual(set(results[0]), {'id', 'title'})
+        self.assertNotIn('"body"', captured.captured_queries[-1]['sql'])
+
+    def test_unknown_field_returns_400(self):
+        """
+        Requesting a field that isn't allowed should return 400.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(QUESTIONS_API_URL, {'fields': 'id,author__password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_questions_are_streamed(self):
+        """
+        View should stream the user's `Question`s.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(QUESTIONS_API_URL, {'fields': 'body'})
+        self.assertEqual(
+            self.get_json(response)['results'],
+            [{'body': 'A Question Body'}]
+        )
+
+
+class JournalLookupAPIViewTest(TestCase):
+    """
+    Test the `JournalLookupAPIView` used by the journal picker.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create a `CustomUser` with enough `Journal`s for two pages of
+        results, and another user's `Journal`.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        user = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            registration_accepted=True,
+        )
+        user.set_password(PASSWORD_FOR_TESTING)
+        user.save()
+        for number in range(LOOKUP_PAGE_SIZE + 5):
+            Journal.objects.create(
+                author=user,
+                title=f'Walk {number}',
+                body='Journal body text',
+            )
+        Journal.objects.create(author=user, title='Run', body='Body')
+        Journal.objects.create(author=user, title=None, body='Untitled')
+        other_user = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_FALSE,
+        )
+        Journal.objects.create(author=other_user, title='Walk elsewhere', body='Body')
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_view_url_accessible_by_name(self):
+        """
+        `JOURNAL_LOOKUP_API_VIEW_NAME` should reverse to `JOURNAL_LOOKUP_API_URL`.
+        """
+        self.assertEqual(reverse(JOURNAL_LOOKUP_API_VIEW_NAME), JOURNAL_LOOKUP_API_URL)
+
+    def test_view_returns_403_if_user_not_authenticated(self):
+        """
+        View should return `status_code` of 403 for non-authenticated clients.
+        """
+        self.client.logout()
+        response = self.client.get(JOURNAL_LOOKUP_API_URL)
+        self.assertEqual(response.status_code, 403)
+
+    def test_view_pages_through_prefix_matches(self):
+        """
+        View should return the user's `Journal`s matching the prefix, newest
+        first, across pages without repeats.
+        """
+        response = self.client.get(JOURNAL_LOOKUP_API_URL, {'q': 'walk'})
+        first_page = response.json()
+        self.assertEqual(len(first_page['results']), LOOKUP_PAGE_SIZE)
+        self.assertEqual(first_page['results'][0]['text'], f'Walk {LOOKUP_PAGE_SIZE + 4}')
+        response = self.client.get(
+            JOURNAL_LOOKUP_API_URL,
+            {'q': 'walk', 'after': first_page['next']},
+        )
+        second_page = response.json()
+        self.assertEqual(len(second_page['results']), 5)
+        self.assertIsNone(second_page['next'])
+        texts = [
+            result['text']
+            for result in first_page['results'] + second_page['results']
+        ]
+        self.assertEqual(len(set(texts)), LOOKUP_PAGE_SIZE + 5)
+        self.assertNotIn('Walk elsewhere', texts)
+
+    def test_view_labels_untitled_journals(self):
+        """
+        `Journal`s without a `title` should still have a label.
+        """
+        response = self.client.get(JOURNAL_LOOKUP_API_URL, {'q': ''})
+        self.assertTrue(
+            response.json()['results'][0]['text'].startswith('Untitled journal from')
+        )
+
+    def test_view_returns_400_for_invalid_cursor(self):
+        """
+        View should return `status_code` of 400 for a malformed `after`.
+        """
+        response = self.client.get(JOURNAL_LOOKUP_API_URL, {'after': 'nonsense'})
+        self.assertEqual(response.status_code, 400)
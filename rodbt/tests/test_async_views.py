@@ -0,0 +1,182 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from accounts.models import CustomUser
+from rodbt.cache import get_user_version
+from rodbt.models import Journal, Question
+
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
+USERNAME_REGISTRATION_ACCEPTED_FALSE = 'UnregisteredUser'
+PASSWORD_FOR_TESTING = 'a_test_password'
+
+LOGIN_URL = '/accounts/login/'
+JOURNALS_URL = '/rodbt/journals/'
+JOURNAL_CREATE_URL = '/rodbt/journals/create/'
+QUESTIONS_URL = '/rodbt/questions/'
+QUESTION_CREATE_URL = '/rodbt/questions/create/'
+
+NUMBER_OF_JOURNALS = 30
+JOURNALS_PER_PAGE = 25
+
+# Session, user, fragment version, conditional GET aggregate, journals and
+# prefetched questions:
+ASYNC_JOURNALS_QUERY_BUDGET = 6
+# Session, user, fragment version and the conditional GET aggregate; the
+# rows come from the fragment cache:
+ASYNC_CACHED_JOURNALS_QUERY_BUDGET = 4
+
+
+@override_settings(ROOT_URLCONF='config.urls_async')
+class AsyncViewsTest(TestCase):
+    """
+    Test the `rodbt.async_views` served by `config.urls_async`.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create two `CustomUser`s and some `Journal`s and a `Question`.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        cls.user = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            registration_accepted=True,
+        )
+        cls.user.set_password(PASSWORD_FOR_TESTING)
+        cls.user.save()
+        other_user = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_FALSE,
+        )
+        other_user.set_password(PASSWORD_FOR_TESTING)
+        other_user.save()
+
+        cls.journals = [
+            Journal.objects.create(
+                author=cls.user,
+                title=f'Journal {number}',
+                body=f'Journal {number} body',
+            )
+            for number in range(NUMBER_OF_JOURNALS)
+        ]
+        cls.question = Question.objects.create(author=cls.user, body='A Question')
+        cls.question.journal.add(cls.journals[-1])
+        cls.other_journal = Journal.objects.create(
+            author=other_user,
+            title='Not yours',
+            body='Not yours',
+        )
+        # Create the fragment version the writes above deleted, as the first
+        # request after them would.
+        get_user_version(cls.user.pk)
+
+    def setUp(self):
+        caches['fragments'].clear()
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_anonymous_user_is_redirected_to_login(self):
+        """
+        Views should redirect non-authenticated users to login.
+        """
+        self.client.logout()
+        response = self.client.get(JOURNALS_URL)
+        self.assertRedirects(response, f'{LOGIN_URL}?next={JOURNALS_URL}')
+
+    def test_unregistered_user_is_forbidden(self):
+        """
+        Views should return 403 for users with `registration_accepted=False`.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_FALSE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(JOURNALS_URL)
+        self.assertEqual(response.status_code, 403)
+
+    def test_journal_list_pages_and_uses_fragment_cache(self):
+        """
+        The list should page like the sync view, and skip the rows query
+        when the fragment is cached.
+        """
+        with self.assertNumQueries(ASYNC_JOURNALS_QUERY_BUDGET):
+            response = self.client.get(JOURNALS_URL)
+        self.assertEqual(response.status_code, 200)
+        page = response.context['page_obj']
+        self.assertEqual(len(page), JOURNALS_PER_PAGE)
+        self.assertContains(response, 'A Question')
+
+        with self.assertNumQueries(ASYNC_CACHED_JOURNALS_QUERY_BUDGET):
+            response = self.client.get(JOURNALS_URL)
+        self.assertContains(response, f'Journal {NUMBER_OF_JOURNALS - 1}')
+
+        response = self.client.get(JOURNALS_URL, {'after': page.next_cursor})
+        self.assertEqual(
+            len(response.context['page_obj']),
+            NUMBER_OF_JOURNALS - JOURNALS_PER_PAGE,
+        )
+
+    def test_list_answers_conditional_get(self):
+        """
+        The list should answer a matching `If-None-Match` with 304.
+        """
+        response = self.client.get(QUESTIONS_URL)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            QUESTIONS_URL,
+            HTTP_IF_NONE_MATCH=response.headers['ETag'],
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_journal_detail(self):
+        """
+        The detail view should show the user's own `Journal` and 404 for
+        another user's.
+        """
+        journal = self.journals[0]
+        response = self.client.get(journal.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['journal'], journal)
+        self.assertContains(response, journal.body)
+        response = self.client.get(self.other_journal.get_absolute_url())
+        self.assertEqual(response.status_code, 404)
+
+    def test_question_detail(self):
+        """
+        The detail view should show the user's own `Question`.
+        """
+        response = self.client.get(self.question.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.question.body)
+
+    def test_journal_create(self):
+        """
+        Posting the form should create a `Journal` for the user and redirect
+        to it.
+        """
+        response = self.client.post(
+            JOURNAL_CREATE_URL,
+            {'title': 'Async Journal', 'body': 'Written asynchronously'},
+        )
+        journal = Journal.objects.get(title='Async Journal')
+        self.assertEqual(journal.author, self.user)
+        self.assertRedirects(response, journal.get_absolute_url())
+
+    def test_question_create_rejects_another_users_journal(self):
+        """
+        The question form should be validated like in the sync view.
+        """
+        response = self.client.post(
+            QUESTION_CREATE_URL,
+            {'body': 'Which journal?', 'journal': [self.other_journal.id]},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].has_error('journal'))
+        response = self.client.post(
+            QUESTION_CREATE_URL,
+            {'body': 'Which journal?', 'journal': [self.journals[0].id]},
+        )
+        question = Question.objects.get(body='Which journal?')
+        self.assertRedirects(response, question.get_absolute_url())
@@ -0,0 +1,132 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from accounts.models import CustomUser
+from rodbt import search
+from rodbt.fields import (
+    COMPRESSED_PREFIX,
+    DEFAULT_COMPRESSION_THRESHOLD,
+    PLAIN_PREFIX,
+    compress_text,
+    decompress_text,
+)
+from rodbt.models import Journal
+
+
+USERNAME_FOR_TESTING = 'JournalWriter'
+
+SHORT_BODY = 'A short journal entry.'
+LONG_BODY = 'Walked along the river this morning and felt calm. ' * 100
+
+
+def get_stored_body(journal):
+    """
+    Read `journal`'s `body` column without the field decoding it.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT body FROM rodbt_journal WHERE id = %s', [journal.pk])
+        return cursor.fetchone()[0]
+
+
+class CompressTextTest(SimpleTestCase):
+    """
+    Test the `rodbt.fields` codec functions.
+    """
+
+    def test_short_text_stays_plain(self):
+        """
+        Text below the threshold should be stored as it is.
+        """
+        self.assertEqual(compress_text(SHORT_BODY), SHORT_BODY)
+
+    def test_long_text_round_trips_compressed(self):
+        """
+        Text over the threshold should be compressed and decode back.
+        """
+        stored = compress_text(LONG_BODY)
+        self.assertTrue(stored.startswith(COMPRESSED_PREFIX))
+        self.assertLess(len(stored), len(LONG_BODY))
+        self.assertEqual(decompress_text(stored), LONG_BODY)
+
+    def test_incompressible_text_stays_plain(self):
+        """
+        Text which doesn't get shorter compressed should be stored plain.
+        """
+        text = ''.join(chr(0x4e00 + (index * 7919) % 20000) for index in range(2000))
+        self.assertGreater(len(text.encode()), DEFAULT_COMPRESSION_THRESHOLD)
+        self.assertEqual(compress_text(text), text)
+
+    def test_text_starting_with_marker_is_escaped(self):
+        """
+        Plain text that looks like a codec marker should round trip.
+        """
+        text = COMPRESSED_PREFIX + 'not really compressed'
+        stored = compress_text(text)
+        self.assertTrue(stored.startswith(PLAIN_PREFIX))
+        self.assertEqual(decompress_text(stored), text)
+
+
+class CompressedTextFieldTest(TestCase):
+    """
+    Test `Journal.body` as a `CompressedTextField`.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create a `CustomUser` with a short and a long `Journal`.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        cls.user = CustomUser.objects.create(username=USERNAME_FOR_TESTING)
+        cls.short_journal = Journal.objects.create(
+            author=cls.user,
+            title='Short',
+            body=SHORT_BODY,
+        )
+        cls.long_journal = Journal.objects.create(
+            author=cls.user,
+            title='Long',
+            body=LONG_BODY,
+        )
+
+    def test_long_body_is_stored_compressed(self):
+        """
+        Only the long `body` should be compressed in the database, and both
+        should read back as plain text.
+        """
+        self.assertEqual(get_stored_body(self.short_journal), SHORT_BODY)
+        self.assertTrue(get_stored_body(self.long_journal).startswith(COMPRESSED_PREFIX))
+        self.assertEqual(Journal.objects.get(pk=self.long_journal.pk).body, LONG_BODY)
+
+    def test_uncompressed_rows_still_read(self):
+        """
+        Rows written before compression should read back unchanged.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'UPDATE rodbt_journal SET body = %s WHERE id = %s',
+                [LONG_BODY, self.long_journal.pk],
+            )
+        self.assertEqual(Journal.objects.get(pk=self.long_journal.pk).body, LONG_BODY)
+
+    def test_excerpt_and_search_use_decoded_text(self):
+        """
+        `excerpt` and the search index should be built from the decoded
+        `body`.
+        """
+        self.assertTrue(self.long_journal.excerpt.startswith('Walked along the river'))
+        results = search.search(self.user, 'river', limit=10)
+        self.assertEqual([journal for kind, journal in results], [self.long_journal])
+
+    def test_benchmark_command_reports_thresholds(self):
+        """
+        `benchmark_compression` should print a row per threshold.
+        """
+        out = StringIO()
+        call_command('benchmark_compression', '--threshold', '16', '--threshold', '4096', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertIn('2 journals', lines[0])
+        self.assertEqual(len(lines), 4)
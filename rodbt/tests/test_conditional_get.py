@@ -0,0 +1,182 @@
+from unittest import mock
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.views import View
+
+from accounts.models import CustomUser
+from config.cache import TieredCache
+from rodbt.cache import VERSION_CACHE_ALIAS, bump_user_version
+from rodbt.mixins import ConditionalGetMixin
+from rodbt.models import Journal, Question
+from rodbt.pagination import KeysetPaginator
+
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
+PASSWORD_FOR_TESTING = 'a_test_password'
+
+JOURNALS_URL = '/rodbt/journals/'
+QUESTIONS_URL = '/rodbt/questions/'
+
+# Session, user, the owned object or the list aggregate, and the fragment
+# version:
+NOT_MODIFIED_QUERY_BUDGET = 4
+
+
+class NoValidatorsView(ConditionalGetMixin, View):
+    """
+    View which doesn't override `get_validators()`.
+    """
+
+    def get(self, request):
+        return HttpResponse('A page')
+
+
+class ConditionalGetTest(TestCase):
+    """
+    Test conditional GET support of the `rodbt` list and detail views.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create a `CustomUser` with a `Journal` and a `Question`.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        cls.user = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            registration_accepted=True,
+        )
+        cls.user.set_password(PASSWORD_FOR_TESTING)
+        cls.user.save()
+        cls.journal = Journal.objects.create(
+            author=cls.user,
+            title='A Journal',
+            body='A body',
+        )
+        cls.question = Question.objects.create(
+            author=cls.user,
+            body='A Question',
+        )
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        self.urls = [
+            JOURNALS_URL,
+            QUESTIONS_URL,
+            self.journal.get_absolute_url(),
+            self.question.get_absolute_url(),
+        ]
+
+    def test_responses_have_validators(self):
+        """
+        List and detail pages should have `ETag`, `Last-Modified` and a
+        `Cache-Control` that requires revalidation.
+        """
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.has_header('ETag'))
+            self.assertTrue(response.has_header('Last-Modified'))
+            self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_unchanged_pages_return_304(self):
+        """
+        Repeating a request with `If-None-Match` should return 304 after
+        `NOT_MODIFIED_QUERY_BUDGET` queries.
+        """
+        for url in self.urls:
+            etag = self.client.get(url)['ETag']
+            with self.assertNumQueries(NOT_MODIFIED_QUERY_BUDGET):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+    def test_unchanged_detail_returns_304_for_if_modified_since(self):
+        """
+        Repeating a detail request with `If-Modified-Since` should return 304.
+        """
+        url = self.journal.get_absolute_url()
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_edited_detail_returns_200(self):
+        """
+        Editing a `Journal` should change its detail page `ETag`.
+        """
+        url = self.journal.get_absolute_url()
+        etag = self.client.get(url)['ETag']
+        self.journal.body = 'An edited body'
+        self.journal.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_changed_lists_return_200(self):
+        """
+        Deleting a `Question` and linking a `Journal` should change the list
+        `ETag`s.
+        """
+        journals_etag = self.client.get(JOURNALS_URL)['ETag']
+        self.journal.questions.add(self.question)
+        response = self.client.get(JOURNALS_URL, HTTP_IF_NONE_MATCH=journals_etag)
+        self.assertEqual(response.status_code, 200)
+
+        questions_etag = self.client.get(QUESTIONS_URL)['ETag']
+        self.question.delete()
+        response = self.client.get(QUESTIONS_URL, HTTP_IF_NONE_MATCH=questions_etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_changed_user_returns_200(self):
+        """
+        Changing what the base template shows of the user, such as their
+        `username`, should change every `ETag`.
+        """
+        etags = [self.client.get(url)['ETag'] for url in self.urls]
+        self.user.username = 'RenamedUser'
+        self.user.save()
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'RenamedUser')
+
+    def test_version_bumped_by_another_process_returns_200(self):
+        """
+        A fragment version bump in another process, such as
+        `import_journals`, should change every `ETag` in this one.
+        """
+        etags = [self.client.get(url)['ETag'] for url in self.urls]
+        other_process_cache = TieredCache('other-process', settings.CACHES[VERSION_CACHE_ALIAS])
+        with mock.patch('rodbt.cache.get_version_cache', return_value=other_process_cache):
+            bump_user_version(self.user.pk)
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_list_pages_have_different_etags(self):
+        """
+        Different cursors of the same list should have different `ETag`s.
+        """
+        cursor = KeysetPaginator(Journal.objects.all(), 25).encode_cursor(
+            self.journal
+        )
+        first = self.client.get(JOURNALS_URL)
+        other = self.client.get(JOURNALS_URL, {'after': cursor})
+        self.assertEqual(other.status_code, 200)
+        self.assertNotEqual(first['ETag'], other['ETag'])
+
+    def test_views_without_validators_respond_as_usual(self):
+        """
+        A view which doesn't override `get_validators()` should respond as
+        usual, without validator or `Cache-Control` headers.
+        """
+        request = RequestFactory().get('/', HTTP_IF_NONE_MATCH='*')
+        response = NoValidatorsView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Cache-Control'))
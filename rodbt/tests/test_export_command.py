@@ -0,0 +1,138 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from rodbt.exchange import import_stream
+from rodbt.models import Journal, Question
+
+
+USERNAME_FOR_TESTING = 'ExportUser'
+OTHER_USERNAME_FOR_TESTING = 'OtherExportUser'
+
+
+class ExportJournalsCommandTest(TestCase):
+    """
+    Test the `export_journals` management command.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create two `CustomUser`s, each with a linked `Journal` and `Question`.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        for username in [USERNAME_FOR_TESTING, OTHER_USERNAME_FOR_TESTING]:
+            user = CustomUser.objects.create(username=username)
+            journal = Journal.objects.create(
+                author=user,
+                title=f'{username} Journal',
+                body='Line one\nLine two, with a comma',
+            )
+            question = Question.objects.create(
+                author=user,
+                body=f'{username} Question',
+            )
+            question.journal.add(journal)
+
+    def export(self, *args):
+        out = StringIO()
+        call_command('export_journals', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_ndjson_export_of_all_users(self):
+        """
+        NDJSON export should have a record per `Journal`, `Question` and link.
+        """
+        records = [json.loads(line) for line in self.export().splitlines()]
+        self.assertEqual(
+            [record['type'] for record in records],
+            ['journal', 'journal', 'question', 'question', 'link', 'link']
+        )
+        journal = Journal.objects.get(title=f'{USERNAME_FOR_TESTING} Journal')
+        self.assertEqual(records[0]['id'], journal.id)
+        self.assertEqual(records[0]['author'], USERNAME_FOR_TESTING)
+        self.assertEqual(records[0]['body'], journal.body)
+        self.assertEqual(records[0]['date'], journal.date.isoformat())
+
+    def test_csv_export_of_one_user(self):
+        """
+        CSV export with `--user` should only have that user's rows.
+        """
+        rows = list(csv.DictReader(StringIO(
+            self.export('--format', 'csv', '--user', USERNAME_FOR_TESTING)
+        )))
+        self.assertEqual(
+            [row['type'] for row in rows],
+            ['journal', 'question', 'link']
+        )
+        self.assertEqual(rows[0]['body'], 'Line one\nLine two, with a comma')
+        self.assertEqual(rows[2]['journal_id'], str(rows[0]['id']))
+
+    def test_since_filters_on_edited_date(self):
+        """
+        `--since` in the future should export nothing.
+        """
+        tomorrow = (timezone.now() + timedelta(days=1)).isoformat()
+        self.assertEqual(self.export('--since', tomorrow), '')
+
+    def test_since_exports_links_of_edited_rows(self):
+        """
+        `--since` should export a link made after the cutoff between an old
+        `Question` and a new `Journal`, and the old `Question` with it, so
+        the export can be imported.
+        """
+        cutoff = timezone.now()
+        user = CustomUser.objects.get(username=USERNAME_FOR_TESTING)
+        question = Question.objects.get(author=user)
+        Question.objects.filter(pk=question.pk).update(
+            edited_date=cutoff - timedelta(days=1),
+        )
+        journal = Journal.objects.create(author=user, title='New', body='A body')
+        question.journal.add(journal)
+
+        records = [
+            json.loads(line)
+            for line in self.export('--since', cutoff.isoformat()).splitlines()
+        ]
+        self.assertEqual(
+            [(record['type'], record.get('id')) for record in records],
+            [('journal', journal.id), ('question', question.id), ('link', None)],
+        )
+        self.assertEqual(records[2]['question_id'], question.id)
+        self.assertEqual(records[2]['journal_id'], journal.id)
+
+        importer = CustomUser.objects.create(username='ImportUser')
+        result = import_stream(
+            StringIO(self.export('--since', cutoff.isoformat())),
+            'ndjson',
+            author=importer,
+        )
+        self.assertEqual((result.journals, result.questions, result.links), (1, 1, 1))
+
+    def test_gzip_output_file(self):
+        """
+        `--gzip` with `--output` should write a gzip-compressed file.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'export.ndjson.gz')
+            self.export('--gzip', '--output', path)
+            with gzip.open(path, 'rt', encoding='utf-8') as exported:
+                lines = exported.read().splitlines()
+        self.assertEqual(len(lines), 6)
+
+    def test_unknown_user_is_an_error(self):
+        """
+        `--user` with an unknown username should raise `CommandError`.
+        """
+        with self.assertRaises(CommandError):
+            self.export('--user', 'NoSuchUser')
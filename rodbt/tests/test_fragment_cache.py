@@ -0,0 +1,133 @@
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase
+
+from accounts.models import CustomUser
+from config.cache import TieredCache
+from rodbt.cache import VERSION_CACHE_ALIAS, bump_user_version, get_fragment_cache
+from rodbt.models import Journal, Question
+
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
+PASSWORD_FOR_TESTING = 'a_test_password'
+
+JOURNALS_URL = '/rodbt/journals/'
+QUESTIONS_URL = '/rodbt/questions/'
+
+# Session, user, the fragment version and the conditional GET aggregate.
+# The rows come from the fragment cache:
+CACHED_LIST_QUERY_BUDGET = 4
+
+
+class FragmentCacheTest(TestCase):
+    """
+    Test the per-user fragment cache of the `rodbt` list and detail views.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create a `CustomUser` with a `Journal` and a `Question`.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        cls.user = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            registration_accepted=True,
+        )
+        cls.user.set_password(PASSWORD_FOR_TESTING)
+        cls.user.save()
+        cls.journal = Journal.objects.create(
+            author=cls.user,
+            title='First Journal',
+            body='First body',
+        )
+        cls.question = Question.objects.create(
+            author=cls.user,
+            body='First Question',
+        )
+
+    def setUp(self):
+        get_fragment_cache().clear()
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_repeat_list_views_skip_row_queries(self):
+        """
+        A repeat view of an unchanged list should only query the session
+        and the user.
+        """
+        for url in [JOURNALS_URL, QUESTIONS_URL]:
+            first_response = self.client.get(url)
+            with self.assertNumQueries(CACHED_LIST_QUERY_BUDGET):
+                response = self.client.get(url)
+            self.assertEqual(response.content, first_response.content)
+
+    def test_saving_journal_invalidates_list(self):
+        """
+        Creating a `Journal` should show up on the next view of the list.
+        """
+        self.client.get(JOURNALS_URL)
+        Journal.objects.create(
+            author=self.user,
+            title='Second Journal',
+            body='Second body',
+        )
+        self.assertContains(self.client.get(JOURNALS_URL), 'Second Journal')
+
+    def test_linking_question_invalidates_list(self):
+        """
+        Linking a `Question` to a `Journal` should show up on the next view
+        of both lists.
+        """
+        self.client.get(JOURNALS_URL)
+        self.client.get(QUESTIONS_URL)
+        self.journal.questions.add(self.question)
+        self.assertContains(self.client.get(JOURNALS_URL), 'First Question')
+        self.assertContains(self.client.get(QUESTIONS_URL), 'First Journal')
+
+    def test_deleting_question_invalidates_list(self):
+        """
+        Deleting a `Question` should remove it from the next view of the list.
+        """
+        self.assertContains(self.client.get(QUESTIONS_URL), 'First Question')
+        self.question.delete()
+        self.assertNotContains(self.client.get(QUESTIONS_URL), 'First Question')
+
+    def test_editing_journal_invalidates_detail_body(self):
+        """
+        Editing a `Journal` should show the new body on its detail page.
+        """
+        url = self.journal.get_absolute_url()
+        self.assertContains(self.client.get(url), 'First body')
+        self.journal.body = 'Edited body'
+        self.journal.save()
+        self.assertContains(self.client.get(url), 'Edited body')
+
+    def test_version_bumped_by_another_process_invalidates_list(self):
+        """
+        A change made by another process, such as `import_journals`, should
+        show up on the next view of the list in this one.
+        """
+        self.client.get(JOURNALS_URL)
+        Journal.objects.bulk_create([
+            Journal(author=self.user, title='Imported Journal', body='Imported body'),
+        ])
+        other_process_cache = TieredCache('other-process', settings.CACHES[VERSION_CACHE_ALIAS])
+        with mock.patch('rodbt.cache.get_version_cache', return_value=other_process_cache):
+            bump_user_version(self.user.pk)
+        self.assertContains(self.client.get(JOURNALS_URL), 'Imported Journal')
+
+    def test_fragments_are_not_shared_between_users(self):
+        """
+        Another user should not be served the first user's cached rows.
+        """
+        self.client.get(JOURNALS_URL)
+        other_user = CustomUser.objects.create(
+            username='OtherRegisteredUser',
+            registration_accepted=True,
+        )
+        self.client.force_login(other_user)
+        self.assertNotContains(self.client.get(JOURNALS_URL), 'First Journal')
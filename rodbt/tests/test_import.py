@@ -0,0 +1,315 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from io import StringIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import CustomUser
+from rodbt import search
+from rodbt.exchange import ImportTooLarge, Importer, LimitedReader, make_copy_data
+from rodbt.models import Journal, Question
+from rodbt.views import ImportView
+
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
+USERNAME_SOURCE_USER = 'SourceUser'
+PASSWORD_FOR_TESTING = 'a_test_password'
+
+IMPORT_URL = '/rodbt/import/'
+IMPORT_TEMPLATE = 'rodbt/import_form.html'
+
+RECORDS = [
+    {
+        'type': 'journal', 'id': 10, 'author': USERNAME_SOURCE_USER,
+        'title': 'Imported Journal', 'body': 'Imported body',
+        'date': '2020-01-02T03:04:05.123456+00:00',
+        'edited_date': '2020-01-03T03:04:05+00:00',
+    },
+    {
+        'type': 'journal', 'id': 11, 'author': USERNAME_SOURCE_USER,
+        'title': 'Second Imported Journal', 'body': 'Second body',
+        'date': '2020-02-02T03:04:05+00:00',
+        'edited_date': '2020-02-02T03:04:05+00:00',
+    },
+    {
+        'type': 'question', 'id': 20, 'author': USERNAME_SOURCE_USER,
+        'body': 'Imported Question',
+        'date': '2020-01-04T03:04:05+00:00',
+        'edited_date': '2020-01-04T03:04:05+00:00',
+    },
+    {'type': 'link', 'question_id': 20, 'journal_id': 10},
+    {'type': 'link', 'question_id': 20, 'journal_id': 11},
+]
+
+
+def as_ndjson(records):
+    return ''.join(json.dumps(record) + '\n' for record in records)
+
+
+class ImportJournalsCommandTest(TestCase):
+    """
+    Test the `import_journals` management command.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create the `CustomUser` named by the records' `author`.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        cls.user = CustomUser.objects.create(username=USERNAME_SOURCE_USER)
+
+    def import_file(self, content, *args, suffix='.ndjson'):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f'import{suffix}')
+            with open(path, 'w', encoding='utf-8') as import_file:
+                import_file.write(content)
+            out = StringIO()
+            call_command('import_journals', path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_import_creates_rows_links_and_dates(self):
+        """
+        Import should create the `Journal`s, `Question`s and links with the
+        records' dates.
+        """
+        output = self.import_file(as_ndjson(RECORDS), '--batch-size', '1')
+        self.assertIn('Imported 2 journals, 1 questions and 2 links.', output)
+        journal = Journal.objects.get(title='Imported Journal')
+        self.assertEqual(journal.author, self.user)
+        self.assertEqual(journal.date.isoformat(), '2020-01-02T03:04:05.123456+00:00')
+        question = Question.objects.get(body='Imported Question')
+        self.assertEqual(
+            set(question.journal.values_list('title', flat=True)),
+            {'Imported Journal', 'Second Imported Journal'}
+        )
+
+    def test_dates_are_inserted_without_updates(self):
+        """
+        The records' dates should be written by the `INSERT`s, with no
+        `UPDATE` of the imported rows afterwards.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.import_file(as_ndjson(RECORDS))
+        self.assertFalse([
+            query['sql'] for query in queries
+            if query['sql'].startswith('UPDATE')
+        ])
+        question = Question.objects.get(body='Imported Question')
+        self.assertEqual(question.date.isoformat(), '2020-01-04T03:04:05+00:00')
+        self.assertEqual(question.edited_date.isoformat(), '2020-01-04T03:04:05+00:00')
+
+    def test_rows_saved_normally_still_get_automatic_dates(self):
+        """
+        Only imported rows should keep their dates: other rows should get
+        the current time.
+        """
+        self.import_file(as_ndjson(RECORDS))
+        journal = Journal.objects.get(title='Imported Journal')
+        journal.title = 'Edited Journal'
+        journal.save()
+        journal.refresh_from_db()
+        self.assertEqual(journal.date.isoformat(), '2020-01-02T03:04:05.123456+00:00')
+        self.assertGreater(journal.edited_date.year, 2020)
+        created = Journal.objects.create(author=self.user, title='New', body='New body')
+        self.assertGreater(created.date.year, 2020)
+
+    def test_imported_rows_are_searchable(self):
+        """
+        Imported rows should be added to the search index.
+        """
+        self.import_file(as_ndjson(RECORDS))
+        results = search.search(self.user, 'imported', limit=10)
+        self.assertEqual(len(results), 3)
+
+    def test_export_then_import_round_trip(self):
+        """
+        An `export_journals` CSV file should import as a copy for another user.
+        """
+        self.import_file(as_ndjson(RECORDS))
+        exported = StringIO()
+        call_command(
+            'export_journals', '--format', 'csv', stdout=exported, stderr=StringIO()
+        )
+        CustomUser.objects.create(username='CopyUser')
+        self.import_file(exported.getvalue(), '--user', 'CopyUser', suffix='.csv')
+        copy = Question.objects.get(author__username='CopyUser')
+        self.assertEqual(copy.journal.count(), 2)
+        self.assertEqual(Journal.objects.filter(author__username='CopyUser').count(), 2)
+
+    def test_invalid_record_imports_nothing(self):
+        """
+        A bad record should fail the import and roll back every row.
+        """
+        records = RECORDS + [{'type': 'link', 'question_id': 20, 'journal_id': 99}]
+        with self.assertRaises(CommandError):
+            self.import_file(as_ndjson(records))
+        self.assertFalse(Journal.objects.exists())
+        self.assertFalse(Question.objects.exists())
+
+    def test_unknown_author_is_an_error(self):
+        """
+        A record whose `author` doesn't exist should fail the import.
+        """
+        records = [dict(RECORDS[0], author='NoSuchUser')]
+        with self.assertRaises(CommandError):
+            self.import_file(as_ndjson(records))
+
+    def test_copy_data_escapes_text(self):
+        """
+        `COPY` input should have a tab-separated line per object, with tabs,
+        newlines and backslashes escaped and `NULL`s as `\\N`.
+        """
+        journal = Journal(id=1, author_id=self.user.pk, title=None, body='A\tb\\c\nd', word_count=3)
+        fields = [Journal._meta.get_field(name) for name in ('id', 'title', 'body', 'word_count')]
+        self.assertEqual(
+            make_copy_data(fields, [journal]),
+            '1\t\\N\tA\\tb\\\\c\\nd\t3\n',
+        )
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'COPY is PostgreSQL only.')
+    def test_copy_import_creates_rows_links_and_dates(self):
+        """
+        Import with `--copy` should create the same rows as without it.
+        """
+        self.import_file(as_ndjson(RECORDS), '--copy')
+        journal = Journal.objects.get(title='Imported Journal')
+        self.assertEqual(journal.date.isoformat(), '2020-01-02T03:04:05.123456+00:00')
+        self.assertEqual(Question.objects.get().journal.count(), 2)
+
+    def test_copy_is_postgresql_only(self):
+        """
+        `use_copy=True` should be refused on other databases.
+        """
+        if connection.vendor == 'postgresql':
+            self.skipTest('COPY is supported.')
+        with self.assertRaises(ValueError):
+            Importer(use_copy=True)
+
+
+class ImportViewTest(TestCase):
+    """
+    Test the `ImportView`.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create a `CustomUser` with `registration_accepted=True`.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        cls.user = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            registration_accepted=True,
+        )
+        cls.user.set_password(PASSWORD_FOR_TESTING)
+        cls.user.save()
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_view_uses_correct_template(self):
+        """
+        View should use `IMPORT_TEMPLATE`.
+        """
+        response = self.client.get(IMPORT_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, IMPORT_TEMPLATE)
+
+    def test_upload_imports_rows_as_current_user(self):
+        """
+        Uploaded rows should belong to the current user, whatever their
+        `author` in the file.
+        """
+        upload = SimpleUploadedFile(
+            'export.ndjson', as_ndjson(RECORDS).encode()
+        )
+        response = self.client.post(IMPORT_URL, {'file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['result'].journals, 2)
+        self.assertEqual(Journal.objects.filter(author=self.user).count(), 2)
+        self.assertEqual(Question.objects.get().journal.count(), 2)
+
+    def test_invalid_upload_shows_form_error(self):
+        """
+        An upload that isn't valid NDJSON should show an error and import
+        nothing.
+        """
+        upload = SimpleUploadedFile('export.ndjson', b'{"type": "journal"\n')
+        response = self.client.post(IMPORT_URL, {'file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors)
+        self.assertFalse(Journal.objects.exists())
+
+    def test_malformed_uploads_show_form_error(self):
+        """
+        Records with values of the wrong type and CSV that can't be parsed
+        should show an error and import nothing.
+        """
+        for name, content in [
+            ('title.ndjson', as_ndjson([dict(RECORDS[0], title=123)])),
+            ('body.ndjson', as_ndjson([dict(RECORDS[0], body=['a', 'list'])])),
+            ('question.ndjson', as_ndjson([dict(RECORDS[2], body={'an': 'object'})])),
+            ('date.ndjson', as_ndjson([dict(RECORDS[0], date='2020-13-45T00:00:00')])),
+            ('field.csv', 'type,id,body\njournal,1,' + 'x' * 200000 + '\n'),
+        ]:
+            with self.subTest(name=name):
+                upload = SimpleUploadedFile(name, content.encode())
+                response = self.client.post(IMPORT_URL, {'file': upload})
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.context['form'].errors['file'])
+        self.assertFalse(Journal.objects.exists())
+        self.assertFalse(Question.objects.exists())
+
+    def test_upload_over_size_limit_is_refused(self):
+        """
+        An upload bigger than `max_upload_size` should be refused, pointing
+        to `import_journals`, without importing anything.
+        """
+        content = as_ndjson(RECORDS).encode()
+        upload = SimpleUploadedFile('export.ndjson', content)
+        with mock.patch.object(ImportView, 'max_upload_size', len(content) - 1):
+            response = self.client.post(IMPORT_URL, {'file': upload})
+        self.assertEqual(response.status_code, 200)
+        [error] = response.context['form'].errors['file']
+        self.assertIn('import_journals', error)
+        self.assertFalse(Journal.objects.exists())
+
+    def test_decompressed_size_is_limited(self):
+        """
+        A gzipped upload which decompresses to more than `max_text_size`
+        should stop being read at the limit and import nothing.
+        """
+        records = RECORDS * 1000
+        content = as_ndjson(records).encode()
+        upload = SimpleUploadedFile('export.ndjson.gz', gzip.compress(content))
+        self.assertLess(upload.size, ImportView.max_upload_size)
+        with mock.patch.object(ImportView, 'max_text_size', len(content) // 2):
+            response = self.client.post(IMPORT_URL, {'file': upload})
+        [error] = response.context['form'].errors['file']
+        self.assertIn(f'larger than {len(content) // 2} bytes', error)
+        self.assertFalse(Journal.objects.exists())
+
+    def test_limited_reader_stops_at_limit(self):
+        """
+        `LimitedReader` should read up to `limit` bytes and raise past it.
+        """
+        reader = LimitedReader(io.BytesIO(b'0123456789'), limit=10)
+        self.assertEqual(reader.read(), b'0123456789')
+        reader = LimitedReader(io.BytesIO(b'0123456789'), limit=9)
+        self.assertEqual(reader.read(5), b'01234')
+        with self.assertRaises(ImportTooLarge):
+            reader.read()
@@ -1,6 +1,6 @@
 from django.test import TestCase
 
-from rodbt.models import Journal
+from rodbt.models import EXCERPT_LENGTH, Journal
 from accounts.models import CustomUser
 
 
@@ -128,3 +128,33 @@ class JournalModelTest(TestCase):
         """
         author = Journal.objects.get(id=1)
         self.assertEqual(author.get_absolute_url(), '/rodbt/journals/1/')
+
+    def test_excerpt_and_word_count_set_on_save(self):
+        """
+        `excerpt` and `word_count` should be set from `body` on save.
+        """
+        journal = Journal.objects.get(id=1)
+        self.assertTrue(journal.excerpt.startswith("This is a Journal Body, here. It's"))
+        self.assertNotIn('\n', journal.excerpt)
+        self.assertEqual(journal.word_count, len(A_TEST_JOURNAL_BODY.split()))
+
+    def test_excerpt_updated_with_update_fields(self):
+        """
+        Saving `body` with `update_fields` should update `excerpt` too.
+        """
+        journal = Journal.objects.get(id=1)
+        journal.body = 'A new body'
+        journal.save(update_fields=['body'])
+        journal.refresh_from_db()
+        self.assertEqual(journal.excerpt, 'A new body')
+        self.assertEqual(journal.word_count, 3)
+
+    def test_excerpt_truncated_at_word_boundary(self):
+        """
+        A long `body` should be cut at a word boundary to fit `EXCERPT_LENGTH`.
+        """
+        journal = Journal.objects.get(id=1)
+        journal.body = 'word ' * EXCERPT_LENGTH
+        journal.save()
+        self.assertLessEqual(len(journal.excerpt), EXCERPT_LENGTH)
+        self.assertTrue(journal.excerpt.endswith('word…'))
@@ -1,17 +1,27 @@
+from django.core.cache import caches
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from accounts.models import CustomUser
-from rodbt.models import Journal
+from rodbt.cache import get_user_version
+from rodbt.models import Journal, Question
 
 
 USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
 USERNAME_REGISTRATION_ACCEPTED_FALSE = 'UnregisteredUser'
+USERNAME_OTHER_REGISTERED_USER = 'OtherRegisteredUser'
 PASSWORD_FOR_TESTING = 'a_test_password'
 
 LOGIN_URL = '/accounts/login/'
 
 NUMBER_OF_JOURNALS = 11
+NUMBER_OF_JOURNALS_PAGINATED = 30
+JOURNALS_PER_PAGE = 25
+# Session, user, conditional GET aggregate, fragment version, journals and
+# prefetched questions:
+JOURNALS_QUERY_BUDGET = 6
 
 JOURNAL_CREATE_URL = '/rodbt/journals/create/'
 JOURNAL_CREATE_VIEW_NAME = 'rodbt:journal-create'
@@ -34,6 +44,9 @@ when creating a `Journal`.
 """
 )
 
+# Session, user, the owned `Journal` and the fragment version:
+JOURNAL_DETAIL_QUERY_BUDGET = 4
+
 PAGE_TITLE_JOURNAL_DETAIL = 'Journal Detail'
 
 
@@ -393,6 +406,40 @@ class JournalDetailViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIsInstance(response.context['journal'], Journal)
 
+    def test_view_returns_404_for_another_users_journal(self):
+        """
+        View should return `status_code` of 404 for a registered user who
+        doesn't own the `Journal`.
+        """
+        other_user = CustomUser.objects.create(
+            username=USERNAME_OTHER_REGISTERED_USER,
+            registration_accepted=True,
+        )
+        other_user.set_password(PASSWORD_FOR_TESTING)
+        other_user.save()
+        self.client.login(
+            username=USERNAME_OTHER_REGISTERED_USER,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(JOURNAL_DETAIL_URL)
+        self.assertEqual(response.status_code, 404)
+
+    def test_view_fetches_journal_once(self):
+        """
+        View should look up the `Journal` once for both the ownership check
+        and rendering: `JOURNAL_DETAIL_QUERY_BUDGET` queries in total.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        # The writes above deleted the fragment version; it is replaced
+        # once, on the first request after them.
+        get_user_version(CustomUser.objects.get(username=USERNAME_REGISTRATION_ACCEPTED_TRUE).pk)
+        with self.assertNumQueries(JOURNAL_DETAIL_QUERY_BUDGET):
+            response = self.client.get(JOURNAL_DETAIL_URL)
+        self.assertEqual(response.status_code, 200)
+
 
 class JournalListViewTest(TestCase):
     """
@@ -491,9 +538,6 @@ class JournalListViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, JOURNALS_TEMPLATE)
 
-    # TODO: Test, pagination, that the view returns the correct number
-    # of `Journal`s.
-
     def test_view_default_context_object_names(self):
         """
         View should have the correct default context object names.
@@ -539,3 +583,153 @@ class JournalListViewTest(TestCase):
             len(response.context['journal_list']),
             NUMBER_OF_JOURNALS
         )
+
+    def test_view_query_count_does_not_grow_with_journals(self):
+        """
+        View should render `author` and `questions` of every `Journal` in
+        `JOURNALS_QUERY_BUDGET` queries, however many `Journal`s and linked
+        `Question`s there are.
+        """
+        user = CustomUser.objects.get(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE
+        )
+        for journal in Journal.objects.filter(author=user):
+            question = Question.objects.create(
+                body=f'Question for {journal.title}',
+                author=user,
+            )
+            question.journal.add(journal)
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        # The writes above deleted the fragment version; it is replaced
+        # once, on the first request after them.
+        get_user_version(user.pk)
+        with self.assertNumQueries(JOURNALS_QUERY_BUDGET):
+            response = self.client.get(JOURNALS_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Question for Journal 0 Title')
+
+    def test_view_renders_excerpt_without_loading_body(self):
+        """
+        View should show each `Journal`'s `excerpt` and leave `body`
+        deferred.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(JOURNALS_URL)
+        journal = response.context['journal_list'][0]
+        self.assertIn('body', journal.get_deferred_fields())
+        self.assertContains(response, journal.excerpt)
+
+
+class JournalListViewPaginationTest(TestCase):
+    """
+    Tests the keyset pagination of `JournalListView`.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create a `CustomUser` with more `Journal`s than fit on one page.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        user_registration_accepted_true = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+        )
+        user_registration_accepted_true.set_password(PASSWORD_FOR_TESTING)
+        user_registration_accepted_true.registration_accepted = True
+        user_registration_accepted_true.save()
+
+        for journal_id in range(NUMBER_OF_JOURNALS_PAGINATED):
+            Journal.objects.create(
+                author=user_registration_accepted_true,
+                title=f'Journal {journal_id} Title',
+                body=f'Journal {journal_id} body text',
+            )
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_first_page_is_newest_journals(self):
+        """
+        First page should have `JOURNALS_PER_PAGE` journals, newest first.
+        """
+        response = self.client.get(JOURNALS_URL)
+        self.assertEqual(response.status_code, 200)
+        journal_list = list(response.context['journal_list'])
+        self.assertEqual(len(journal_list), JOURNALS_PER_PAGE)
+        expected = list(
+            Journal.objects.order_by('-date', '-id')[:JOURNALS_PER_PAGE]
+        )
+        self.assertEqual(journal_list, expected)
+        self.assertFalse(response.context['page_obj'].has_previous())
+        self.assertTrue(response.context['page_obj'].has_next())
+
+    def test_older_page_continues_after_first_page(self):
+        """
+        Following `next_cursor` should return the remaining journals with
+        no overlap.
+        """
+        response = self.client.get(JOURNALS_URL)
+        first_page = list(response.context['journal_list'])
+        next_cursor = response.context['page_obj'].next_cursor
+
+        response = self.client.get(JOURNALS_URL, {'after': next_cursor})
+        self.assertEqual(response.status_code, 200)
+        second_page = list(response.context['journal_list'])
+        self.assertEqual(
+            len(second_page),
+            NUMBER_OF_JOURNALS_PAGINATED - JOURNALS_PER_PAGE
+        )
+        self.assertFalse(set(first_page) & set(second_page))
+        self.assertFalse(response.context['page_obj'].has_next())
+        self.assertTrue(response.context['page_obj'].has_previous())
+
+    def test_newer_page_returns_to_first_page(self):
+        """
+        Following `previous_cursor` from the second page should return the
+        first page.
+        """
+        response = self.client.get(JOURNALS_URL)
+        first_page = list(response.context['journal_list'])
+        next_cursor = response.context['page_obj'].next_cursor
+
+        response = self.client.get(JOURNALS_URL, {'after': next_cursor})
+        previous_cursor = response.context['page_obj'].previous_cursor
+
+        response = self.client.get(JOURNALS_URL, {'before': previous_cursor})
+        self.assertEqual(list(response.context['journal_list']), first_page)
+        self.assertFalse(response.context['page_obj'].has_previous())
+
+    def test_older_page_query_bounds_leading_column(self):
+        """
+        The query for a page after a cursor should bound `date` on its own,
+        besides the `(date, id)` comparison, so the index is sought by
+        `author_id` and `date` instead of scanned to the cursor.
+        """
+        # Rendered rather than served from the cache, so the page is queried:
+        caches['fragments'].clear()
+        response = self.client.get(JOURNALS_URL)
+        next_cursor = response.context['page_obj'].next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(JOURNALS_URL, {'after': next_cursor})
+        [sql] = [
+            query['sql'] for query in queries
+            if f'LIMIT {JOURNALS_PER_PAGE + 1}' in query['sql']
+        ]
+        self.assertIn('"rodbt_journal"."date" <= ', sql)
+        self.assertIn('"rodbt_journal"."date" < ', sql)
+
+    def test_invalid_cursor_returns_404(self):
+        """
+        A cursor that can't be decoded should return `status_code` of 404.
+        """
+        response = self.client.get(JOURNALS_URL, {'after': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
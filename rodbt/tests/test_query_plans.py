@@ -0,0 +1,39 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class CheckQueryPlansCommandTest(TestCase):
+    """
+    Test the `check_query_plans` management command.
+    """
+
+    def test_list_view_queries_use_indexes(self):
+        """
+        The `rodbt` list view and registration queue queries should use
+        their indexes.
+
+        `call_command` raises `CommandError` if any plan doesn't.
+        """
+        out = StringIO()
+        call_command('check_query_plans', stdout=out)
+        self.assertIn('rodbt_journal_author_date_idx', out.getvalue())
+        self.assertIn('rodbt_question_author_date_idx', out.getvalue())
+        self.assertIn('rodbt_question_journal_rev_idx', out.getvalue())
+        self.assertIn('accounts_user_pending_idx', out.getvalue())
+        self.assertNotIn('FAIL', out.getvalue())
+
+    def test_later_pages_seek_into_their_indexes(self):
+        """
+        The queries of pages after a cursor should seek their index by the
+        leading sort column rather than scan it up to the cursor.
+        """
+        out = StringIO()
+        call_command('check_query_plans', stdout=out)
+        for label, index_name in [
+            ('journal list', 'rodbt_journal_author_date_idx'),
+            ('question list', 'rodbt_question_author_date_idx'),
+            ('registration queue', 'accounts_user_pending_idx'),
+        ]:
+            self.assertIn(f'OK   {label}, later page: uses {index_name}', out.getvalue())
@@ -2,16 +2,22 @@ from django.test import TestCase
 from django.urls import reverse
 
 from accounts.models import CustomUser
+from rodbt.cache import get_user_version
 from rodbt.models import Question, Journal
 
 
 USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
 USERNAME_REGISTRATION_ACCEPTED_FALSE = 'UnregisteredUser'
+USERNAME_OTHER_REGISTERED_USER = 'OtherRegisteredUser'
 PASSWORD_FOR_TESTING = 'a_test_password'
 
 LOGIN_URL = '/accounts/login/'
 
 NUMBER_OF_QUESTIONS = 11
+QUESTIONS_PER_PAGE = 25
+# Session, user, conditional GET aggregate, fragment version, questions and
+# prefetched journals:
+QUESTIONS_QUERY_BUDGET = 6
 
 QUESTION_CREATE_URL = '/rodbt/questions/create/'
 QUESTION_CREATE_VIEW_NAME = 'rodbt:question-create'
@@ -46,6 +52,16 @@ when creating a `Journal`.
 """
 )
 
+# Session, user, the owned `Question` and the fragment version:
+QUESTION_DETAIL_QUERY_BUDGET = 4
+
+# Session and user; no `Journal`s are loaded for the empty form:
+QUESTION_CREATE_QUERY_BUDGET = 2
+# Session, user, the submitted `Journal` ids and the selected `Journal`s
+# rendered back in the form:
+QUESTION_CREATE_INVALID_POST_QUERY_BUDGET = 4
+NUMBER_OF_JOURNALS_TO_PICK_FROM = 30
+
 PAGE_TITLE_QUESTION_DETAIL = 'Question Detail'
 
 
@@ -261,6 +277,75 @@ class QuestionCreateViewTest(TestCase):
             ),
         )
 
+    def test_view_form_renders_only_selected_journals(self):
+        """
+        The `journal` field should render only the selected `Journal`s,
+        however many the user has, in a fixed number of queries.
+        """
+        user = CustomUser.objects.get(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE
+        )
+        journals = [
+            Journal.objects.create(
+                title=f'Journal {number}',
+                body=JOURNAL_BODY,
+                author=user,
+            )
+            for number in range(NUMBER_OF_JOURNALS_TO_PICK_FROM)
+        ]
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        with self.assertNumQueries(QUESTION_CREATE_QUERY_BUDGET):
+            response = self.client.get(QUESTION_CREATE_URL)
+        self.assertNotContains(response, '<option')
+        self.assertContains(response, 'data-journal-picker="/rodbt/api/journals/lookup/"')
+
+        # An invalid POST renders the form again with the selection kept:
+        with self.assertNumQueries(QUESTION_CREATE_INVALID_POST_QUERY_BUDGET):
+            response = self.client.post(
+                QUESTION_CREATE_URL,
+                {
+                    'body': '',
+                    'journal': [journals[3].id],
+                },
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<option', count=1)
+        self.assertContains(
+            response,
+            f'<option value="{journals[3].id}" selected>Journal 3</option>',
+            html=True,
+        )
+
+    def test_view_rejects_another_users_journal(self):
+        """
+        View should not create a `Question` linked to a `Journal` owned by
+        another user.
+        """
+        other_journal = Journal.objects.create(
+            title=JOURNAL_TITLE,
+            body=JOURNAL_BODY,
+            author=CustomUser.objects.get(
+                username=USERNAME_REGISTRATION_ACCEPTED_FALSE
+            ),
+        )
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.post(
+            QUESTION_CREATE_URL,
+            {
+                'body': QUESTION_BODY,
+                'journal': [other_journal.id],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].has_error('journal'))
+        self.assertFalse(Question.objects.exists())
+
 
 class QuestionDetailViewTest(TestCase):
     """
@@ -428,6 +513,40 @@ class QuestionDetailViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIsInstance(response.context['question'], Question)
 
+    def test_view_returns_404_for_another_users_question(self):
+        """
+        View should return `status_code` of 404 for a registered user who
+        doesn't own the `Question`.
+        """
+        other_user = CustomUser.objects.create(
+            username=USERNAME_OTHER_REGISTERED_USER,
+            registration_accepted=True,
+        )
+        other_user.set_password(PASSWORD_FOR_TESTING)
+        other_user.save()
+        self.client.login(
+            username=USERNAME_OTHER_REGISTERED_USER,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(QUESTION_DETAIL_URL)
+        self.assertEqual(response.status_code, 404)
+
+    def test_view_fetches_question_once(self):
+        """
+        View should look up the `Question` once for both the ownership check
+        and rendering: `QUESTION_DETAIL_QUERY_BUDGET` queries in total.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        # The writes above deleted the fragment version; it is replaced
+        # once, on the first request after them.
+        get_user_version(CustomUser.objects.get(username=USERNAME_REGISTRATION_ACCEPTED_TRUE).pk)
+        with self.assertNumQueries(QUESTION_DETAIL_QUERY_BUDGET):
+            response = self.client.get(QUESTION_DETAIL_URL)
+        self.assertEqual(response.status_code, 200)
+
 
 class QuestionListViewTest(TestCase):
     """
@@ -527,6 +646,84 @@ class QuestionListViewTest(TestCase):
         self.assertTrue('the_site_name' in response.context)
         self.assertTrue('page_title' in response.context)
 
+    def test_view_orders_questions_newest_first(self):
+        """
+        `question_list` should be ordered by `date` descending, with `id`
+        descending as the tiebreak.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(QUESTIONS_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(response.context['question_list']),
+            list(Question.objects.order_by('-date', '-id')),
+        )
+
+    def test_view_pages_through_all_questions(self):
+        """
+        Following `next_cursor` should visit every `Question` exactly once.
+        """
+        user = CustomUser.objects.get(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE
+        )
+        for question_id in range(QUESTIONS_PER_PAGE):
+            Question.objects.create(
+                body=QUESTION_BODY,
+                author=user,
+            )
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(QUESTIONS_URL)
+        first_page = list(response.context['question_list'])
+        self.assertEqual(len(first_page), QUESTIONS_PER_PAGE)
+
+        response = self.client.get(
+            QUESTIONS_URL,
+            {'after': response.context['page_obj'].next_cursor},
+        )
+        second_page = list(response.context['question_list'])
+        self.assertEqual(len(second_page), NUMBER_OF_QUESTIONS)
+        self.assertEqual(
+            first_page + second_page,
+            list(Question.objects.order_by('-date', '-id')),
+        )
+        self.assertIsNone(response.context['page_obj'].next_cursor)
+
+    def test_view_query_count_does_not_grow_with_questions(self):
+        """
+        View should render `author` and `journal` of every `Question` in
+        `QUESTIONS_QUERY_BUDGET` queries, without loading `Journal.body`.
+        """
+        user = CustomUser.objects.get(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE
+        )
+        for question in Question.objects.filter(author=user):
+            journal = Journal.objects.create(
+                title=f'Journal for question {question.id}',
+                body=JOURNAL_BODY,
+                author=user,
+            )
+            question.journal.add(journal)
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        # The writes above deleted the fragment version; it is replaced
+        # once, on the first request after them.
+        get_user_version(user.pk)
+        with self.assertNumQueries(QUESTIONS_QUERY_BUDGET):
+            response = self.client.get(QUESTIONS_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Journal for question')
+        question = response.context['question_list'][0]
+        journal = question.journal.all()[0]
+        self.assertIn('body', journal.get_deferred_fields())
+
     # def test_view_has_questions_in_proper_order(self):
     #     """
     #     View should have a `question_list` object in the context that is
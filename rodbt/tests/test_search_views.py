@@ -0,0 +1,169 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from rodbt.models import Journal, Question
+from rodbt.search import JOURNAL, QUESTION
+
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = 'RegisteredUser'
+USERNAME_REGISTRATION_ACCEPTED_FALSE = 'UnregisteredUser'
+USERNAME_OTHER_REGISTERED_USER = 'OtherRegisteredUser'
+PASSWORD_FOR_TESTING = 'a_test_password'
+
+LOGIN_URL = '/accounts/login/'
+
+SEARCH_URL = '/rodbt/search/'
+SEARCH_VIEW_NAME = 'rodbt:search'
+SEARCH_TEMPLATE = 'rodbt/search.html'
+SEARCH_RESULTS_PER_PAGE = 20
+
+
+class SearchViewTest(TestCase):
+    """
+    Test the `SearchView`.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create `CustomUser`s and some `Journal`s and `Question`s to search.
+
+        This specific function name `setUpTestData` is required by Django.
+        """
+        user_registration_accepted_true = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            registration_accepted=True,
+        )
+        user_registration_accepted_true.set_password(PASSWORD_FOR_TESTING)
+        user_registration_accepted_true.save()
+
+        user_registration_accepted_false = CustomUser.objects.create(
+            username=USERNAME_REGISTRATION_ACCEPTED_FALSE,
+        )
+        user_registration_accepted_false.set_password(PASSWORD_FOR_TESTING)
+        user_registration_accepted_false.save()
+
+        other_user = CustomUser.objects.create(
+            username=USERNAME_OTHER_REGISTERED_USER,
+            registration_accepted=True,
+        )
+
+        cls.journal_title_match = Journal.objects.create(
+            author=user_registration_accepted_true,
+            title='Walking in the park',
+            body='It was sunny.',
+        )
+        cls.journal_body_match = Journal.objects.create(
+            author=user_registration_accepted_true,
+            title='Tuesday',
+            body='I went walking after work.',
+        )
+        cls.question = Question.objects.create(
+            author=user_registration_accepted_true,
+            body='Why do I enjoy walking?',
+        )
+        Journal.objects.create(
+            author=other_user,
+            title='Walking alone',
+            body='Walking is private.',
+        )
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_view_url_redirects_to_login_if_user_not_authenticated(self):
+        """
+        View should redirect non-authenticated user to login view.
+        """
+        self.client.logout()
+        response = self.client.get(SEARCH_URL)
+        self.assertRedirects(response, f'{LOGIN_URL}?next={SEARCH_URL}')
+
+    def test_view_url_for_authenticated_registration_accepted_false_user(self):
+        """
+        View should return `status_code` of 403 for authenticated user
+        who has `registration_accepted=False`.
+        """
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_FALSE,
+            password=PASSWORD_FOR_TESTING,
+        )
+        response = self.client.get(SEARCH_URL)
+        self.assertEqual(response.status_code, 403)
+
+    def test_view_url_accessible_by_name(self):
+        """
+        View should be accessible through the `APP_NAME:VIEW_NAME` and use
+        `SEARCH_TEMPLATE`.
+        """
+        response = self.client.get(reverse(SEARCH_VIEW_NAME))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, SEARCH_TEMPLATE)
+
+    def test_search_returns_own_journals_and_questions_ranked(self):
+        """
+        Search should only return the user's own matches, with the title
+        match ranked first.
+        """
+        response = self.client.get(SEARCH_URL, {'q': 'walking'})
+        self.assertEqual(response.status_code, 200)
+        results = response.context['results']
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], (JOURNAL, self.journal_title_match))
+        self.assertIn((JOURNAL, self.journal_body_match), results)
+        self.assertIn((QUESTION, self.question), results)
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """
+        Saving and deleting should keep the search index in sync.
+        """
+        self.journal_body_match.body = 'I went swimming after work.'
+        self.journal_body_match.save()
+        self.question.delete()
+        response = self.client.get(SEARCH_URL, {'q': 'walking'})
+        self.assertEqual(
+            response.context['results'],
+            [(JOURNAL, self.journal_title_match)]
+        )
+        response = self.client.get(SEARCH_URL, {'q': 'swimming'})
+        self.assertEqual(
+            response.context['results'],
+            [(JOURNAL, self.journal_body_match)]
+        )
+
+    def test_search_treats_query_syntax_as_text(self):
+        """
+        Quotes and operators in the query should not cause an error.
+        """
+        response = self.client.get(SEARCH_URL, {'q': '"walking AND OR NOT ('})
+        self.assertEqual(response.status_code, 200)
+
+    def test_search_paginates_results(self):
+        """
+        Search should return `SEARCH_RESULTS_PER_PAGE` results per page.
+        """
+        user = CustomUser.objects.get(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE
+        )
+        for journal_id in range(SEARCH_RESULTS_PER_PAGE):
+            Journal.objects.create(
+                author=user,
+                title=f'Journal {journal_id}',
+                body='More walking.',
+            )
+        response = self.client.get(SEARCH_URL, {'q': 'walking'})
+        self.assertEqual(len(response.context['results']), SEARCH_RESULTS_PER_PAGE)
+        self.assertTrue(response.context['has_next'])
+        response = self.client.get(SEARCH_URL, {'q': 'walking', 'page': 2})
+        self.assertEqual(len(response.context['results']), 3)
+        self.assertFalse(response.context['has_next'])
+
+    def test_invalid_page_returns_404(self):
+        """
+        A `page` that isn't a positive integer should return 404.
+        """
+        response = self.client.get(SEARCH_URL, {'q': 'walking', 'page': 'x'})
+        self.assertEqual(response.status_code, 404)
@@ -1,4 +1,4 @@
-from django.urls import path
+from django.urls import include, path
 
 from . import views
 
@@ -38,4 +38,18 @@ urlpatterns = [
         views.QuestionDetailView.as_view(),
         name='question-detail'
     ),
+
+    path(
+        'search/',
+        views.SearchView.as_view(),
+        name='search'
+    ),
+
+    path(
+        'import/',
+        views.ImportView.as_view(),
+        name='import'
+    ),
+
+    path('api/', include('rodbt.api.urls')),
 ]
@@ -0,0 +1,26 @@
+"""
+`rodbt.urls` with the list, detail and create views replaced by their
+async variants from `rodbt.async_views`. The paths and names are the same.
+"""
+from django.urls import path
+
+from rodbt import async_views, urls
+
+
+app_name = urls.app_name
+
+ASYNC_VIEWS = {
+    'journals': async_views.AsyncJournalListView,
+    'journal-create': async_views.AsyncJournalCreateView,
+    'journal-detail': async_views.AsyncJournalDetailView,
+    'questions': async_views.AsyncQuestionListView,
+    'question-create': async_views.AsyncQuestionCreateView,
+    'question-detail': async_views.AsyncQuestionDetailView,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name].as_view(), name=pattern.name)
+    if getattr(pattern, 'name', None) in ASYNC_VIEWS
+    else pattern
+    for pattern in urls.urlpatterns
+]
@@ -1,13 +1,19 @@
+
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.http import HttpResponse
-from django.views.generic import ListView
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse
+from django.views.generic import FormView, ListView, TemplateView
 from django.views.generic.edit import CreateView
 from django.views.generic.detail import DetailView
 
 from rodbt.models import Journal
 from rodbt.models import Question
+from rodbt import exchange, search
 
-from rodbt.forms import QuestionForm
+from rodbt.cache import FragmentVersionMixin
+from rodbt.forms import ImportForm, QuestionForm
+from rodbt.mixins import ConditionalDetailMixin, ConditionalListMixin, OwnedObjectMixin
+from rodbt.pagination import KeysetPaginationMixin
 
 # Import extra context value for the site name:
 from config.settings.common import THE_SITE_NAME
@@ -21,6 +27,9 @@ PAGE_TITLE_QUESTION_LIST = 'My Questions'
 PAGE_TITLE_QUESTION_DETAIL = 'Question Detail'
 PAGE_TITLE_QUESTION_CREATE = 'New Question'
 
+PAGE_TITLE_SEARCH = 'Search'
+PAGE_TITLE_IMPORT = 'Import Journals and Questions'
+
 
 def index(request):
     return HttpResponse("Hello, world. You're at the RO-DBT index!")
@@ -59,18 +68,15 @@ class JournalCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         context['page_title'] = PAGE_TITLE_JOURNAL_CREATE
         return context
 
-class JournalDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+class JournalDetailView(LoginRequiredMixin, OwnedObjectMixin, UserPassesTestMixin, ConditionalDetailMixin, FragmentVersionMixin, DetailView):
     """
-    `DetailView` for a user to view a `Journal`.
+    `DetailView` for a user to view one of their own `Journal`s.
+
+    `OwnedObjectMixin` provides `test_func()`. Conditional requests are
+    answered with 304 Not Modified based on `edited_date`.
     """
     model = Journal
 
-    def test_func(self):
-        """
-        Test if user has `registration_accepted=True`.
-        """
-        return self.request.user.registration_accepted
-
     # Add extra context:
     def get_context_data(self, **kwargs):
         """
@@ -80,10 +86,15 @@ class JournalDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
         context['page_title'] = PAGE_TITLE_JOURNAL_DETAIL
         return context
 
-class JournalListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class JournalListView(LoginRequiredMixin, UserPassesTestMixin, ConditionalListMixin, KeysetPaginationMixin, FragmentVersionMixin, ListView):
     """
     List view for a user to view their own journals.
 
+    Journals are paginated newest first by `(-date, -id)` using keyset
+    pagination, so the `after`/`before` cursors in the query string select
+    the page rather than a page number. The rendered rows are cached per
+    user, see `rodbt.cache`.
+
     Default context object names are `journal_list` and `object_list`.
 
     Default template name is `rodbt/journal_list.html`.
@@ -108,8 +119,30 @@ class JournalListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
     def get_queryset(self):
         """
         Get the list of `Journal`s for the current user.
-        """
-        return Journal.objects.filter(author=self.request.user).order_by('-date')
+
+        The template shows each journal's `author` and `questions`, so the
+        author is joined in and the questions are prefetched in one query
+        for the whole page. Only the columns the template uses are selected:
+        the precomputed `excerpt` is shown rather than the whole `body`.
+        """
+        return Journal.objects.filter(
+            author=self.request.user
+        ).select_related(
+            'author',
+        ).only(
+            'id',
+            'title',
+            'excerpt',
+            'word_count',
+            'date',
+            'author__id',
+            'author__username',
+        ).prefetch_related(
+            Prefetch(
+                'questions',
+                queryset=Question.objects.only('id', 'body').order_by('-date', '-id'),
+            ),
+        ).order_by('-date', '-id')
 
     # context_object_name = 'journal_list'
     # Add extra context:
@@ -169,10 +202,14 @@ class QuestionCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         context['page_title'] = PAGE_TITLE_QUESTION_CREATE
         return context
 
-class QuestionListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class QuestionListView(LoginRequiredMixin, UserPassesTestMixin, ConditionalListMixin, KeysetPaginationMixin, FragmentVersionMixin, ListView):
     """
     List view for a user to view their own questions.
 
+    Questions are paginated newest first by `(-date, -id)` using keyset
+    pagination, backed by the `(author, -date, -id)` index on `Question`.
+    The rendered rows are cached per user, see `rodbt.cache`.
+
     Default context object names are `question_list` and `object_list`.
 
     Default template name is `rodbt/question_list.html`.
@@ -197,8 +234,28 @@ class QuestionListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
     def get_queryset(self):
         """
         Get the list of `Question`s for the current user.
-        """
-        return Question.objects.filter(author=self.request.user)
+
+        The template shows each question's `author` and `journal`s, so the
+        author is joined in and the journals are prefetched in one query
+        for the whole page. Only the journals' `id` and `title` are
+        selected since `Journal.__str__` only needs the title.
+        """
+        return Question.objects.filter(
+            author=self.request.user
+        ).select_related(
+            'author',
+        ).only(
+            'id',
+            'body',
+            'date',
+            'author__id',
+            'author__username',
+        ).prefetch_related(
+            Prefetch(
+                'journal',
+                queryset=Journal.objects.only('id', 'title').order_by('-date', '-id'),
+            ),
+        ).order_by('-date', '-id')
 
     # context_object_name = 'question_list'
     # Add extra context:
@@ -211,31 +268,154 @@ class QuestionListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         context['page_title'] = PAGE_TITLE_QUESTION_LIST
         return context
 
-class QuestionDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+class QuestionDetailView(LoginRequiredMixin, OwnedObjectMixin, UserPassesTestMixin, ConditionalDetailMixin, FragmentVersionMixin, DetailView):
     """
-    `DetailView` for a user to view a `Question`.
+    `DetailView` for a user to view one of their own `Question`s.
+
+    `OwnedObjectMixin` provides `test_func()`, which ensures that:
+    * The user is not able to view `Question`s for other users.
+    * The user is registered.
+
+    Conditional requests are answered with 304 Not Modified based on
+    `edited_date`.
     """
     model = Question
 
+    # Add extra context:
+    def get_context_data(self, **kwargs):
+        """
+        Add extra context `page_title` to the view.
+        """
+        context = super().get_context_data(**kwargs)
+        context['page_title'] = PAGE_TITLE_QUESTION_DETAIL
+        return context
+
+class SearchView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    """
+    View for a user to full-text search their own `Journal`s and
+    `Question`s.
+
+    Results are ranked by relevance and paginated with the `page` query
+    string parameter. See `rodbt.search` for the search backends.
+    """
+    template_name = 'rodbt/search.html'
+    paginate_by = 20
+
     def test_func(self):
         """
         Test if user has `registration_accepted=True`.
+        """
+        return self.request.user.registration_accepted
+
+    def get_page_number(self):
+        """
+        Get the 1-based `page` number from the query string.
+        """
+        try:
+            page_number = int(self.request.GET.get('page', 1))
+        except ValueError:
+            raise Http404('Invalid page number.')
+        if page_number < 1:
+            raise Http404('Invalid page number.')
+        return page_number
 
-        Purpose:
-        * Ensure that the user is not able to view `Question`s for other users.
-        * Ensure that the user is registered.
+    def get_context_data(self, **kwargs):
         """
-        user_owns_question = self.request.user == self.get_object().author
-        user_registration_accepted = self.request.user.registration_accepted
+        Add the search results and extra contexts `the_site_name` and
+        `page_title` to the view.
 
-        return user_owns_question and user_registration_accepted
+        One more result than `paginate_by` is fetched to find out if there
+        is a next page without counting every match.
+        """
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        page_number = self.get_page_number()
+        results = search.search(
+            self.request.user,
+            query,
+            limit=self.paginate_by + 1,
+            offset=(page_number - 1) * self.paginate_by,
+        )
+        context['query'] = query
+        context['results'] = results[:self.paginate_by]
+        context['page_number'] = page_number
+        context['has_next'] = len(results) > self.paginate_by
+        context['the_site_name'] = THE_SITE_NAME
+        context['page_title'] = PAGE_TITLE_SEARCH
+        return context
 
+class ImportView(LoginRequiredMixin, UserPassesTestMixin, FormView):
+    """
+    View for a user to upload an export file and import its `Journal`s and
+    `Question`s as their own.
+
+    The upload is read as a stream and inserted in batches, see
+    `rodbt.exchange.Importer`. The import runs inside the request, so
+    uploads over `max_upload_size` bytes, or over `max_text_size` bytes
+    once decompressed, are refused with a pointer to `manage.py
+    import_journals`, which has no limits.
+    """
+    form_class = ImportForm
+    template_name = 'rodbt/import_form.html'
+    batch_size = 1000
+    max_upload_size = 5 * 1024 * 1024
+    max_text_size = 20 * 1024 * 1024
+
+    def test_func(self):
+        """
+        Test if user has `registration_accepted=True`.
+        """
+        return self.request.user.registration_accepted
+
+    def form_valid(self, form):
+        """
+        Import the uploaded file and show the number of imported rows.
+        """
+        upload = form.cleaned_data['file']
+        if upload.size > self.max_upload_size:
+            form.add_error('file', self.get_too_large_message(
+                f'The file is larger than {self.max_upload_size} bytes.'
+            ))
+            return self.form_invalid(form)
+        format = form.cleaned_data['format'] or exchange.guess_format(upload.name)
+        upload.seek(0)
+        stream = exchange.open_upload(
+            upload.file,
+            gzipped=upload.name.lower().endswith('.gz'),
+            limit=self.max_text_size,
+        )
+        try:
+            result = exchange.import_stream(
+                stream,
+                format,
+                batch_size=self.batch_size,
+                author=self.request.user,
+            )
+        except exchange.ImportTooLarge as error:
+            form.add_error('file', self.get_too_large_message(str(error)))
+            return self.form_invalid(form)
+        except (exchange.InvalidRecord, UnicodeDecodeError, OSError, EOFError) as error:
+            form.add_error('file', f'Nothing was imported: {error}')
+            return self.form_invalid(form)
+        finally:
+            # Leave the upload itself open for Django to clean up.
+            stream.detach()
+        return self.render_to_response(
+            self.get_context_data(form=self.form_class(), result=result)
+        )
+
+    def get_too_large_message(self, reason):
+        return (
+            f'Nothing was imported: {reason} Large files are imported by '
+            'an administrator with `manage.py import_journals`.'
+        )
 
     # Add extra context:
     def get_context_data(self, **kwargs):
         """
-        Add extra context `page_title` to the view.
+        Add extra contexts `the_site_name` and `page_title` to the view.
         """
         context = super().get_context_data(**kwargs)
-        context['page_title'] = PAGE_TITLE_QUESTION_DETAIL
+        context['the_site_name'] = THE_SITE_NAME
+        context['page_title'] = PAGE_TITLE_IMPORT
         return context
@@ -0,0 +1,43 @@
+from django.core.exceptions import ValidationError
+from django.forms import SelectMultiple
+from django.urls import reverse_lazy
+
+
+class JournalPickerWidget(SelectMultiple):
+    """
+    Multiple select for `Journal`s which renders only the selected options.
+
+    Further journals are found with the `rodbt:api:journal-lookup` endpoint
+    by `journal_picker.js`, so the page doesn't carry one `<option>` for
+    every journal the user has.
+    """
+    lookup_url = reverse_lazy('rodbt:api:journal-lookup')
+
+    class Media:
+        js = ['rodbt/journal_picker.js']
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-journal-picker'] = str(self.lookup_url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        """
+        Build options only for the selected journals, with one query.
+        """
+        selected = [v for v in value if v not in (None, '')]
+        if not selected:
+            return []
+        iterator = self.choices
+        try:
+            objects = list(iterator.queryset.filter(pk__in=selected))
+        except (TypeError, ValueError, ValidationError):
+            # Invalid ids are reported by the field, not rendered.
+            return []
+        groups = []
+        for index, obj in enumerate(objects):
+            option_value, option_label = iterator.choice(obj)
+            groups.append((None, [self.create_option(
+                name, option_value, option_label, True, index, attrs=attrs,
+            )], index))
+        return groups